@@ -0,0 +1,78 @@
+"""
+File with benchmark to compare drawing with new figures and drawing with figures from the pool.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import psutil
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(repo_dir)
+if True:
+    from report_generator.figurepool import FigurePool
+
+
+def draw(fig: Figure, file_name: str) -> None:
+    """
+    :param fig: figure to draw on;
+    :param file_name: name of file where image should be saved.
+    """
+
+    ax = fig.add_subplot(111)
+    ax.hist(np.random.uniform(0, 100, 1000), bins=100, range=([0, 100]))
+    fig.savefig(file_name)
+
+
+def get_memory() -> float:
+    """
+    :return: the non-swapped physical memory a process has used in MB.
+    """
+
+    return psutil.Process(os.getpid()).memory_info().rss / pow(2, 20)
+
+
+def run_with_new_figures(images_number: int, file_name: str) -> None:
+    """
+    :param images_number: number of images to be drawn;
+    :param file_name: name of file where images should be saved.
+    """
+
+    for _ in range(images_number):
+        fig = Figure(figsize=(10, 8))
+        FigureCanvasAgg(fig)
+        draw(fig, file_name)
+        fig.clf()
+        del fig
+        gc.collect()
+
+
+def run_with_pool(images_number: int, file_name: str) -> None:
+    """
+    :param images_number: number of images to be drawn;
+    :param file_name: name of file where images should be saved.
+    """
+
+    pool = FigurePool()
+    for _ in range(images_number):
+        with pool.figure(10, 8, 100) as fig:
+            draw(fig, file_name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("images_number", type=int, help="Number of images to be drawn")
+    parsed_args = parser.parse_args(sys.argv[1:])
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        file_name = os.path.join(dir_name, "image.png")
+        for name, function in (("New figures", run_with_new_figures), ("Figure pool", run_with_pool)):
+            memory = get_memory()
+            start = time.monotonic()
+            function(parsed_args.images_number, file_name)
+            print(f"{name}: time = {time.monotonic() - start:.2f} s, memory growth = {get_memory() - memory:.2f} MB")
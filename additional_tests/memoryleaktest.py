@@ -47,9 +47,10 @@ def set_logger_for_analyzer(log_file: str) -> None:
     logger.propagate = False
 
 
-def run_test(reports_number: int) -> None:
+def run_test(reports_number: int, render_in_worker: bool) -> None:
     """
-    :param reports_number: number of reports to be generated.
+    :param reports_number: number of reports to be generated;
+    :param render_in_worker: if True, images are drawn in the worker process.
     """
 
     # Report for board from P10 file
@@ -63,7 +64,8 @@ def run_test(reports_number: int) -> None:
               ConfigAttributes.APP_VERSION: "1.2.3",
               ConfigAttributes.TEST_DURATION: timedelta(seconds=562),
               ConfigAttributes.SCALING_TYPE: ScalingTypes.EYEPOINT_P10,
-              ConfigAttributes.ENGLISH: True}
+              ConfigAttributes.ENGLISH: True,
+              ConfigAttributes.RENDER_IN_WORKER: render_in_worker}
     report_generator = ReportGenerator()
 
     logger = logging.getLogger("analyzer")
@@ -73,15 +75,17 @@ def run_test(reports_number: int) -> None:
         memory = get_memory() / pow(2, 20)
         logger.info("Report #%d, memory = %f MB", i, memory)
         time.sleep(1)
+    report_generator.close_worker()
     logger.info("Finish")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("reports_number", type=int, help="Number of reports to be generated")
+    parser.add_argument("--worker", action="store_true", help="Draw images in the worker process")
     parsed_args = parser.parse_args(sys.argv[1:])
 
     set_logging_level(logging.ERROR)
     set_logger_for_analyzer("memory_leak_log.txt")
     app = QApplication(sys.argv)
-    run_test(parsed_args.reports_number)
+    run_test(parsed_args.reports_number, parsed_args.worker)
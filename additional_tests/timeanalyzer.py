@@ -18,6 +18,7 @@ class TimeAnalyzer:
                               "DRAW FAULT HISTOGRAM": "Гистограмма неисправностей",
                               "DRAW PIN": "Пины",
                               "GENERATE REPORT": "Генерация отчета",
+                              "RENDER PIN ROWS": "Строки таблицы пинов",
                               "SAVE BOARD": "Плата"}
     Data = namedtuple("Data", ["times", "total_times", "total_time", "total_time_from_log"])
 
@@ -6,7 +6,8 @@ import os
 import sys
 from PyQt5.QtWidgets import QApplication
 from epcore.elements import Board
-from report_generator import ConfigAttributes, ObjectsForReport, ReportGenerator, ReportTypes, ScalingTypes
+from report_generator import (ConfigAttributes, ObjectsForReport, PinQuery, PinTypes, ReportGenerator, ReportTypes,
+                              ScalingTypes)
 from manual_board import create_manual_board
 from report_generator.logger import save_logs_to_file
 
@@ -54,6 +55,14 @@ if __name__ == "__main__":
               ConfigAttributes.USER_DEFINED_SCALES: user_defined_scales}
     report_generator.run(config)
 
+    # Report for pins selected by query
+    dir_for_report = os.path.join(dir_name, "examples", "report_for_manual_board_with_query")
+    config = {ConfigAttributes.BOARD: create_manual_board(),
+              ConfigAttributes.DIRECTORY: dir_for_report,
+              ConfigAttributes.OBJECTS: {ObjectsForReport.QUERY: PinQuery(pin_types=[PinTypes.TEST_HIGH_SCORE])},
+              ConfigAttributes.TOLERANCE: 0.15}
+    report_generator.run(config)
+
     # Report for empty board
     dir_for_report = os.path.join(dir_name, "examples", "report_for_empty_board")
     config = {ConfigAttributes.BOARD: Board(),
@@ -2,13 +2,19 @@
 Package to generate report for Board object from epcore library.
 """
 
-from report_generator.logger import save_logs_to_file, set_logger, set_logging_level
-from report_generator.reportgenerator import ConfigAttributes, ObjectsForReport, ReportGenerator
-from report_generator.definitions import ReportTypes, ScalingTypes
+from report_generator.artifacts import iter_generate
+from report_generator.logger import flush_logs, save_logs_to_file, set_logger, set_logging_level, set_pin_logging_level
+from report_generator.reportgenerator import ConfigAttributes, ObjectsForReport, ReportGenerator, ReportSession
+from report_generator.definitions import (Artifact, ArtifactTypes, ExportFormats, ImageFormats, PinTypes, ReportTypes,
+                                          ScalingTypes)
+from report_generator.progress import ProgressInfo
+from report_generator.selection import PinQuery, select_pins
 from report_generator.version import VERSION
 
 
-__all__ = ["ConfigAttributes", "ObjectsForReport", "ReportGenerator", "ReportTypes", "save_logs_to_file",
-           "ScalingTypes", "set_logging_level", "VERSION"]
+__all__ = ["Artifact", "ArtifactTypes", "ConfigAttributes", "ExportFormats", "flush_logs", "ImageFormats",
+           "iter_generate", "ObjectsForReport", "PinQuery", "PinTypes", "ProgressInfo", "ReportGenerator",
+           "ReportSession", "ReportTypes", "save_logs_to_file", "ScalingTypes", "select_pins", "set_logging_level",
+           "set_pin_logging_level", "VERSION"]
 __version__ = VERSION
 set_logger()
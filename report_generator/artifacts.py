@@ -0,0 +1,60 @@
+"""
+File with function to generate report and get its files as they are produced.
+"""
+
+import queue
+import threading
+from typing import Any, Dict, Iterator, List
+from PyQt5.QtCore import Qt
+from report_generator.definitions import Artifact, ImageFormats
+from report_generator.reportgenerator import ConfigAttributes, ReportGenerator
+
+
+def _run(report_generator: ReportGenerator, config: Dict[ConfigAttributes, Any], artifacts: queue.Queue) -> None:
+    """
+    :param report_generator: report generator;
+    :param config: dictionary with full information about required report;
+    :param artifacts: queue to which the produced artifacts are put. None is put when the generation is finished.
+    """
+
+    try:
+        report_generator.run(config)
+    finally:
+        artifacts.put(None)
+
+
+def iter_generate(config: Dict[ConfigAttributes, Any]) -> Iterator[Artifact]:
+    """
+    Function generates report in a separate thread and yields artifacts (images, reports, files with results and
+    metrics) as they are produced, so the files can be processed while the generation continues. The artifacts are
+    passed with direct connections, so a Qt event loop is not required. If the iteration is stopped before the end,
+    the generation is stopped too. Images drawn before the interruption of a resumed generation are not yielded again.
+    IV-curves in PNG format are drawn by a Qt widget that cannot be used outside the GUI thread, so they are always
+    drawn in the worker process and QApplication is not required.
+    :param config: dictionary with full information about required report.
+    :return: iterator over the artifacts of the report.
+    """
+
+    if config.get(ConfigAttributes.IV_IMAGE_FORMAT, ImageFormats.PNG) == ImageFormats.PNG:
+        config = {**config, ConfigAttributes.RENDER_IN_WORKER: True}
+    artifacts = queue.Queue()
+    errors: List[str] = []
+    report_generator = ReportGenerator()
+    report_generator.artifact_ready.connect(artifacts.put, Qt.DirectConnection)
+    report_generator.exception_raised.connect(errors.append, Qt.DirectConnection)
+    thread = threading.Thread(target=_run, args=(report_generator, config, artifacts), daemon=True)
+    thread.start()
+    try:
+        while True:
+            artifact = artifacts.get()
+            if artifact is None:
+                break
+            yield artifact
+    finally:
+        if thread.is_alive():
+            report_generator.stop_process()
+        thread.join()
+        report_generator.close_worker()
+
+    if errors:
+        raise RuntimeError(errors[0])
@@ -0,0 +1,130 @@
+"""
+File with class to index the board in one pass.
+"""
+
+from typing import Callable, Iterable, List, Optional, Tuple
+import numpy as np
+from epcore.elements import Board, Element, Pin
+
+
+class BoardIndex:
+    """
+    Class with flat arrays of the pins of the board. The index is built once per board in one pass over elements and
+    pins. Pins are numbered by total pin index: the list of all pins of the board is obtained by sequentially combining
+    the lists of pins of the board elements.
+    """
+
+    REFERENCE_MEASUREMENT: int = 1
+    TEST_MEASUREMENT: int = 2
+
+    def __init__(self, board: Board, check_stop: Callable[[], None] = lambda: None) -> None:
+        """
+        :param board: board to be indexed;
+        :param check_stop: function that checks whether the operation is stopped.
+        """
+
+        self.board: Board = board
+        self._coordinates: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.element_offsets: List[int] = [0]
+        self.element_indices: List[int] = []
+        self.measurement_flags: bytearray = bytearray()
+        self.pin_indices: List[int] = []
+        self.pins: List[Pin] = []
+        self.has_test_measurements: bool = False
+        self._index(check_stop)
+
+    def __len__(self) -> int:
+        return len(self.pins)
+
+    def _index(self, check_stop: Callable[[], None]) -> None:
+        """
+        :param check_stop: function that checks whether the operation is stopped.
+        """
+
+        for element_index, element in enumerate(self.board.elements):
+            check_stop()
+            for pin_index, pin in enumerate(element.pins):
+                self.element_indices.append(element_index)
+                self.measurement_flags.append(self._get_measurement_flags(pin))
+                self.pin_indices.append(pin_index)
+                self.pins.append(pin)
+            self.element_offsets.append(len(self.pins))
+        self.has_test_measurements = any(flags & self.TEST_MEASUREMENT for flags in self.measurement_flags)
+
+    def _get_measurement_flags(self, pin: Pin) -> int:
+        """
+        :param pin: pin.
+        :return: flags of the kinds of measurements of the pin.
+        """
+
+        flags = 0
+        for measurement in pin.measurements:
+            flags |= self.REFERENCE_MEASUREMENT if measurement.is_reference else self.TEST_MEASUREMENT
+        return flags
+
+    def expand_element_mask(self, element_mask: np.ndarray) -> np.ndarray:
+        """
+        :param element_mask: boolean array with a value for each element of the board.
+        :return: boolean array with a value for each pin of the board, the value of the pin is the value of its
+        element.
+        """
+
+        return np.repeat(element_mask, np.diff(self.element_offsets))
+
+    def get_coordinates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :return: arrays with x and y coordinates of pins. Arrays are created on the first call.
+        """
+
+        if self._coordinates is None:
+            self._coordinates = (np.array([pin.x for pin in self.pins], dtype=float),
+                                 np.array([pin.y for pin in self.pins], dtype=float))
+        return self._coordinates
+
+    def get_element(self, total_pin_index: int) -> Element:
+        """
+        :param total_pin_index: total index of the pin.
+        :return: element to which the pin belongs.
+        """
+
+        return self.board.elements[self.element_indices[total_pin_index]]
+
+    def get_mask(self, required_board: bool, required_elements: Optional[Iterable[int]] = None,
+                 required_pins: Optional[Iterable[int]] = None) -> np.ndarray:
+        """
+        :param required_board: if True, all pins of the board are selected;
+        :param required_elements: indices of elements whose pins should be selected;
+        :param required_pins: total indices of pins to be selected.
+        :return: boolean array with a value for each pin of the board, the value is True if the pin is selected.
+        """
+
+        pins_number = len(self.pins)
+        if required_board:
+            return np.ones(pins_number, dtype=bool)
+
+        mask = np.zeros(pins_number, dtype=bool)
+        elements_number = len(self.element_offsets) - 1
+        for element_index in set(required_elements or []):
+            if 0 <= element_index < elements_number:
+                mask[self.element_offsets[element_index]:self.element_offsets[element_index + 1]] = True
+        pin_indices = [total_pin_index for total_pin_index in set(required_pins or [])
+                       if 0 <= total_pin_index < pins_number]
+        mask[pin_indices] = True
+        return mask
+
+    def update_pins(self, total_pin_indices: Iterable[int]) -> None:
+        """
+        Method updates the index after measurements or coordinates of pins are changed. The number of pins of the board
+        should not change, otherwise the index should be built again.
+        :param total_pin_indices: total indices of the changed pins.
+        """
+
+        test_measurements_removed = False
+        for total_pin_index in total_pin_indices:
+            flags = self._get_measurement_flags(self.pins[total_pin_index])
+            test_measurements_removed |= bool(self.measurement_flags[total_pin_index] & ~flags & self.TEST_MEASUREMENT)
+            self.measurement_flags[total_pin_index] = flags
+            self.has_test_measurements |= bool(flags & self.TEST_MEASUREMENT)
+        if test_measurements_removed:
+            self.has_test_measurements = any(flags & self.TEST_MEASUREMENT for flags in self.measurement_flags)
+        self._coordinates = None
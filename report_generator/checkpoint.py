@@ -0,0 +1,213 @@
+"""
+File with class to save the progress of report generation, so that an interrupted generation can be resumed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+from report_generator.curves import get_curve_hash, get_curve_pairs
+from report_generator.definitions import PinInfo
+
+
+logger = logging.getLogger("report_generator")
+_CHECKPOINT_FILE: str = "checkpoint.json"
+_SAVE_INTERVAL: float = 1.0
+
+
+def _compress_indices(indices: Set[int]) -> List[List[int]]:
+    """
+    :param indices: set of indices.
+    :return: list of ranges [start, stop) with the indices. Pins are drawn in order, so there are few ranges.
+    """
+
+    ranges = []
+    for index in sorted(indices):
+        if ranges and ranges[-1][1] == index:
+            ranges[-1][1] = index + 1
+        else:
+            ranges.append([index, index + 1])
+    return ranges
+
+
+def find_checkpoint(parent_directory: str, fingerprint: str) -> Optional[str]:
+    """
+    :param parent_directory: directory with reports;
+    :param fingerprint: fingerprint of the report to be resumed.
+    :return: the most recent report directory with the checkpoint of the same report or None.
+    """
+
+    try:
+        dir_names = [os.path.join(parent_directory, dir_name) for dir_name in os.listdir(parent_directory)]
+    except OSError:
+        return None
+
+    checkpoints = []
+    for dir_name in dir_names:
+        file_name = os.path.join(dir_name, _CHECKPOINT_FILE)
+        try:
+            modification_time = os.path.getmtime(file_name)
+        except OSError:
+            continue
+        checkpoints.append((modification_time, dir_name))
+
+    for _, dir_name in sorted(checkpoints, reverse=True):
+        data = Checkpoint.read(dir_name)
+        if data is not None and data.get("fingerprint") == fingerprint:
+            return dir_name
+    return None
+
+
+def get_fingerprint(pins_info: List[PinInfo], *settings: Any) -> str:
+    """
+    :param pins_info: list with information about pins of the report;
+    :param settings: settings that change the content of the report. Their representation should not depend on the
+    process.
+    :return: fingerprint of the report.
+    """
+
+    hash_object = hashlib.blake2b(repr(settings).encode("utf-8"), digest_size=20)
+    for pin_info in pins_info:
+        hash_object.update(repr((pin_info.total_pin_index, pin_info.element_index, pin_info.pin_index, pin_info.x,
+                                 pin_info.y, pin_info.score, pin_info.pin_type.name)).encode("utf-8"))
+        for ref_voltages, ref_currents, test_voltages, test_currents in get_curve_pairs(pin_info):
+            hash_object.update(repr((get_curve_hash(ref_voltages, ref_currents),
+                                     get_curve_hash(test_voltages, test_currents))).encode("utf-8"))
+    return hash_object.hexdigest()
+
+
+class Checkpoint:
+    """
+    Class with the manifest of the finished stages and drawn pins of the report. The manifest is saved to the report
+    directory when a stage is finished and not more often than once per second while pins are drawn, so that after
+    cancellation or a crash the generation can be continued in the same directory. The manifest is removed when the
+    report is generated.
+    """
+
+    def __init__(self, dir_name: str, fingerprint: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """
+        :param dir_name: report directory;
+        :param fingerprint: fingerprint of the report;
+        :param data: data of the saved checkpoint to continue.
+        """
+
+        data = data or dict()
+        self._dir_name: str = dir_name
+        self._fingerprint: str = fingerprint
+        self._finished: bool = False
+        self._last_save_time: float = time.monotonic()
+        self._pins: Set[int] = {index for start, stop in data.get("pins", []) for index in range(start, stop)}
+        self._steps: Dict[str, Any] = data.get("steps", dict())
+
+    @property
+    def file_name(self) -> str:
+        """
+        :return: name of the file with the manifest.
+        """
+
+        return os.path.join(self._dir_name, _CHECKPOINT_FILE)
+
+    @classmethod
+    def open(cls, dir_name: str, fingerprint: str) -> "Checkpoint":
+        """
+        :param dir_name: report directory;
+        :param fingerprint: fingerprint of the report.
+        :return: checkpoint with the saved progress if the directory has the checkpoint of the same report, otherwise
+        empty checkpoint.
+        """
+
+        data = cls.read(dir_name)
+        if data is None or data.get("fingerprint") != fingerprint:
+            data = None
+        return cls(dir_name, fingerprint, data)
+
+    @staticmethod
+    def read(dir_name: str) -> Optional[Dict[str, Any]]:
+        """
+        :param dir_name: report directory.
+        :return: data of the checkpoint saved in the directory or None.
+        """
+
+        try:
+            with open(os.path.join(dir_name, _CHECKPOINT_FILE), "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+
+    def finish(self) -> None:
+        """
+        Method removes the manifest when the report is generated.
+        """
+
+        self._finished = True
+        try:
+            os.remove(self.file_name)
+        except OSError:
+            pass
+
+    def get_step_result(self, step_name: str) -> Any:
+        """
+        :param step_name: name of the step.
+        :return: result of the finished step.
+        """
+
+        return self._steps.get(step_name)
+
+    def is_pin_done(self, total_pin_index: int) -> bool:
+        """
+        :param total_pin_index: total index of the pin.
+        :return: True if the image of the pin was drawn.
+        """
+
+        return total_pin_index in self._pins
+
+    def is_step_done(self, step_name: str) -> bool:
+        """
+        :param step_name: name of the step.
+        :return: True if the step was finished.
+        """
+
+        return step_name in self._steps
+
+    def save(self) -> None:
+        """
+        Method saves the manifest. The file is replaced atomically, so the manifest is not corrupted by a crash.
+        """
+
+        if self._finished or not os.path.isdir(self._dir_name):
+            return
+
+        data = {"fingerprint": self._fingerprint,
+                "pins": _compress_indices(self._pins),
+                "steps": self._steps}
+        temp_file_name = f"{self.file_name}.tmp"
+        try:
+            with open(temp_file_name, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(temp_file_name, self.file_name)
+        except OSError:
+            logger.warning("Failed to save the checkpoint of the report to '%s'", self.file_name)
+        self._last_save_time = time.monotonic()
+
+    def set_pins_done(self, total_pin_indices: Iterable[int]) -> None:
+        """
+        Method marks pins whose images are drawn. The manifest is saved if the save interval has passed.
+        :param total_pin_indices: total indices of pins.
+        """
+
+        self._pins.update(total_pin_indices)
+        if time.monotonic() - self._last_save_time >= _SAVE_INTERVAL:
+            self.save()
+
+    def set_step_done(self, step_name: str, result: Any) -> None:
+        """
+        Method marks the finished step and saves the manifest.
+        :param step_name: name of the step;
+        :param result: result of the step, it should be serializable to JSON.
+        """
+
+        self._steps[step_name] = result
+        self.save()
@@ -0,0 +1,175 @@
+"""
+File with functions to prepare IV-curves of pins for drawing.
+"""
+
+import hashlib
+import math
+from typing import Any, List, Optional, Sequence, Tuple
+import numpy as np
+from report_generator.definitions import PinInfo, ScalingTypes
+
+
+def decimate_curve(voltages: np.ndarray, currents: np.ndarray, v_max: float, i_max: float, width: int, height: int,
+                   tolerance: float = 0.5) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Function removes points of the IV-curve that do not change its image of the given size. Consecutive points that
+    fall into the same cell of a grid on the image are merged into one point. The diagonal of the cell is equal to the
+    tolerance, so the image of the decimated curve differs from the image of the original curve by less than the
+    tolerance. For a smooth curve the number of points is limited by the length of the curve in pixels, not by the
+    number of measured points.
+    :param voltages: voltages of the IV-curve;
+    :param currents: currents of the IV-curve in A;
+    :param v_max: scale of the graph along the voltage axis in V;
+    :param i_max: scale of the graph along the current axis in mA;
+    :param width: width of the graph in pixels;
+    :param height: height of the graph in pixels;
+    :param tolerance: maximum deviation of the decimated curve in pixels.
+    :return: voltages and currents of the decimated IV-curve.
+    """
+
+    voltages = np.asarray(voltages, dtype=float)
+    currents = np.asarray(currents, dtype=float)
+    if len(voltages) <= 2 or len(voltages) != len(currents) or v_max <= 0 or i_max <= 0:
+        return voltages, currents
+
+    # The graph shows the range from -v_max to v_max and from -i_max to i_max
+    x = voltages * (width / (2 * v_max))
+    y = currents * (1000 * height / (2 * i_max))
+    cell_size = tolerance / math.sqrt(2)
+    cells_x = np.floor(x / cell_size)
+    cells_y = np.floor(y / cell_size)
+    keep = np.ones(len(x), dtype=bool)
+    keep[1:] = (cells_x[1:] != cells_x[:-1]) | (cells_y[1:] != cells_y[:-1])
+    keep[-1] = True
+    return voltages[keep], currents[keep]
+
+
+def get_curve_hash(voltages: np.ndarray, currents: np.ndarray) -> Optional[str]:
+    """
+    :param voltages: voltages of the IV-curve;
+    :param currents: currents of the IV-curve.
+    :return: hash of the IV-curve or None if the curve is empty.
+    """
+
+    if not len(voltages) or not len(currents):
+        return None
+
+    hash_object = hashlib.blake2b(digest_size=16)
+    for values in (voltages, currents):
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        hash_object.update(len(values).to_bytes(8, "little"))
+        hash_object.update(values.tobytes())
+    return hash_object.hexdigest()
+
+
+def get_curve_pairs(pin_info: PinInfo) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    :param pin_info: information about pin.
+    :return: list with voltages and currents of the reference and test IV-curves for each pair of matching
+    measurements of the pin. Missing curves are empty arrays.
+    """
+
+    pairs = []
+    for measurements in get_measurement_pairs(pin_info.measurements):
+        curves = []
+        for measurement in measurements:
+            if measurement is None:
+                curves.extend((np.array([]), np.array([])))
+            else:
+                curves.extend((measurement.ivc.voltages, measurement.ivc.currents))
+        pairs.append(tuple(curves))
+    return pairs or [(np.array([]), np.array([]), np.array([]), np.array([]))]
+
+
+def get_curves(pin_info: PinInfo) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :param pin_info: information about pin.
+    :return: voltages and currents of the reference IV-curve, voltages and currents of the test IV-curve. Missing
+    curves are empty arrays.
+    """
+
+    ref_currents = np.array([])
+    ref_voltages = np.array([])
+    test_currents = np.array([])
+    test_voltages = np.array([])
+    for measurement in pin_info.measurements:
+        if measurement.is_reference:
+            ref_currents = measurement.ivc.currents
+            ref_voltages = measurement.ivc.voltages
+        else:
+            test_currents = measurement.ivc.currents
+            test_voltages = measurement.ivc.voltages
+    return ref_voltages, ref_currents, test_voltages, test_currents
+
+
+def get_measurement_pairs(measurements: Sequence[Any]) -> List[Tuple[Optional[Any], Optional[Any]]]:
+    """
+    Function matches the test measurements of the pin with the reference measurements. A test measurement is matched
+    with the reference measurement with the same settings, otherwise with the reference measurement with the same
+    ordinal number. If the pin has not more than one measurement of each kind, the last reference and the last test
+    measurements make the only pair.
+    :param measurements: measurements of the pin.
+    :return: list with pairs of the reference and test measurements. Measurements without a pair are paired with None.
+    """
+
+    references = [measurement for measurement in measurements if measurement.is_reference]
+    tests = [measurement for measurement in measurements if not measurement.is_reference]
+    if len(references) <= 1 and len(tests) <= 1:
+        if not measurements:
+            return []
+        return [(references[-1] if references else None, tests[-1] if tests else None)]
+
+    pairs = []
+    unused_references = list(references)
+    for ordinal, test in enumerate(tests):
+        reference = next((item for item in unused_references if item.settings == test.settings), None)
+        if reference is None and ordinal < len(references) and \
+                any(item is references[ordinal] for item in unused_references):
+            reference = references[ordinal]
+        if reference is not None:
+            unused_references = [item for item in unused_references if item is not reference]
+        pairs.append((reference, test))
+    pairs.extend((reference, None) for reference in unused_references)
+    return pairs
+
+
+def get_scales(pin_info: PinInfo, index: int, scaling_type: ScalingTypes, user_defined_scales: list,
+               curves: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> Tuple[float, float]:
+    """
+    :param pin_info: information about pin;
+    :param index: pin index;
+    :param scaling_type: type of scaling for a graph with IV-curve;
+    :param user_defined_scales: list with user defined scales;
+    :param curves: voltages and currents of the reference and test IV-curves. If the pin has several pairs of
+    measurements, curves of all pairs should be joined.
+    :return: scales of the graph with IV-curves along the voltage axis in V and along the current axis in mA.
+    """
+
+    ref_voltages, ref_currents, test_voltages, test_currents = curves
+    if scaling_type == ScalingTypes.EYEPOINT_P10:
+        scale_coefficient = 1.2
+        v_max = scale_coefficient * max(measurement.settings.max_voltage for measurement in pin_info.measurements)
+        i_max = 1000 * scale_coefficient * max(measurement.settings.max_voltage /
+                                               measurement.settings.internal_resistance
+                                               for measurement in pin_info.measurements)
+    elif (scaling_type == ScalingTypes.USER_DEFINED and isinstance(user_defined_scales, (list, tuple)) and
+          index < len(user_defined_scales) and isinstance(user_defined_scales[index], (list, tuple)) and
+          len(user_defined_scales[index]) == 2):
+        v_max, i_max = user_defined_scales[index]
+        i_max *= 1000
+    else:
+        i_max = 1.2 * 1000 * np.amax(np.absolute(np.concatenate((test_currents, ref_currents), axis=0)))
+        v_max = 1.2 * np.amax(np.absolute(np.concatenate((test_voltages, ref_voltages), axis=0)))
+    return v_max, i_max
+
+
+def join_curve_pairs(pairs: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :param pairs: list with voltages and currents of the reference and test IV-curves.
+    :return: joined voltages and currents of all reference and all test IV-curves. They are used to calculate scales.
+    """
+
+    if len(pairs) == 1:
+        return pairs[0]
+    return tuple(np.concatenate([np.asarray(pair[position], dtype=float) for pair in pairs]) for position in range(4))
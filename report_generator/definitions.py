@@ -3,8 +3,57 @@ from enum import auto, Enum
 from typing import Dict
 
 
+# Data of the artifact depends on its type: information about the pin for an IV-curve image, type of the report for a
+# report (None for the report with changes), dictionary with numbers for metrics. Metrics have no file
+Artifact = namedtuple("Artifact", ["artifact_type", "file_name", "data"], defaults=(None,))
+# Scores of pairs of measurements are given only for pins with several pairs of reference and test measurements
 PinInfo = namedtuple("PinInfo", ["element_name", "element_index", "pin_index", "x", "y", "measurements", "score",
-                                 "pin_type", "total_pin_index", "comment", "multiplexer_output"])
+                                 "pin_type", "total_pin_index", "comment", "multiplexer_output", "scores"],
+                     defaults=(None,))
+
+
+class ArtifactTypes(Enum):
+    """
+    Types of files and data produced by report generation.
+    """
+
+    BOARD_IMAGE = auto()
+    FAULT_HISTOGRAM = auto()
+    IV_IMAGE = auto()
+    METRICS = auto()
+    REPORT = auto()
+    RESULTS = auto()
+
+
+class ExportFormats(Enum):
+    """
+    Formats of files with results of the report.
+    """
+
+    CSV = auto()
+    JSONL = auto()
+    NPZ = auto()
+
+
+class ImageFormats(Enum):
+    """
+    Formats of images with IV-curves.
+    """
+
+    INLINE_SVG = auto()
+    PNG = auto()
+    SVG = auto()
+
+
+class PinChanges(Enum):
+    """
+    Changes of pins between two test runs.
+    """
+
+    ADDED = auto()
+    REMOVED = auto()
+    SCORE = auto()
+    TYPE = auto()
 
 
 class PinTypes(Enum):
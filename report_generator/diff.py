@@ -0,0 +1,333 @@
+"""
+File with class to compare the results of two test runs of the same board.
+"""
+
+import hashlib
+import logging
+from typing import Any, Callable, Dict, List, Optional, Union
+import numpy as np
+from epcore.elements import Board, IVCurve, Measurement, MeasurementSettings, Pin
+from report_generator import utils as ut
+from report_generator.boardindex import BoardIndex
+from report_generator.curves import get_curve_hash
+from report_generator.definitions import PinChanges, PinInfo, PinTypes
+from report_generator.export import read_results
+
+
+logger = logging.getLogger("report_generator")
+# Scores are rounded to 0.1%, so any change of the rounded score is greater than this value
+_MIN_SCORE_DELTA: float = 0.05
+
+
+def _get_keys(results: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    :param results: dictionary with arrays of results.
+    :return: array with keys of pins made of element and pin indices.
+    """
+
+    return (results["element_index"].astype(np.int64) << 32) | results["pin_index"].astype(np.int64)
+
+
+def _get_pin_hash(pin: Pin) -> str:
+    """
+    :param pin: pin.
+    :return: hash of the measurements of the pin. The score and the type of pins with equal hashes are the same.
+    """
+
+    hash_object = hashlib.blake2b(repr((len(pin.measurements), getattr(pin, "is_loss", None))).encode("utf-8"),
+                                  digest_size=16)
+    for measurement in pin.measurements:
+        hash_object.update(repr((measurement.is_reference, measurement.settings)).encode("utf-8"))
+        curve_hash = get_curve_hash(np.asarray(measurement.ivc.voltages), np.asarray(measurement.ivc.currents))
+        hash_object.update(str(curve_hash).encode("utf-8"))
+    return hash_object.hexdigest()
+
+
+def _take(values: np.ndarray, positions: np.ndarray, missing_value: Any) -> np.ndarray:
+    """
+    :param values: array with values;
+    :param positions: positions of the values to take, -1 for missing values;
+    :param missing_value: value for missing positions.
+    :return: array with the values.
+    """
+
+    result = np.full(len(positions), missing_value, dtype=values.dtype)
+    mask = positions >= 0
+    result[mask] = values[positions[mask]]
+    return result
+
+
+def compare_results(old: Dict[str, np.ndarray], new: Dict[str, np.ndarray], min_score_delta: float = _MIN_SCORE_DELTA
+                    ) -> Dict[str, np.ndarray]:
+    """
+    Function aligns the pins of two test runs by element and pin indices and finds the changed pins. All operations
+    are performed on arrays.
+    :param old: dictionary with arrays of results of the earlier run (as read by read_results);
+    :param new: dictionary with arrays of results of the later run;
+    :param min_score_delta: minimum change of the score in %.
+    :return: dictionary with arrays for the changed pins sorted by element and pin indices. The change of the pin is
+    the name of PinChanges, positions of the pin in the arrays of the runs are -1 for missing pins.
+    """
+
+    old_keys = _get_keys(old)
+    new_keys = _get_keys(new)
+    _, old_matched, new_matched = np.intersect1d(old_keys, new_keys, assume_unique=True, return_indices=True)
+    removed = np.setdiff1d(np.arange(len(old_keys)), old_matched, assume_unique=True)
+    added = np.setdiff1d(np.arange(len(new_keys)), new_matched, assume_unique=True)
+
+    old_scores = old["score"][old_matched]
+    new_scores = new["score"][new_matched]
+    score_changed = np.isnan(old_scores) != np.isnan(new_scores)
+    score_changed |= np.abs(new_scores - old_scores) >= min_score_delta
+    type_changed = old["pin_type"][old_matched] != new["pin_type"][new_matched]
+    changed = score_changed | type_changed
+
+    old_positions = np.concatenate((old_matched[changed], removed, np.full(len(added), -1))).astype(np.int64)
+    new_positions = np.concatenate((new_matched[changed], np.full(len(removed), -1), added)).astype(np.int64)
+    changes = np.concatenate((np.where(type_changed[changed], PinChanges.TYPE.name, PinChanges.SCORE.name),
+                              np.full(len(removed), PinChanges.REMOVED.name),
+                              np.full(len(added), PinChanges.ADDED.name)))
+    keys = np.concatenate((old_keys[old_matched[changed]], old_keys[removed], new_keys[added]))
+    order = np.argsort(keys, kind="stable")
+
+    old_scores = _take(old["score"], old_positions, np.nan)
+    new_scores = _take(new["score"], new_positions, np.nan)
+    result = {"change": changes.astype(str),
+              "element_index": (keys >> 32).astype(np.int64),
+              "new_position": new_positions,
+              "new_score": new_scores,
+              "new_total_pin_index": _take(new["total_pin_index"], new_positions, -1),
+              "new_type": _take(new["pin_type"], new_positions, ""),
+              "old_position": old_positions,
+              "old_score": old_scores,
+              "old_total_pin_index": _take(old["total_pin_index"], old_positions, -1),
+              "old_type": _take(old["pin_type"], old_positions, ""),
+              "pin_index": (keys & 0xFFFFFFFF).astype(np.int64),
+              "score_delta": new_scores - old_scores}
+    return {name: values[order] for name, values in result.items()}
+
+
+def get_board_results(index: BoardIndex, total_pin_indices: np.ndarray, tolerance: Optional[float] = None,
+                      is_report_for_test_board: Optional[bool] = None, check_stop: Callable[[], None] = lambda: None
+                      ) -> Dict[str, np.ndarray]:
+    """
+    :param index: index of the board;
+    :param total_pin_indices: total indices of pins for which scores should be calculated;
+    :param tolerance: tolerance in %;
+    :param is_report_for_test_board: if True, then types of pins are determined for test board;
+    :param check_stop: function that checks whether the operation is stopped.
+    :return: dictionary with arrays of results for the pins, as read by read_results.
+    """
+
+    if is_report_for_test_board is None:
+        is_report_for_test_board = index.has_test_measurements
+    pins = [index.pins[total_pin_index] for total_pin_index in total_pin_indices.tolist()]
+    scores = []
+    pin_types = []
+    pin_indices = [(index.element_indices[total_pin_index], index.pin_indices[total_pin_index])
+                   for total_pin_index in total_pin_indices.tolist()]
+    for pin, (score, _) in zip(pins, ut.get_pin_scores(pins, check_stop=check_stop, pin_indices=pin_indices)):
+        scores.append(np.nan if score is None else score)
+        pin_types.append(ut.get_pin_type(pin, score, tolerance, is_report_for_test_board).name)
+    total_pin_indices = np.asarray(total_pin_indices, dtype=np.int64)
+    return {"element_index": np.asarray(index.element_indices, dtype=np.int64)[total_pin_indices],
+            "pin_index": np.asarray(index.pin_indices, dtype=np.int64)[total_pin_indices],
+            "pin_type": np.array(pin_types, dtype=str),
+            "score": np.array(scores, dtype=float),
+            "total_pin_index": total_pin_indices}
+
+
+class RunDiff:
+    """
+    Class compares two test runs of the same board. A run is given by the board or by the file with exported results.
+    Pins are aligned by element and pin indices. If both runs are boards, scores are calculated only for the pins
+    whose measurements differ, so the cost of the comparison depends on the number of changed pins.
+    """
+
+    def __init__(self, old: Union[Board, str], new: Union[Board, str], tolerance: Optional[float] = None,
+                 is_report_for_test_board: Optional[bool] = None, check_stop: Callable[[], None] = lambda: None
+                 ) -> None:
+        """
+        :param old: board or name of the file with results of the earlier run;
+        :param new: board or name of the file with results of the later run;
+        :param tolerance: tolerance in % to determine types of pins on boards;
+        :param is_report_for_test_board: if True, then types of pins on boards are determined for test board;
+        :param check_stop: function that checks whether the operation is stopped.
+        """
+
+        self._check_stop: Callable[[], None] = check_stop
+        self._is_report_for_test_board: Optional[bool] = is_report_for_test_board
+        self._tolerance: Optional[float] = tolerance
+        self.new: Union[BoardIndex, Dict[str, np.ndarray]] = self._read_run(new)
+        self.old: Union[BoardIndex, Dict[str, np.ndarray]] = self._read_run(old)
+        self.changes: Dict[str, np.ndarray] = self._compare()
+
+    def _compare(self) -> Dict[str, np.ndarray]:
+        """
+        :return: dictionary with arrays for the changed pins.
+        """
+
+        old_all = self._get_all_pins(self.old)
+        new_all = self._get_all_pins(self.new)
+        if isinstance(self.old, BoardIndex) and isinstance(self.new, BoardIndex):
+            old_keys = _get_keys(old_all)
+            new_keys = _get_keys(new_all)
+            _, old_matched, new_matched = np.intersect1d(old_keys, new_keys, assume_unique=True, return_indices=True)
+            same = np.array([_get_pin_hash(self.old.pins[old_index]) == _get_pin_hash(self.new.pins[new_index])
+                             for old_index, new_index in zip(old_matched.tolist(), new_matched.tolist())], dtype=bool)
+            old_all["total_pin_index"] = np.setdiff1d(old_all["total_pin_index"], old_matched[same], assume_unique=True)
+            new_all["total_pin_index"] = np.setdiff1d(new_all["total_pin_index"], new_matched[same], assume_unique=True)
+            logger.info("%d pins have the same measurements in both runs", np.count_nonzero(same))
+
+        old_results = self._get_results(self.old, old_all["total_pin_index"])
+        new_results = self._get_results(self.new, new_all["total_pin_index"])
+        changes = compare_results(old_results, new_results)
+        # Positions in the arrays of the selected pins are replaced by positions in the runs
+        for run, results, name in ((self.old, old_results, "old_position"), (self.new, new_results, "new_position")):
+            if isinstance(run, BoardIndex):
+                changes[name] = _take(results["total_pin_index"], changes[name], -1)
+        return changes
+
+    @staticmethod
+    def _get_all_pins(run: Union[BoardIndex, Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """
+        :param run: index of the board or results of the run.
+        :return: dictionary with arrays of element, pin and total pin indices of all pins of the run.
+        """
+
+        if isinstance(run, BoardIndex):
+            return {"element_index": np.asarray(run.element_indices, dtype=np.int64),
+                    "pin_index": np.asarray(run.pin_indices, dtype=np.int64),
+                    "total_pin_index": np.arange(len(run), dtype=np.int64)}
+        return run
+
+    def _get_results(self, run: Union[BoardIndex, Dict[str, np.ndarray]], total_pin_indices: np.ndarray
+                     ) -> Dict[str, np.ndarray]:
+        """
+        :param run: index of the board or results of the run;
+        :param total_pin_indices: total indices of pins to be compared.
+        :return: dictionary with arrays of results for the pins.
+        """
+
+        if isinstance(run, BoardIndex):
+            return get_board_results(run, total_pin_indices, self._tolerance, self._is_report_for_test_board,
+                                     self._check_stop)
+        return run
+
+    def _read_run(self, run: Union[Board, str]) -> Union[BoardIndex, Dict[str, np.ndarray]]:
+        """
+        :param run: board or name of the file with results.
+        :return: index of the board or dictionary with arrays of results.
+        """
+
+        if isinstance(run, Board):
+            return BoardIndex(run, self._check_stop)
+        return read_results(run)
+
+    @staticmethod
+    def _create_pin_info_from_results(results: Dict[str, np.ndarray], position: int) -> PinInfo:
+        """
+        :param results: dictionary with arrays of results;
+        :param position: position of the pin in the arrays.
+        :return: information about pin. Measurements are restored if the results contain IV-curves.
+        """
+
+        measurements = []
+        if "ref_voltages_offsets" in results and not np.isnan(results["max_voltage"][position]):
+            settings = MeasurementSettings(sampling_rate=float(results["sampling_rate"][position]),
+                                           internal_resistance=float(results["internal_resistance"][position]),
+                                           max_voltage=float(results["max_voltage"][position]),
+                                           probe_signal_frequency=float(results["probe_signal_frequency"][position]))
+            for prefix, is_reference in (("ref", True), ("test", False)):
+                start, stop = results[f"{prefix}_voltages_offsets"][position:position + 2]
+                if stop > start:
+                    ivc = IVCurve(currents=results[f"{prefix}_currents"][start:stop].tolist(),
+                                  voltages=results[f"{prefix}_voltages"][start:stop].tolist())
+                    measurements.append(Measurement(settings=settings, ivc=ivc, is_reference=is_reference))
+        score = results["score"][position]
+        return PinInfo(str(results["element_name"][position]), int(results["element_index"][position]),
+                       int(results["pin_index"][position]), float(results["x"][position]),
+                       float(results["y"][position]), measurements, None if np.isnan(score) else float(score),
+                       PinTypes[results["pin_type"][position]], int(results["total_pin_index"][position]),
+                       str(results["comment"][position]) or None, None)
+
+    def _get_element_name(self, run: Union[BoardIndex, Dict[str, np.ndarray]], position: int) -> str:
+        """
+        :param run: index of the board or results of the run;
+        :param position: position of the pin in the run.
+        :return: name of the element of the pin.
+        """
+
+        if isinstance(run, BoardIndex):
+            return run.get_element(position).name
+        return str(run["element_name"][position])
+
+    def _get_pin_info(self, position: int, score: Optional[float], pin_type: str) -> PinInfo:
+        """
+        :param position: position of the pin in the later run;
+        :param score: score of the pin;
+        :param pin_type: name of the type of the pin.
+        :return: information about pin of the later run.
+        """
+
+        if isinstance(self.new, BoardIndex):
+            pin = self.new.pins[position]
+            return PinInfo(self.new.get_element(position).name, self.new.element_indices[position],
+                           self.new.pin_indices[position], pin.x, pin.y, pin.measurements, score, PinTypes[pin_type],
+                           position, pin.comment, pin.multiplexer_output)
+        return self._create_pin_info_from_results(self.new, position)
+
+    def get_changes(self) -> List[Dict[str, Any]]:
+        """
+        :return: list with changes of pins for the report. Information about pin is given for the pins of the later
+        run, for the removed pins it is None.
+        """
+
+        names = ("change", "element_index", "pin_index", "old_position", "new_position", "old_score", "new_score",
+                 "score_delta", "old_type", "new_type")
+        changes = []
+        for values in zip(*(self.changes[name].tolist() for name in names)):
+            self._check_stop()
+            change = dict(zip(names, values))
+            for name in ("old_score", "new_score", "score_delta"):
+                change[name] = None if np.isnan(change[name]) else round(change[name], 1)
+            change["change"] = PinChanges[change["change"]]
+            if change["new_position"] >= 0:
+                change["element_name"] = self._get_element_name(self.new, change["new_position"])
+                change["pin"] = self._get_pin_info(change["new_position"], change["new_score"], change["new_type"])
+            else:
+                change["element_name"] = self._get_element_name(self.old, change["old_position"])
+                change["pin"] = None
+            changes.append(change)
+        return changes
+
+    def get_pins_number(self, new: bool = True) -> int:
+        """
+        :param new: if True, then the number of pins of the later run is returned.
+        :return: number of pins in the run.
+        """
+
+        run = self.new if new else self.old
+        return len(run) if isinstance(run, BoardIndex) else len(run["pin_index"])
+
+    def get_summary(self) -> Dict[str, Any]:
+        """
+        :return: dictionary with the numbers of changes and the transitions between types of pins.
+        """
+
+        changes = self.changes["change"]
+        type_changed = changes == PinChanges.TYPE.name
+        transitions, counts = np.unique(np.stack((self.changes["old_type"][type_changed],
+                                                  self.changes["new_type"][type_changed]), axis=1), axis=0,
+                                        return_counts=True)
+        matched = np.isin(changes, (PinChanges.SCORE.name, PinChanges.TYPE.name))
+        score_delta = self.changes["score_delta"][matched]
+        return {"added": int(np.count_nonzero(changes == PinChanges.ADDED.name)),
+                "changed": int(np.count_nonzero(matched)),
+                "new_pins_number": self.get_pins_number(True),
+                "old_pins_number": self.get_pins_number(False),
+                "removed": int(np.count_nonzero(changes == PinChanges.REMOVED.name)),
+                "score_decreased": int(np.count_nonzero(score_delta < 0)),
+                "score_increased": int(np.count_nonzero(score_delta > 0)),
+                "transitions": [(old_type, new_type, int(count))
+                                for (old_type, new_type), count in zip(transitions.tolist(), counts.tolist())]}
@@ -0,0 +1,222 @@
+"""
+File with functions to export the results of the report in machine-readable formats.
+"""
+
+import csv
+import json
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+from report_generator.curves import get_curves
+from report_generator.definitions import ExportFormats, PinInfo
+
+
+logger = logging.getLogger("report_generator")
+_COLUMNS: List[str] = ["total_pin_index", "element_index", "element_name", "pin_index", "x", "y", "score", "faulty",
+                       "pin_type", "comment", "measurement_comment", "module_number", "channel_number",
+                       "probe_signal_frequency", "max_voltage", "internal_resistance", "sampling_rate"]
+_CURVES: List[str] = ["ref_voltages", "ref_currents", "test_voltages", "test_currents"]
+_INT_COLUMNS: List[str] = ["total_pin_index", "element_index", "pin_index", "module_number", "channel_number"]
+_RESULTS_FILE: str = "results"
+_STR_COLUMNS: List[str] = ["element_name", "pin_type", "comment", "measurement_comment"]
+
+
+def _get_arrays(columns: Dict[str, list], curves: Optional[Dict[str, List[np.ndarray]]]) -> Dict[str, np.ndarray]:
+    """
+    :param columns: dictionary with columns of the table;
+    :param curves: dictionary with IV-curves of the pins or None.
+    :return: dictionary with arrays. Missing numbers are NaN for floats and -1 for integers. IV-curves of all pins are
+    concatenated, the curve of the pin i is values[offsets[i]:offsets[i + 1]].
+    """
+
+    arrays = dict()
+    for name in _COLUMNS:
+        values = columns[name]
+        if name in _INT_COLUMNS:
+            arrays[name] = np.array([-1 if value is None else value for value in values], dtype=np.int64)
+        elif name == "faulty":
+            arrays[name] = np.array(values, dtype=bool)
+        elif name in _STR_COLUMNS:
+            arrays[name] = np.array(["" if value is None else value for value in values], dtype=str)
+        else:
+            arrays[name] = np.array([np.nan if value is None else value for value in values], dtype=float)
+
+    if curves is not None:
+        for name in _CURVES:
+            arrays[f"{name}_offsets"] = np.concatenate(([0], np.cumsum([len(curve) for curve in curves[name]])))
+            arrays[name] = np.concatenate(curves[name]) if curves[name] else np.array([])
+    return arrays
+
+
+def _get_curve_columns(pins_info: List[PinInfo], check_stop: Callable[[], None]) -> Dict[str, List[np.ndarray]]:
+    """
+    :param pins_info: list with information about pins;
+    :param check_stop: function that checks whether the operation is stopped.
+    :return: dictionary with lists of reference and test IV-curves of the pins.
+    """
+
+    columns = {name: [] for name in _CURVES}
+    for pin_info in pins_info:
+        check_stop()
+        for name, values in zip(_CURVES, get_curves(pin_info)):
+            columns[name].append(np.asarray(values, dtype=float))
+    return columns
+
+
+def _get_file_name(dir_name: str, export_format: ExportFormats) -> str:
+    """
+    :param dir_name: report directory;
+    :param export_format: export format.
+    :return: name of the file with results in the given format.
+    """
+
+    return os.path.join(dir_name, f"{_RESULTS_FILE}.{export_format.name.lower()}")
+
+
+def _write_csv(file_name: str, columns: Dict[str, list]) -> None:
+    """
+    :param file_name: name of the CSV file;
+    :param columns: dictionary with columns of the table.
+    """
+
+    with open(file_name, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(_COLUMNS)
+        writer.writerows(zip(*(columns[name] for name in _COLUMNS)))
+
+
+def _write_jsonl(file_name: str, columns: Dict[str, list], curves: Optional[Dict[str, List[np.ndarray]]]) -> None:
+    """
+    :param file_name: name of the JSON Lines file;
+    :param columns: dictionary with columns of the table;
+    :param curves: dictionary with IV-curves of the pins or None.
+    """
+
+    names = list(_COLUMNS)
+    values = [columns[name] for name in _COLUMNS]
+    if curves is not None:
+        names.extend(_CURVES)
+        values.extend([curve.tolist() for curve in curves[name]] for name in _CURVES)
+    with open(file_name, "w", encoding="utf-8") as file:
+        file.writelines(json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n" for row in zip(*values))
+
+
+def _write_npz(file_name: str, columns: Dict[str, list], curves: Optional[Dict[str, List[np.ndarray]]]) -> None:
+    """
+    :param file_name: name of the NumPy file;
+    :param columns: dictionary with columns of the table;
+    :param curves: dictionary with IV-curves of the pins or None.
+    """
+
+    # The file name is given with extension, so numpy does not add another one
+    with open(file_name, "wb") as file:
+        np.savez(file, **_get_arrays(columns, curves))
+
+
+def get_result_columns(pins_info: List[PinInfo], tolerance: Optional[float] = None,
+                       check_stop: Callable[[], None] = lambda: None) -> Dict[str, List[Any]]:
+    """
+    :param pins_info: list with information about pins;
+    :param tolerance: tolerance in %;
+    :param check_stop: function that checks whether the operation is stopped.
+    :return: dictionary with columns of the table with results. Settings are taken from the first measurement of the
+    pin, missing values are None.
+    """
+
+    columns = {name: [] for name in _COLUMNS}
+    for pin_info in pins_info:
+        check_stop()
+        settings = pin_info.measurements[0].settings if pin_info.measurements else None
+        multiplexer_output = pin_info.multiplexer_output
+        measurement_comment = "\n".join(measurement.comment for measurement in pin_info.measurements
+                                        if measurement.comment)
+        row = {"total_pin_index": pin_info.total_pin_index,
+               "element_index": pin_info.element_index,
+               "element_name": pin_info.element_name,
+               "pin_index": pin_info.pin_index,
+               "x": pin_info.x,
+               "y": pin_info.y,
+               "score": pin_info.score,
+               "faulty": pin_info.score is not None and tolerance is not None and pin_info.score > tolerance,
+               "pin_type": pin_info.pin_type.name,
+               "comment": pin_info.comment,
+               "measurement_comment": measurement_comment or None,
+               "module_number": getattr(multiplexer_output, "module_number", None),
+               "channel_number": getattr(multiplexer_output, "channel_number", None),
+               "probe_signal_frequency": getattr(settings, "probe_signal_frequency", None),
+               "max_voltage": getattr(settings, "max_voltage", None),
+               "internal_resistance": getattr(settings, "internal_resistance", None),
+               "sampling_rate": getattr(settings, "sampling_rate", None)}
+        for name, value in row.items():
+            columns[name].append(value)
+    return columns
+
+
+def export_results(pins_info: List[PinInfo], dir_name: str, export_formats: List[ExportFormats],
+                   tolerance: Optional[float] = None, with_curves: bool = False,
+                   check_stop: Callable[[], None] = lambda: None) -> List[str]:
+    """
+    Function saves the table with results of the report (indices, coordinates, scores, types, settings and comments of
+    pins) to files results.csv, results.jsonl and results.npz. The table is collected once and written to all formats
+    in bulk. IV-curves are not saved to CSV.
+    :param pins_info: list with information about pins;
+    :param dir_name: report directory;
+    :param export_formats: formats of files;
+    :param tolerance: tolerance in %;
+    :param with_curves: if True, reference and test IV-curves are saved;
+    :param check_stop: function that checks whether the operation is stopped.
+    :return: names of saved files.
+    """
+
+    columns = get_result_columns(pins_info, tolerance, check_stop)
+    curves = _get_curve_columns(pins_info, check_stop) if with_curves else None
+    file_names = []
+    for export_format in sorted(set(export_formats), key=lambda item: item.name):
+        check_stop()
+        file_name = _get_file_name(dir_name, export_format)
+        if export_format == ExportFormats.CSV:
+            _write_csv(file_name, columns)
+        elif export_format == ExportFormats.JSONL:
+            _write_jsonl(file_name, columns, curves)
+        else:
+            _write_npz(file_name, columns, curves)
+        file_names.append(file_name)
+        logger.info("The results are saved to '%s'", file_name)
+    return file_names
+
+
+def read_results(file_name: str) -> Dict[str, np.ndarray]:
+    """
+    Function reads the table with results saved by the function export_results. The format is determined by the file
+    extension.
+    :param file_name: name of the file with results.
+    :return: dictionary with arrays as in the NPZ file.
+    """
+
+    if file_name.lower().endswith(".npz"):
+        with np.load(file_name) as data:
+            return dict(data)
+
+    with open(file_name, "r", encoding="utf-8", newline="") as file:
+        if file_name.lower().endswith(".csv"):
+            rows = list(csv.DictReader(file))
+            # CSV has no types, empty strings are missing values
+            for row in rows:
+                for name in _COLUMNS:
+                    value = row.get(name) or None
+                    if name == "faulty":
+                        value = value == "True"
+                    elif value is not None and name in _INT_COLUMNS:
+                        value = int(value)
+                    elif value is not None and name not in _STR_COLUMNS:
+                        value = float(value)
+                    row[name] = value
+        else:
+            rows = [json.loads(line) for line in file if line.strip()]
+
+    columns = {name: [row.get(name) for row in rows] for name in _COLUMNS}
+    curves = None
+    if rows and all(name in rows[0] for name in _CURVES):
+        curves = {name: [np.asarray(row[name], dtype=float) for row in rows] for name in _CURVES}
+    return _get_arrays(columns, curves)
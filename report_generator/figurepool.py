@@ -0,0 +1,106 @@
+"""
+File with class to reuse matplotlib figures.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class FigurePool:
+    """
+    Class with a small pool of matplotlib figures with Agg canvases. A figure is taken from the pool, drawn, saved and
+    returned to the pool after its content is cleared, so figures and canvases are not created and collected for every
+    image.
+    """
+
+    def __init__(self, max_size: int = 4) -> None:
+        """
+        :param max_size: maximum number of idle figures kept in the pool.
+        """
+
+        self._figures: Dict[Tuple[float, float, float], List[Figure]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._max_size: int = max_size
+        self._size: int = 0
+
+    @staticmethod
+    def _create_figure(width: float, height: float, dpi: float) -> Figure:
+        """
+        :param width: width of the figure in inches;
+        :param height: height of the figure in inches;
+        :param dpi: dots per inch.
+        :return: new figure with Agg canvas.
+        """
+
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        FigureCanvasAgg(fig)
+        return fig
+
+    @staticmethod
+    def _reset_figure(fig: Figure) -> None:
+        """
+        Method returns the figure to its initial state: all axes, artists and legends are removed.
+        :param fig: figure to be reset.
+        """
+
+        fig.clf()
+
+    def _release(self, key: Tuple[float, float, float], fig: Figure) -> None:
+        """
+        :param key: size and dpi of the figure;
+        :param fig: figure to be returned to the pool.
+        """
+
+        self._reset_figure(fig)
+        with self._lock:
+            self._figures.setdefault(key, []).append(fig)
+            self._figures.move_to_end(key)
+            self._size += 1
+            while self._size > self._max_size:
+                oldest_key = next(iter(self._figures))
+                figures = self._figures[oldest_key]
+                figures.pop(0)
+                self._size -= 1
+                if not figures:
+                    del self._figures[oldest_key]
+
+    def clear(self) -> None:
+        """
+        Method removes all idle figures from the pool.
+        """
+
+        with self._lock:
+            self._figures.clear()
+            self._size = 0
+
+    @contextmanager
+    def figure(self, width: float, height: float, dpi: float) -> Iterator[Figure]:
+        """
+        Method gives an empty figure of the given size. The figure is returned to the pool on exit from the context.
+        :param width: width of the figure in inches;
+        :param height: height of the figure in inches;
+        :param dpi: dots per inch.
+        """
+
+        key = width, height, dpi
+        with self._lock:
+            figures = self._figures.get(key)
+            fig = figures.pop() if figures else None
+            if fig is not None:
+                self._size -= 1
+                if not figures:
+                    del self._figures[key]
+        if fig is None:
+            fig = self._create_figure(width, height, dpi)
+
+        try:
+            yield fig
+        finally:
+            self._release(key, fig)
+
+
+FIGURE_POOL: FigurePool = FigurePool()
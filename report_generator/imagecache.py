@@ -0,0 +1,172 @@
+"""
+File with class to keep rendered images on disk between reports.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger("report_generator")
+_CACHES: Dict[Tuple[str, int], "ImageCache"] = dict()
+_CACHES_LOCK: threading.Lock = threading.Lock()
+_EXTENSION: str = ".png"
+
+
+class ImageCache:
+    """
+    Class with a persistent cache of rendered images. Images are stored in files named by the key of their content, the
+    least recently used images are removed when the total size of the cache exceeds the budget. Images found in the
+    cache are hard-linked (or copied if linking is not possible) to the required place instead of rendering.
+    """
+
+    def __init__(self, dir_name: str, max_size: int) -> None:
+        """
+        :param dir_name: directory with cached images;
+        :param max_size: maximum total size of cached images in bytes.
+        """
+
+        self._dir_name: str = dir_name
+        self._lock: threading.Lock = threading.Lock()
+        self._max_size: int = max_size
+        self._size: Optional[int] = None
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def _evict(self) -> None:
+        """
+        Method removes the least recently used images until the cache takes no more than 90% of the budget.
+        """
+
+        files = sorted(self._get_files(), key=lambda file_info: file_info[1])
+        size = sum(file_info[2] for file_info in files)
+        required_size = 0.9 * self._max_size
+        removed_number = 0
+        for path, _, file_size in files:
+            if size <= required_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= file_size
+            removed_number += 1
+        self._size = size
+        logger.info("%d images are removed from the image cache", removed_number)
+
+    def _get_files(self) -> List[Tuple[str, float, int]]:
+        """
+        :return: list with path, time of last use and size of cached images.
+        """
+
+        files = []
+        for dir_path, _, file_names in os.walk(self._dir_name):
+            for file_name in file_names:
+                if not file_name.endswith(_EXTENSION):
+                    continue
+                path = os.path.join(dir_path, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, stat.st_mtime, stat.st_size))
+        return files
+
+    def _get_path(self, key: str) -> str:
+        """
+        :param key: key of the image.
+        :return: path to the cached image.
+        """
+
+        return os.path.join(self._dir_name, key[:2], key + _EXTENSION)
+
+    def get(self, key: str, file_name: str) -> bool:
+        """
+        Method puts the cached image to the given file.
+        :param key: key of the image;
+        :param file_name: name of the file where the image should be.
+        :return: True if the image was found in the cache.
+        """
+
+        path = self._get_path(key)
+        try:
+            os.utime(path)
+            if os.path.lexists(file_name):
+                os.remove(file_name)
+            try:
+                os.link(path, file_name)
+            except OSError:
+                shutil.copyfile(path, file_name)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def get_hit_rate(self) -> Optional[float]:
+        """
+        :return: share of images found in the cache or None if the cache was not used.
+        """
+
+        requests_number = self.hits + self.misses
+        return self.hits / requests_number if requests_number else None
+
+    def put(self, key: str, file_name: str) -> None:
+        """
+        Method puts the rendered image to the cache.
+        :param key: key of the image;
+        :param file_name: name of the file with the image.
+        """
+
+        path = self._get_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            shutil.copyfile(file_name, temp_path)
+            os.replace(temp_path, path)
+            file_size = os.path.getsize(path)
+        except OSError:
+            logger.warning("Failed to save the image '%s' to the image cache", file_name)
+            return
+
+        with self._lock:
+            # The total size is calculated once and then updated
+            if self._size is None:
+                self._size = sum(file_info[2] for file_info in self._get_files())
+            else:
+                self._size += file_size
+            if self._size > self._max_size:
+                self._evict()
+
+
+def get_image_cache(dir_name: Optional[str], max_size: int) -> Optional[ImageCache]:
+    """
+    :param dir_name: directory with cached images;
+    :param max_size: maximum total size of cached images in MB.
+    :return: cache of images. The same object is returned for the same directory, so the cache size is calculated
+    once. If the directory is not given, None is returned.
+    """
+
+    if not dir_name:
+        return None
+
+    key = os.path.abspath(dir_name), max_size
+    with _CACHES_LOCK:
+        if key not in _CACHES:
+            _CACHES[key] = ImageCache(key[0], max_size * pow(2, 20))
+        return _CACHES[key]
+
+
+def get_image_key(*parts: Any) -> str:
+    """
+    :param parts: values that define the content of the image. Their representation should not depend on the process.
+    :return: key of the image.
+    """
+
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=20).hexdigest()
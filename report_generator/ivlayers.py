@@ -0,0 +1,156 @@
+"""
+File with class to compose IV-curve images from cached layers.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QPainter, QPixmap
+
+
+logger = logging.getLogger("report_generator")
+
+
+class IVLayerCache:
+    """
+    Class to compose IV-curve images from layers. The background with axes, grid and legend depends only on the scales
+    and the style of the graph, the layer with the reference curve depends also on the reference curve. These layers
+    are rendered once and kept in the cache, so for a board of the same type that is tested many times only the test
+    curve is drawn for each pin. The curves are drawn by the plot items themselves, so the images are the same as the
+    images of the whole widget. If the plot does not allow this, the cache is not used.
+    The cache is not thread-safe, it is used only in the GUI thread like the IV-curve viewer.
+    """
+
+    def __init__(self, max_layers: int = 256) -> None:
+        """
+        :param max_layers: maximum number of layers kept in the cache.
+        """
+
+        self._layers: OrderedDict = OrderedDict()
+        self._max_layers: int = max_layers
+        self._supported: Optional[bool] = None
+
+    @staticmethod
+    def _draw_curve(painter: QPainter, plot: Any, curve: Any) -> None:
+        """
+        :param painter: painter for the image of the whole plot widget;
+        :param plot: plot widget;
+        :param curve: curve item of the plot.
+        """
+
+        canvas = plot.canvas()
+        canvas_rect = QRectF(canvas.contentsRect())
+        painter.save()
+        painter.translate(canvas.pos())
+        painter.setClipRect(canvas_rect)
+        painter.setRenderHint(QPainter.Antialiasing, curve.testRenderHint(curve.RenderAntialiased))
+        curve.draw(painter, plot.canvasMap(curve.xAxis()), plot.canvasMap(curve.yAxis()), canvas_rect)
+        painter.restore()
+
+    def _get_layer(self, key: Hashable, render: Callable[[], QPixmap]) -> QPixmap:
+        """
+        :param key: key of the layer;
+        :param render: function to render the layer if it is not in the cache.
+        :return: layer.
+        """
+
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = render()
+            self._layers[key] = layer
+            while len(self._layers) > self._max_layers:
+                self._layers.popitem(last=False)
+        else:
+            self._layers.move_to_end(key)
+        return layer
+
+    @staticmethod
+    def _render_background(plot: Any, curves: Tuple[Any, ...]) -> QPixmap:
+        """
+        :param plot: plot widget;
+        :param curves: curve items attached to the plot. They are shown in the legend but are not drawn.
+        :return: image of the plot without curves.
+        """
+
+        for curve in curves:
+            curve.setVisible(False)
+        try:
+            return plot.grab()
+        finally:
+            for curve in curves:
+                curve.setVisible(True)
+
+    def _render_curve(self, plot: Any, curve: Any) -> QPixmap:
+        """
+        :param plot: plot widget;
+        :param curve: curve item of the plot.
+        :return: transparent image with the curve.
+        """
+
+        layer = QPixmap(plot.size())
+        layer.fill(Qt.transparent)
+        painter = QPainter(layer)
+        try:
+            self._draw_curve(painter, plot, curve)
+        finally:
+            painter.end()
+        return layer
+
+    def clear(self) -> None:
+        """
+        Method removes all layers from the cache.
+        """
+
+        self._layers.clear()
+
+    def draw(self, plot: Any, ref_curve: Any, test_curve: Any, ref_hash: Optional[str], style: Hashable,
+             file_name: str) -> bool:
+        """
+        Method composes and saves an image of the plot with IV-curves. The curves with data should be attached to the
+        plot, the scales should be set.
+        :param plot: plot widget;
+        :param ref_curve: curve item with the reference curve;
+        :param test_curve: curve item with the test curve;
+        :param ref_hash: hash of the reference curve or None if there is no reference curve;
+        :param style: key of the style of the graph (size, fonts, pens, titles);
+        :param file_name: name of the file in which to save the image.
+        :return: True if the image was composed and saved, False if the cache cannot be used for the plot.
+        """
+
+        if self._supported is False:
+            return False
+
+        try:
+            scales = plot.x_scale, plot.y_scale
+            size = plot.width(), plot.height()
+            # Curves are drawn and shown in the legend in the order in which they are attached to the plot
+            curves = tuple(item for item in plot.itemList() if item is ref_curve or item is test_curve)
+            order = tuple(curve is ref_curve for curve in curves)
+            background = self._get_layer(("background", style, size, scales, order),
+                                         lambda: self._render_background(plot, curves))
+            image = background.copy()
+            painter = QPainter(image)
+            try:
+                for curve in curves:
+                    if curve is test_curve:
+                        self._draw_curve(painter, plot, test_curve)
+                    elif ref_hash is not None:
+                        ref_layer = self._get_layer(("reference", style, size, scales, ref_hash),
+                                                    lambda: self._render_curve(plot, ref_curve))
+                        painter.drawPixmap(0, 0, ref_layer)
+                    else:
+                        self._draw_curve(painter, plot, ref_curve)
+            finally:
+                painter.end()
+        except (AttributeError, TypeError) as exc:
+            self._supported = False
+            self.clear()
+            logger.info("IV-curve images will be drawn without cached layers: %s", exc)
+            return False
+
+        self._supported = True
+        return image.save(file_name, "PNG")
+
+
+IV_LAYER_CACHE: IVLayerCache = IVLayerCache()
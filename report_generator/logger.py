@@ -1,5 +1,114 @@
+import atexit
+import copy
 import logging
-from typing import Optional
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+
+_FORMAT: str = "[%(asctime)s %(levelname)s] %(message)s"
+_DATE_FORMAT: str = "%Y-%m-%d %H:%M:%S"
+_FORMATTER: logging.Formatter = logging.Formatter(_FORMAT, datefmt=_DATE_FORMAT)
+_HANDLERS: List[logging.Handler] = []
+_LISTENER_LOCK: threading.Lock = threading.Lock()
+_QUEUE: queue.SimpleQueue = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_pin_logging_level: int = logging.DEBUG
+
+
+class _FlushMarker:
+    """
+    Marker is put to the queue to find out when the messages put before it are written.
+    """
+
+    def __init__(self) -> None:
+        self.event: threading.Event = threading.Event()
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Handler puts records to the queue with the merged message. Records are not formatted with the format of the log,
+    it is done by the handlers in the writer thread, so the threads that generate reports do not spend time on
+    formatting and writing of messages.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Method merges the message with its arguments and replaces the exception with its text, as the standard
+        QueueHandler does, so arguments and tracebacks are not kept in the queue.
+        :param record: record to be put to the queue.
+        :return: prepared copy of the record.
+        """
+
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _QueueListener(QueueListener):
+    """
+    Listener writes records to the handlers and sets the events of flush markers.
+    """
+
+    def handle(self, record: logging.LogRecord) -> None:
+        if isinstance(record, _FlushMarker):
+            for handler in self.handlers:
+                handler.flush()
+            record.event.set()
+        else:
+            super().handle(record)
+
+
+def _add_handler(handler: logging.Handler) -> None:
+    """
+    :param handler: handler to be used by the writer thread.
+    """
+
+    handler.setFormatter(_FORMATTER)
+    handler.setLevel(logging.INFO)
+    with _LISTENER_LOCK:
+        _HANDLERS.append(handler)
+        _restart_listener()
+
+
+def _restart_listener() -> None:
+    """
+    Function restarts the writer thread with the current handlers. Messages already put to the queue are written before
+    the thread is stopped.
+    """
+
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+    _listener = _QueueListener(_QUEUE, *_HANDLERS, respect_handler_level=True)
+    _listener.start()
+
+
+def flush_logs() -> None:
+    """
+    Function waits until all messages put to the queue are written.
+    """
+
+    marker = _FlushMarker()
+    with _LISTENER_LOCK:
+        if _listener is None:
+            return
+        _QUEUE.put(marker)
+    marker.event.wait()
+
+
+def get_pin_logging_level() -> int:
+    """
+    :return: logging level of messages about separate pins.
+    """
+
+    return _pin_logging_level
 
 
 def save_logs_to_file(log_file: Optional[str] = None) -> None:
@@ -7,26 +116,48 @@ def save_logs_to_file(log_file: Optional[str] = None) -> None:
     :param log_file: path to the file where the logs will be saved.
     """
 
-    formatter = logging.Formatter("[%(asctime)s %(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.INFO)
-    package_logger = logging.getLogger("report_generator")
-    package_logger.addHandler(file_handler)
+    _add_handler(logging.FileHandler(log_file))
 
 
 def set_logger() -> None:
-    formatter = logging.Formatter("[%(asctime)s %(levelname)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
-    handler = logging.StreamHandler()
-    handler.setFormatter(formatter)
-    handler.setLevel(logging.INFO)
+    """
+    Function sets the logger of the package. Messages are put to a queue and written to the handlers by a background
+    thread, so slow disks and consoles do not stall report generation.
+    """
 
     package_logger = logging.getLogger("report_generator")
     package_logger.setLevel(logging.INFO)
-    package_logger.addHandler(handler)
+    package_logger.addHandler(_QueueHandler(_QUEUE))
     package_logger.propagate = False
+    _add_handler(logging.StreamHandler())
 
 
 def set_logging_level(level: int) -> None:
     package_logger = logging.getLogger("report_generator")
     package_logger.setLevel(level)
+
+
+def set_pin_logging_level(level: int) -> None:
+    """
+    Function sets the logging level of messages about separate pins (for example, time of drawing of each IV-curve). By
+    default these messages have the DEBUG level and are not formatted at all at the INFO level of the logger.
+    :param level: logging level.
+    """
+
+    global _pin_logging_level
+    _pin_logging_level = level
+
+
+def stop_logging() -> None:
+    """
+    Function writes all messages put to the queue and stops the writer thread.
+    """
+
+    global _listener
+    with _LISTENER_LOCK:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(stop_logging)
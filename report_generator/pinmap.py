@@ -0,0 +1,88 @@
+"""
+File with functions to create a packed map of pins with a grid index. The map is used by the scripts of the report to
+find a pin under the mouse pointer on the board image without creating an HTML element for each pin.
+"""
+
+import json
+import math
+from typing import Any, Dict, List
+from report_generator.definitions import PinInfo
+
+
+_MIN_CELL_SIZE: int = 16
+
+
+def _get_cell_size(pins_info: List[PinInfo], pin_radius: int, width: float, height: float) -> int:
+    """
+    :param pins_info: list with information about pins;
+    :param pin_radius: radius of pin on the board image;
+    :param width: width of the area occupied by pins;
+    :param height: height of the area occupied by pins.
+    :return: size of the grid cell. The cell is not smaller than the pin radius, so to find a pin under the pointer it
+    is enough to check the cell with the pointer and the neighbouring cells. The number of cells is about the number
+    of pins.
+    """
+
+    cell_size = math.sqrt(width * height / max(len(pins_info), 1))
+    return int(max(cell_size, pin_radius, _MIN_CELL_SIZE))
+
+
+def create_pin_map(pins_info: List[PinInfo], pin_radius: int) -> Dict[str, Any]:
+    """
+    Function creates a packed map of pins. The coordinates and indices of pins are stored in flat arrays, the pins
+    are sorted into cells of a uniform grid. The pins of the cell with index i are at positions
+    cell_pins[cell_starts[i]:cell_starts[i + 1]] of the flat arrays.
+    :param pins_info: list with information about pins;
+    :param pin_radius: radius of pin on the board image.
+    :return: dictionary with the map of pins.
+    """
+
+    x_max = max((pin_info.x for pin_info in pins_info), default=0)
+    y_max = max((pin_info.y for pin_info in pins_info), default=0)
+    cell_size = _get_cell_size(pins_info, pin_radius, x_max + 1, y_max + 1)
+    columns = int(max(x_max, 0) // cell_size) + 1
+    rows = int(max(y_max, 0) // cell_size) + 1
+
+    coords = []
+    element_indices = []
+    pin_indices = []
+    total_pin_indices = []
+    with_ivc = []
+    cells = [[] for _ in range(columns * rows)]
+    for position, pin_info in enumerate(pins_info):
+        coords.extend((round(pin_info.x, 1), round(pin_info.y, 1)))
+        element_indices.append(pin_info.element_index)
+        pin_indices.append(pin_info.pin_index)
+        total_pin_indices.append(pin_info.total_pin_index)
+        with_ivc.append(1 if pin_info.measurements else 0)
+        column = min(max(int(pin_info.x // cell_size), 0), columns - 1)
+        row = min(max(int(pin_info.y // cell_size), 0), rows - 1)
+        cells[row * columns + column].append(position)
+
+    cell_starts = [0]
+    cell_pins = []
+    for cell in cells:
+        cell_pins.extend(cell)
+        cell_starts.append(len(cell_pins))
+
+    return {"cell_pins": cell_pins,
+            "cell_size": cell_size,
+            "cell_starts": cell_starts,
+            "columns": columns,
+            "coords": coords,
+            "element_indices": element_indices,
+            "pin_indices": pin_indices,
+            "radius": pin_radius,
+            "rows": rows,
+            "total_pin_indices": total_pin_indices,
+            "with_ivc": with_ivc}
+
+
+def create_pin_map_json(pins_info: List[PinInfo], pin_radius: int) -> str:
+    """
+    :param pins_info: list with information about pins;
+    :param pin_radius: radius of pin on the board image.
+    :return: serialized map of pins to be inserted into the report script.
+    """
+
+    return json.dumps(create_pin_map(pins_info, pin_radius), separators=(",", ":"))
@@ -1,36 +1,80 @@
-import gc
 import logging
 import os
-from typing import Callable, List, Optional
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 import matplotlib
-matplotlib.use("Agg")
-# Trick to fix the flake8 error "E402 module level import not at top of file"
-if True:
-    import matplotlib.pyplot as plt
-    import numpy as np
-    from matplotlib.ticker import MaxNLocator, ScalarFormatter
-    from PIL.Image import Image
-    from PyQt5.QtCore import pyqtSignal
-    from PyQt5.QtGui import QBrush, QColor, QFont, QPen
-    from ivviewer import Curve, Viewer
-    from report_generator import utils as ut
-    from report_generator.definitions import PIN_COLORS, PinInfo, PinTypes, ScalingTypes
+import numpy as np
+from matplotlib.ticker import MaxNLocator, ScalarFormatter
+from PIL import Image as PilImage
+from PIL.Image import Image
+from PyQt5.QtCore import pyqtSignal, QThread
+from PyQt5.QtGui import QBrush, QColor, QFont, QPen
+from PyQt5.QtWidgets import QApplication
+from ivviewer import Curve, Viewer
+from report_generator import utils as ut
+from report_generator.curves import decimate_curve, get_curve_hash, get_curve_pairs, get_scales, join_curve_pairs
+from report_generator.definitions import PIN_COLORS, PinInfo, PinTypes, ScalingTypes
+from report_generator.figurepool import FIGURE_POOL
+from report_generator.imagecache import get_image_key, ImageCache
+from report_generator.ivlayers import IV_LAYER_CACHE
+from report_generator.logger import get_pin_logging_level
+from report_generator.translation import get_translation
+from report_generator.version import VERSION
 
 
 logger = logging.getLogger("report_generator")
+# Figures are taken from the pool of figures created with the object-oriented API of matplotlib without pyplot, so they
+# do not share global state. The IV-curve viewer is a Qt widget, so IV-curves are drawn only in the GUI thread
+_PIN_LINE_WIDTH: int = 1
 
 
-@ut.write_time("DRAW BOARD WITH PINS")
-def draw_board_with_pins(image: Image, pins_info: List[PinInfo], file_name: str, marker_size: Optional[int],
-                         check_stop: Callable[[], None] = lambda: None) -> None:
+def _add_extra_curves(viewer: Viewer, ref_curve, test_curve, extra_curves: list, number: int) -> None:
     """
-    Function draws and saves an image of board with pins. Function was borrowed from
-    https://stackoverflow.com/questions/34768717.
-    :param image: board image;
-    :param pins_info: list with information about pins to draw;
-    :param file_name: name of file where image should be saved;
-    :param marker_size: size of marker to display pin;
+    :param viewer: widget in which to draw IV-curves;
+    :param ref_curve: curve with the first reference IV-curve;
+    :param test_curve: curve with the first test IV-curve;
+    :param extra_curves: list with pairs of curves for other pairs of measurements. Missing pairs are added to it;
+    :param number: required number of pairs.
+    """
+
+    while len(extra_curves) < number:
+        curves = []
+        for curve in (ref_curve, test_curve):
+            extra_curve = viewer.plot.add_curve(curve.curve_title)
+            extra_curve.set_curve_params(curve.pen())
+            # Curves of the same kind have one entry in the legend. The curve is detached first, otherwise its entry
+            # is not removed from the legend
+            extra_curve.detach()
+            extra_curve.setItemAttribute(extra_curve.Legend, False)
+            curves.append(extra_curve)
+        extra_curves.append(tuple(curves))
+
+
+def _attach_curves(plot, curves: list) -> None:
+    """
+    Function attaches curves with data to the plot and detaches empty curves. Curves are attached in the order of the
+    list, so the order of curves in the legend and in the image does not depend on the previous pins.
+    :param plot: plot;
+    :param curves: curves of the plot.
+    """
+
+    required_curves = [curve for curve in curves if curve.curve is not None]
+    try:
+        attached_curves = [item for item in plot.itemList() if any(item is curve for curve in curves)]
+    except AttributeError:
+        attached_curves = None
+    if attached_curves is None or len(attached_curves) != len(required_curves) or \
+            any(item is not curve for item, curve in zip(attached_curves, required_curves)):
+        for curve in curves:
+            curve.detach()
+        for curve in required_curves:
+            curve.attach(plot)
+
+
+def _get_pins_xy(pins_info: List[PinInfo], check_stop: Callable[[], None]) -> Dict[PinTypes, List[List[float]]]:
+    """
+    :param pins_info: list with information about pins;
     :param check_stop: function that checks whether the operation is stopped.
+    :return: dictionary with lists of x and y coordinates of pins of each type.
     """
 
     pins_xy = {PinTypes.REFERENCE_EMPTY: [[], []],
@@ -44,77 +88,112 @@ def draw_board_with_pins(image: Image, pins_info: List[PinInfo], file_name: str,
         pin_xy = pins_xy[pin_info.pin_type]
         pin_xy[0].append(pin_info.x)
         pin_xy[1].append(pin_info.y)
+    return pins_xy
+
+
+def _scatter_pins(ax, pins_xy: Dict[PinTypes, List[List[float]]], marker_size: int,
+                  check_stop: Callable[[], None]) -> None:
+    """
+    :param ax: axes with the board image;
+    :param pins_xy: dictionary with lists of x and y coordinates of pins of each type;
+    :param marker_size: size of marker to display pin;
+    :param check_stop: function that checks whether the operation is stopped.
+    """
+
+    for pin_type, x_and_y in pins_xy.items():
+        check_stop()
+        ax.scatter(np.array(x_and_y[0]) - _PIN_LINE_WIDTH, np.array(x_and_y[1]) - _PIN_LINE_WIDTH, s=marker_size,
+                   c=PIN_COLORS[pin_type], zorder=1, linewidths=_PIN_LINE_WIDTH)
 
+
+def _set_curve(curve, voltages: np.ndarray, currents: np.ndarray, scales: Tuple[float, float], size: Tuple[int, int]
+               ) -> None:
+    """
+    :param curve: curve of the plot;
+    :param voltages: voltages of the IV-curve;
+    :param currents: currents of the IV-curve;
+    :param scales: scales of the graph;
+    :param size: size of the graph in pixels.
+    """
+
+    # Points that do not change the image are removed, so the drawing time does not depend on the number of points
+    if len(currents) and len(voltages):
+        curve.set_curve(Curve(*decimate_curve(voltages, currents, *scales, *size)))
+    else:
+        curve.clear_curve()
+
+
+@ut.write_time("DRAW BOARD WITH PINS")
+def draw_board_with_pins(image: Image, pins_info: List[PinInfo], file_name: str, marker_size: Optional[int],
+                         check_stop: Callable[[], None] = lambda: None) -> None:
+    """
+    Function draws and saves an image of board with pins. Function was borrowed from
+    https://stackoverflow.com/questions/34768717.
+    :param image: board image;
+    :param pins_info: list with information about pins to draw;
+    :param file_name: name of file where image should be saved;
+    :param marker_size: size of marker to display pin;
+    :param check_stop: function that checks whether the operation is stopped.
+    """
+
+    pins_xy = _get_pins_xy(pins_info, check_stop)
     check_stop()
-    dpi = float(plt.rcParams["figure.dpi"])
+    dpi = float(matplotlib.rcParams["figure.dpi"])
     height = image.height
     width = image.width
-    fig = plt.figure(figsize=(width / dpi, height / dpi))
-    ax = fig.add_axes([0, 0, 1, 1])
-    ax.axis("off")
-    ax.imshow(image, interpolation="nearest")
-
     if marker_size is None:
         marker_size = width // 38
-    line_width = 1
-    for pin_type, x_and_y in pins_xy.items():
-        check_stop()
-        ax.scatter(np.array(x_and_y[0]) - line_width, np.array(x_and_y[1]) - line_width, s=marker_size,
-                   c=PIN_COLORS[pin_type], zorder=1, linewidths=line_width)
+    with FIGURE_POOL.figure(width / dpi, height / dpi, dpi) as fig:
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.axis("off")
+        ax.imshow(image, interpolation="nearest")
+        _scatter_pins(ax, pins_xy, marker_size, check_stop)
 
-    check_stop()
-    fig.savefig(file_name, dpi=dpi, transparent=True)
-    fig.clf()
-    plt.close("all")
-    del fig
-    gc.collect()
+        check_stop()
+        fig.savefig(file_name, dpi=dpi, transparent=True)
 
 
 @ut.write_time("DRAW FAULT HISTOGRAM")
-def draw_fault_histogram(scores: List[float], tolerance: float, file_name: str) -> None:
+def draw_fault_histogram(scores: List[float], tolerance: float, file_name: str,
+                         _: Callable[[str], str] = get_translation(False)) -> None:
     """
     Function draws and saves a histogram of pin faults. The name of the histogram axes was chosen in the ticket #85658.
     :param scores: difference values for which to draw a histogram;
     :param tolerance: tolerance;
-    :param file_name: name of file to save the histogram.
-    """
-
-    plt.rc("axes", labelsize=30)
-    plt.rc("xtick", labelsize=20)
-    plt.rc("ytick", labelsize=20)
-    plt.rc("legend", fontsize=20)
-    fig = plt.figure(figsize=(10, 8))
-    ax = fig.add_subplot(111)
-    scores = np.array(scores)
-    good_scores = [scores[index[0]] for index in np.argwhere(scores < tolerance)]
-    bins_number = 100
-    if good_scores:
-        ax.hist(good_scores, bins=bins_number, rwidth=0.85, color="#46CB18", alpha=0.7, range=([0, 100]),
-                label=_("Исправные\nточки"))
-    bad_scores = [scores[index[0]] for index in np.argwhere(scores >= tolerance)]
-    if bad_scores:
-        ax.hist(bad_scores, bins=bins_number, rwidth=0.85, color="#E03C31", alpha=0.7, range=([0, 100]),
-                label=_("Неисправные\nточки"))
-    ax.axvline(x=tolerance, color="#232B2B", linewidth=2, label=_("Допуск"))
-    ax.set_xlabel(_("Распределение неисправностей"))
-    ax.set_xlim(xmin=0, xmax=100)
-    ax.set_ylabel(_("Количество неисправностей"))
-    ax.set_yscale("symlog")
-    ax.xaxis.set_major_locator(MaxNLocator(integer=True))
-    ax.yaxis.set_major_formatter(ScalarFormatter())
-    plt.legend(loc="lower left", bbox_to_anchor=(0, 0.99, 1, 0.2), mode="expand", ncol=3)
-    fig.savefig(file_name)
-    fig.clear()
-    fig.clf()
-    plt.close("all")
-    del fig
-    gc.collect()
-
-
-@ut.write_time("DRAW IVC FOR PIN")
+    :param file_name: name of file to save the histogram;
+    :param _: function to translate strings.
+    """
+
+    dpi = float(matplotlib.rcParams["figure.dpi"])
+    with FIGURE_POOL.figure(10, 8, dpi) as fig:
+        ax = fig.add_subplot(111)
+        scores = np.array(scores)
+        good_scores = [scores[index[0]] for index in np.argwhere(scores < tolerance)]
+        bins_number = 100
+        if good_scores:
+            ax.hist(good_scores, bins=bins_number, rwidth=0.85, color="#46CB18", alpha=0.7, range=([0, 100]),
+                    label=_("Исправные\nточки"))
+        bad_scores = [scores[index[0]] for index in np.argwhere(scores >= tolerance)]
+        if bad_scores:
+            ax.hist(bad_scores, bins=bins_number, rwidth=0.85, color="#E03C31", alpha=0.7, range=([0, 100]),
+                    label=_("Неисправные\nточки"))
+        ax.axvline(x=tolerance, color="#232B2B", linewidth=2, label=_("Допуск"))
+        ax.set_xlabel(_("Распределение неисправностей"), fontsize=30)
+        ax.set_xlim(xmin=0, xmax=100)
+        ax.set_ylabel(_("Количество неисправностей"), fontsize=30)
+        ax.set_yscale("symlog")
+        ax.tick_params(labelsize=20)
+        ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+        ax.yaxis.set_major_formatter(ScalarFormatter())
+        ax.legend(loc="lower left", bbox_to_anchor=(0, 0.99, 1, 0.2), mode="expand", ncol=3, fontsize=20)
+        fig.savefig(file_name)
+
+
+@ut.write_time("DRAW IVC FOR PIN", per_pin=True)
 def draw_ivc_for_pin(pin_info: PinInfo, index: int, file_name: str, scaling_type: ScalingTypes,
                      user_defined_scales: list, viewer: Viewer, ref_curve, test_curve,
-                     check_stop: Callable[[], None] = lambda: None) -> None:
+                     check_stop: Callable[[], None] = lambda: None, style: Optional[Hashable] = None,
+                     image_cache: Optional[ImageCache] = None, extra_curves: Optional[list] = None) -> bool:
     """
     :param pin_info: information about pin for which to draw IV-curve;
     :param index: pin index;
@@ -124,67 +203,101 @@ def draw_ivc_for_pin(pin_info: PinInfo, index: int, file_name: str, scaling_type
     :param viewer: widget in which to draw IV-curve;
     :param ref_curve: object into which to write data for the reference curve;
     :param test_curve: object into which to write data for the test curve;
-    :param check_stop: function that checks whether the operation is stopped.
+    :param check_stop: function that checks whether the operation is stopped;
+    :param style: key of the style of the viewer. If it is given, the image is composed from cached layers;
+    :param image_cache: cache of rendered images. The style should be given to use the cache;
+    :param extra_curves: list with pairs of curves for pins with several pairs of measurements. Curves are added to the
+    list when required, so the list should be kept between pins.
+    :return: True if the image was taken from the image cache.
     """
 
     check_stop()
-    ref_currents = np.array([])
-    ref_voltages = np.array([])
-    test_currents = np.array([])
-    test_voltages = np.array([])
-    for measurement in pin_info.measurements:
-        if measurement.is_reference:
-            ref_currents = measurement.ivc.currents
-            ref_voltages = measurement.ivc.voltages
-        else:
-            test_currents = measurement.ivc.currents
-            test_voltages = measurement.ivc.voltages
+    pairs = get_curve_pairs(pin_info)
+    scales = get_scales(pin_info, index, scaling_type, user_defined_scales, join_curve_pairs(pairs))
+    ref_voltages, ref_currents, test_voltages, test_currents = pairs[0]
+    ref_hash = get_curve_hash(ref_voltages, ref_currents)
+    image_key = None
+    if style is not None and image_cache is not None:
+        curve_hashes = [get_curve_hash(*curves) for pair in pairs for curves in (pair[:2], pair[2:])]
+        image_key = get_image_key(VERSION, style, *map(float, scales), *curve_hashes)
+        if image_cache.get(image_key, file_name):
+            return True
 
     check_stop()
-    if scaling_type == ScalingTypes.EYEPOINT_P10:
-        scale_coefficient = 1.2
-        v_max = scale_coefficient * pin_info.measurements[0].settings.max_voltage
-        i_max = 1000 * v_max / pin_info.measurements[0].settings.internal_resistance
-    elif (scaling_type == ScalingTypes.USER_DEFINED and isinstance(user_defined_scales, (list, tuple)) and
-          index < len(user_defined_scales) and isinstance(user_defined_scales[index], (list, tuple)) and
-          len(user_defined_scales[index]) == 2):
-        v_max, i_max = user_defined_scales[index]
-        i_max *= 1000
-    else:
-        i_max = 1.2 * 1000 * np.amax(np.absolute(np.concatenate((test_currents, ref_currents), axis=0)))
-        v_max = 1.2 * np.amax(np.absolute(np.concatenate((test_voltages, ref_voltages), axis=0)))
-    viewer.plot.set_scale(v_max, i_max)
+    viewer.plot.set_scale(*scales)
 
     check_stop()
-    if len(ref_currents) and len(ref_voltages):
-        ref_curve.set_curve(Curve(ref_voltages, ref_currents))
-    else:
-        ref_curve.clear_curve()
-    if len(test_currents) and len(test_voltages):
-        test_curve.set_curve(Curve(test_voltages, test_currents))
-    else:
-        test_curve.clear_curve()
-
-    for curve in viewer.plot.curves:
-        if curve.curve is None:
-            curve.detach()
+    size = viewer.plot.width(), viewer.plot.height()
+    _set_curve(ref_curve, ref_voltages, ref_currents, scales, size)
+    _set_curve(test_curve, test_voltages, test_currents, scales, size)
+    extra_curves = extra_curves if extra_curves is not None else []
+    if len(pairs) > 1:
+        _add_extra_curves(viewer, ref_curve, test_curve, extra_curves, len(pairs) - 1)
+    for pair_index, (extra_ref_curve, extra_test_curve) in enumerate(extra_curves, start=1):
+        if pair_index < len(pairs):
+            extra_ref_voltages, extra_ref_currents, extra_test_voltages, extra_test_currents = pairs[pair_index]
+            _set_curve(extra_ref_curve, extra_ref_voltages, extra_ref_currents, scales, size)
+            _set_curve(extra_test_curve, extra_test_voltages, extra_test_currents, scales, size)
         else:
-            curve.attach(viewer.plot)
+            extra_ref_curve.clear_curve()
+            extra_test_curve.clear_curve()
+
+    _attach_curves(viewer.plot, viewer.plot.curves)
 
-    viewer.plot.grab().save(file_name, format="PNG")
+    # The file may be a hard link to the image in the image cache, so it is removed rather than overwritten
+    if os.path.lexists(file_name):
+        os.remove(file_name)
+    # Layers are cached for one pair of curves
+    if style is None or len(pairs) > 1 or \
+            not IV_LAYER_CACHE.draw(viewer.plot, ref_curve, test_curve, ref_hash, style, file_name):
+        viewer.plot.grab().save(file_name, format="PNG")
+    if image_key is not None:
+        image_cache.put(image_key, file_name)
+    return False
 
 
 def draw_ivc_for_pins(pins_info: List[PinInfo], dir_name: str, signal: pyqtSignal,
                       scaling_type: ScalingTypes = ScalingTypes.AUTO, user_defined_scales: list = None,
-                      check_stop: Callable[[], None] = lambda: None) -> None:
+                      check_stop: Callable[[], None] = lambda: None, _: Callable[[str], str] = get_translation(False),
+                      image_cache: Optional[ImageCache] = None, deadline: Optional[float] = None,
+                      required_number: int = 0) -> None:
     """
-    Function draws and saves the IV-curves for the pins.
+    Function draws and saves the IV-curves for the pins. The IV-curves are drawn by a Qt widget, so the function can be
+    called only in the GUI thread.
     :param pins_info: list with information about pins for which to draw IV-curves;
     :param dir_name: name of directory where images should be saved;
     :param signal: signal;
     :param scaling_type: type of scaling for a graph with IV-curve;
     :param user_defined_scales: list with user defined scales;
-    :param check_stop: function that checks whether the operation is stopped.
+    :param check_stop: function that checks whether the operation is stopped;
+    :param _: function to translate strings;
+    :param image_cache: cache of rendered images;
+    :param deadline: time (as returned by time.time()) after which IV-curves are not drawn. The signal is not emitted
+    for the pins that are not drawn;
+    :param required_number: number of the first pins that are drawn regardless of the deadline.
+    """
+
+    if not is_gui_thread():
+        raise RuntimeError("IV-curves in PNG format are drawn by a Qt widget, so they can be drawn only in the GUI "
+                           "thread of QApplication")
+    _draw_ivc_for_pins(pins_info, dir_name, signal, scaling_type, user_defined_scales, check_stop, _, image_cache,
+                       deadline, required_number)
+
+
+def _draw_ivc_for_pins(pins_info: List[PinInfo], dir_name: str, signal: pyqtSignal, scaling_type: ScalingTypes,
+                       user_defined_scales: list, check_stop: Callable[[], None], _: Callable[[str], str],
+                       image_cache: Optional[ImageCache], deadline: Optional[float], required_number: int) -> None:
+    """
+    :param pins_info: list with information about pins for which to draw IV-curves;
+    :param dir_name: name of directory where images should be saved;
+    :param signal: signal;
+    :param scaling_type: type of scaling for a graph with IV-curve;
+    :param user_defined_scales: list with user defined scales;
+    :param check_stop: function that checks whether the operation is stopped;
+    :param _: function to translate strings;
+    :param image_cache: cache of rendered images;
+    :param deadline: time after which IV-curves are not drawn;
+    :param required_number: number of the first pins that are drawn regardless of the deadline.
     """
 
     iv_image_size = 300, 200
@@ -203,20 +316,112 @@ def draw_ivc_for_pins(pins_info: List[PinInfo], dir_name: str, signal: pyqtSigna
     ref_curve = viewer.plot.add_curve(_("Эталон"))
     ref_curve.set_curve_params(reference_curve_pen)
     viewer.plot.show_legend(QFont("Times", 10))
+    style = (iv_image_size, "Times", 10, 15, reference_curve_pen.color().name(), reference_curve_pen.widthF(),
+             test_curve_pen.color().name(), test_curve_pen.widthF(), _("Напряжение, В"), _("Ток, мА"), _("Тест"),
+             _("Эталон"))
+
+    extra_curves = []
+    hits_number = 0
+    images_number = 0
+    pin_logging_level = get_pin_logging_level()
+    log_pins = logger.isEnabledFor(pin_logging_level)
 
     for index, pin_info in enumerate(pins_info):
         check_stop()
+        if index >= required_number and ut.is_time_limit_reached(deadline):
+            logger.info("The time limit is reached, IV-curves of %d pins are not drawn", len(pins_info) - index)
+            break
+
         if not pin_info.measurements:
             signal.emit()
-            logger.info("The pin '%s_%s' has no measurements", pin_info.element_index, pin_info.pin_index)
+            if log_pins:
+                logger.log(pin_logging_level, "The pin '%s_%s' has no measurements", pin_info.element_index,
+                           pin_info.pin_index)
             continue
 
-        file_name = os.path.join(dir_name, f"{pin_info.element_index}_{pin_info.pin_index}_iv.png")
-        draw_ivc_for_pin(pin_info, index, file_name, scaling_type, user_defined_scales, viewer, ref_curve, test_curve,
-                         check_stop)
+        file_name = os.path.join(dir_name, ut.get_iv_image_name(pin_info))
+        hits_number += draw_ivc_for_pin(pin_info, index, file_name, scaling_type, user_defined_scales, viewer,
+                                        ref_curve, test_curve, check_stop, style, image_cache, extra_curves)
+        images_number += 1
         signal.emit()
-        logger.info("IV-curve of the pin '%s_%s' is saved to '%s'", pin_info.element_index, pin_info.pin_index,
-                    os.path.basename(file_name))
+        if log_pins:
+            logger.log(pin_logging_level, "IV-curve of the pin '%s_%s' is saved to '%s'", pin_info.element_index,
+                       pin_info.pin_index, os.path.basename(file_name))
+
+    logger.info("IV-curves of %d pins are saved", images_number)
+    if image_cache is not None and images_number:
+        logger.info("IV-curve images taken from the image cache: %d hits, %d misses (hit rate %.1f%%, %.1f%% for all "
+                    "reports)", hits_number, images_number - hits_number, 100 * hits_number / images_number,
+                    100 * image_cache.get_hit_rate())
+
+
+def is_gui_thread() -> bool:
+    """
+    :return: True if the current thread is the GUI thread of QApplication, so Qt widgets can be used in it.
+    """
+
+    app = QApplication.instance()
+    return isinstance(app, QApplication) and QThread.currentThread() == app.thread()
+
+
+@ut.write_time("PATCH BOARD WITH PINS")
+def patch_board_with_pins(image: Image, pins_info: List[PinInfo], changed_pins_info: List[PinInfo], file_name: str,
+                          marker_size: Optional[int], check_stop: Callable[[], None] = lambda: None) -> None:
+    """
+    Function redraws the markers of the changed pins on the saved image of board with pins. Only small regions around
+    the changed pins are drawn again: the region of the board image is drawn with the markers of all pins that overlap
+    it and is pasted into the saved image. If there is no saved image, the whole image is drawn.
+    :param image: board image;
+    :param pins_info: list with information about all pins drawn on the image;
+    :param changed_pins_info: list with information about pins whose markers should be redrawn. The markers of pins
+    that are not in pins_info are removed;
+    :param file_name: name of file with the image of board with pins;
+    :param marker_size: size of marker to display pin;
+    :param check_stop: function that checks whether the operation is stopped.
+    """
+
+    if not os.path.isfile(file_name):
+        draw_board_with_pins(image, pins_info, file_name, marker_size, check_stop)
+        return
+
+    dpi = float(matplotlib.rcParams["figure.dpi"])
+    if marker_size is None:
+        marker_size = image.width // 38
+    # The size of the marker is given as the area in points^2, the region includes the edge of the marker
+    radius = int(np.ceil((np.sqrt(marker_size) / 2 + _PIN_LINE_WIDTH) * dpi / 72)) + 2 * _PIN_LINE_WIDTH
+    xs = np.array([pin_info.x for pin_info in pins_info], dtype=float)
+    ys = np.array([pin_info.y for pin_info in pins_info], dtype=float)
+    saved_image = PilImage.open(file_name).convert("RGB")
+    for changed_pin_info in changed_pins_info:
+        check_stop()
+        x_min = max(int(changed_pin_info.x) - radius, 0)
+        y_min = max(int(changed_pin_info.y) - radius, 0)
+        x_max = min(int(changed_pin_info.x) + radius + 1, image.width)
+        y_max = min(int(changed_pin_info.y) + radius + 1, image.height)
+        if x_min >= x_max or y_min >= y_max:
+            continue
+
+        # Markers of the pins near the region overlap it
+        indices = np.flatnonzero((xs > x_min - 2 * radius) & (xs < x_max + 2 * radius) &
+                                 (ys > y_min - 2 * radius) & (ys < y_max + 2 * radius))
+        pins_xy = _get_pins_xy([pins_info[index] for index in indices], check_stop)
+        width = x_max - x_min
+        height = y_max - y_min
+        with FIGURE_POOL.figure(width / dpi, height / dpi, dpi) as fig:
+            ax = fig.add_axes([0, 0, 1, 1])
+            ax.axis("off")
+            # The region is drawn in the coordinates of the whole image, so the markers are the same as on the image
+            ax.imshow(image.crop((x_min, y_min, x_max, y_max)), interpolation="nearest",
+                      extent=(x_min - 0.5, x_max - 0.5, y_max - 0.5, y_min - 0.5))
+            _scatter_pins(ax, pins_xy, marker_size, check_stop)
+            ax.set_xlim(x_min - 0.5, x_max - 0.5)
+            ax.set_ylim(y_max - 0.5, y_min - 0.5)
+            fig.canvas.draw()
+            region = PilImage.fromarray(np.asarray(fig.canvas.buffer_rgba())).convert("RGB")
+        saved_image.paste(region.resize((width, height)), (x_min, y_min))
+
+    check_stop()
+    saved_image.save(file_name, "JPEG")
 
 
 @ut.write_time("SAVE BOARD")
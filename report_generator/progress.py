@@ -0,0 +1,130 @@
+"""
+File with class to aggregate progress of report generation.
+"""
+
+import time
+from collections import namedtuple
+from typing import Callable, Dict, Optional, Tuple
+
+
+ProgressInfo = namedtuple("ProgressInfo", ["done", "total", "stage", "stage_done", "stage_total", "throughput", "eta"])
+_INTERVAL: float = 0.05
+
+
+class ProgressReporter:
+    """
+    Class aggregates the progress of report generation and reports it no more often than the given interval (20 times
+    per second by default), so that drawing of thousands of pins does not flood the GUI with updates. The progress is
+    reported with the numbers of done and total steps, the name of the current stage, the throughput of the current
+    stage in steps per second and the estimated time to finish. The time is estimated from the observed rates: the
+    remaining steps of the current stage are estimated from the rate of this stage, the remaining steps of the next
+    stages are estimated from the average duration of the steps of the finished stages.
+    """
+
+    def __init__(self, callback: Callable[[ProgressInfo], None], interval: float = _INTERVAL,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        :param callback: function to be called with the progress;
+        :param interval: minimum interval between progress reports in seconds;
+        :param clock: function that returns the current time in seconds.
+        """
+
+        self._callback: Callable[[ProgressInfo], None] = callback
+        self._clock: Callable[[], float] = clock
+        self._done: int = 0
+        self._finished_stages: Dict[str, Tuple[int, float]] = dict()
+        self._interval: float = interval
+        self._last_report_time: Optional[float] = None
+        self._stage: Optional[str] = None
+        self._stage_done: int = 0
+        self._stage_start_time: float = clock()
+        self._stage_total: int = 0
+        self._total: int = 0
+
+    def _finish_stage(self, now: float) -> None:
+        """
+        Method saves the rate of the current stage.
+        :param now: current time.
+        """
+
+        if self._stage is not None and self._stage_done:
+            steps, duration = self._finished_stages.get(self._stage, (0, 0))
+            self._finished_stages[self._stage] = steps + self._stage_done, duration + now - self._stage_start_time
+
+    def _get_eta(self, now: float) -> Optional[float]:
+        """
+        :param now: current time.
+        :return: estimated time to finish in seconds or None if it cannot be estimated yet.
+        """
+
+        stage_duration = now - self._stage_start_time
+        stage_remaining = max(self._stage_total - self._stage_done, 0)
+        other_remaining = max(self._total - self._done - stage_remaining, 0)
+        if stage_remaining and not self._stage_done:
+            return None
+
+        eta = stage_remaining * stage_duration / self._stage_done if stage_remaining else 0
+        if other_remaining:
+            # Until a stage is finished, the next stages are estimated from the rate of the current stage
+            stages = list(self._finished_stages.values()) or [(self._stage_done, stage_duration)]
+            finished_steps = sum(steps for steps, _ in stages)
+            if not finished_steps:
+                return None
+            eta += other_remaining * sum(duration for _, duration in stages) / finished_steps
+        return eta
+
+    def _report(self, now: float) -> None:
+        """
+        Method reports the current progress.
+        :param now: current time.
+        """
+
+        self._last_report_time = now
+        stage_duration = now - self._stage_start_time
+        throughput = self._stage_done / stage_duration if stage_duration > 0 and self._stage_done else None
+        self._callback(ProgressInfo(self._done, self._total, self._stage, self._stage_done, self._stage_total,
+                                    throughput, self._get_eta(now)))
+
+    def advance(self, steps: int = 1) -> None:
+        """
+        Method counts the done steps. The progress is reported if the interval has passed since the last report or the
+        stage is finished.
+        :param steps: number of done steps.
+        """
+
+        self._done += steps
+        self._stage_done += steps
+        now = self._clock()
+        if self._last_report_time is None or now - self._last_report_time >= self._interval or \
+                self._stage_done >= self._stage_total:
+            self._report(now)
+
+    def flush(self) -> None:
+        """
+        Method reports the current progress immediately.
+        """
+
+        self._report(self._clock())
+
+    def set_total(self, total: int) -> None:
+        """
+        :param total: total number of steps.
+        """
+
+        self._total = total
+        self._report(self._clock())
+
+    def start_stage(self, stage: str, steps_number: int = 1) -> None:
+        """
+        Method starts a new stage. The progress is reported immediately.
+        :param stage: name of the stage;
+        :param steps_number: number of steps in the stage.
+        """
+
+        now = self._clock()
+        self._finish_stage(now)
+        self._stage = stage
+        self._stage_done = 0
+        self._stage_start_time = now
+        self._stage_total = steps_number
+        self._report(now)
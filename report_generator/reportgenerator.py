@@ -3,23 +3,35 @@ File with class to generate report.
 """
 
 import gc
+import itertools
 import logging
 import os
 import platform
 import shutil
 import sys
+import time
 import webbrowser
 from datetime import datetime, timedelta
 from enum import auto, Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
 from PyQt5.QtCore import pyqtSignal, QObject
 from epcore.elements import Board
-from epcore.measurementmanager import IVCComparator
 from report_generator import utils as ut
-from report_generator.definitions import ReportTypes, ScalingTypes
-from report_generator.translation import install_translation
+from report_generator.boardindex import BoardIndex
+from report_generator.checkpoint import Checkpoint, find_checkpoint, get_fingerprint
+from report_generator.diff import RunDiff
+from report_generator.export import export_results
+from report_generator.pinmap import create_pin_map_json
+from report_generator.selection import get_queries, PinQuery
+from report_generator.definitions import Artifact, ArtifactTypes, ExportFormats, ImageFormats, ReportTypes, ScalingTypes
+from report_generator.translation import get_translation, install_translation
+from report_generator.ufiv import load_board_from_ufiv
 from report_generator.version import VERSION
-from report_generator.plot import draw_board_with_pins, draw_fault_histogram, draw_ivc_for_pins, save_board
+from report_generator.plot import is_gui_thread, save_board
+from report_generator.progress import ProgressInfo, ProgressReporter
+from report_generator.svg import draw_ivc_svg_for_pins, SvgRenderer
+from report_generator.worker import perform_task, RenderTasks, RenderWorker
 
 
 logger = logging.getLogger("report_generator")
@@ -29,15 +41,20 @@ _BOARD_WITH_PINS_IMAGE: str = "board.jpeg"
 _DEFAULT_REPORT_DIR_NAME: str = "report"
 _IMG_DIR_NAME: str = "img"
 _FAULT_HISTOGRAM_IMAGE: str = "fault_histogram.jpeg"
+_IMAGE_CACHE_SIZE: int = 512
 _SCRIPTS_DIR_NAME: str = "scripts"
 _STATIC_DIR_NAME: str = "static"
 _STYLES_DIR_NAME: str = "styles"
+_TEMPLATE_FILE_WITH_DIFF: str = "report_diff.html"
 _TEMPLATE_FILE_WITH_FULL_REPORT: str = "report_full.html"
 _TEMPLATE_FILE_WITH_MAP: str = "full_img.html"
 _TEMPLATE_FILE_WITH_REPORT: str = "report.html"
 _TEMPLATES_DIR_NAME: str = "report_templates"
 _PIN_RADIUS: int = 6
 _PIN_WIDTH: int = 100
+_REFRESH_INTERVAL: int = 5
+_WORKER_MAX_MEMORY: int = 1024
+_WORKER_MAX_REPORTS: int = 20
 
 
 class ConfigAttributes(Enum):
@@ -48,18 +65,35 @@ class ConfigAttributes(Enum):
     APP_NAME = auto()
     APP_VERSION = auto()
     BOARD = auto()
+    DIFF_WITH = auto()
     DIRECTORY = auto()
     ENGLISH = auto()
+    EXPORT_CURVES = auto()
+    EXPORT_FORMATS = auto()
+    IMAGE_CACHE_DIRECTORY = auto()
+    IMAGE_CACHE_SIZE = auto()
     IS_REPORT_FOR_TEST_BOARD = auto()
+    IV_IMAGE_FORMAT = auto()
     NOISE_AMPLITUDES = auto()
     OBJECTS = auto()
+    ONLY_REPORTS_TO_OPEN = auto()
     OPEN_REPORT_AT_FINISH = auto()
     PIN_SIZE = auto()
+    PREFILTER = auto()
+    RENDER_IN_WORKER = auto()
     REPORTS_TO_OPEN = auto()
+    RESULTS_FILE = auto()
+    RESUME = auto()
+    SAVE_CHECKPOINT = auto()
     SCALING_TYPE = auto()
     TEST_DURATION = auto()
+    TIME_LIMIT = auto()
     TOLERANCE = auto()
+    UFIV_FILE = auto()
     USER_DEFINED_SCALES = auto()
+    VALIDATE_PREFILTER = auto()
+    WORKER_MAX_MEMORY = auto()
+    WORKER_MAX_REPORTS = auto()
 
     @classmethod
     def get_default_config(cls, board: Optional[Board]) -> Dict["ConfigAttributes", Any]:
@@ -71,18 +105,35 @@ class ConfigAttributes(Enum):
         return {ConfigAttributes.APP_NAME: None,
                 ConfigAttributes.APP_VERSION: None,
                 ConfigAttributes.BOARD: board,
+                ConfigAttributes.DIFF_WITH: None,
                 ConfigAttributes.DIRECTORY: ut.get_default_dir_path(),
                 ConfigAttributes.ENGLISH: False,
+                ConfigAttributes.EXPORT_CURVES: False,
+                ConfigAttributes.EXPORT_FORMATS: [],
+                ConfigAttributes.IMAGE_CACHE_DIRECTORY: None,
+                ConfigAttributes.IMAGE_CACHE_SIZE: _IMAGE_CACHE_SIZE,
                 ConfigAttributes.IS_REPORT_FOR_TEST_BOARD: None,
+                ConfigAttributes.IV_IMAGE_FORMAT: ImageFormats.PNG,
                 ConfigAttributes.NOISE_AMPLITUDES: None,
                 ConfigAttributes.OBJECTS: {},
+                ConfigAttributes.ONLY_REPORTS_TO_OPEN: False,
                 ConfigAttributes.OPEN_REPORT_AT_FINISH: False,
                 ConfigAttributes.PIN_SIZE: _PIN_WIDTH,
+                ConfigAttributes.PREFILTER: True,
+                ConfigAttributes.RENDER_IN_WORKER: False,
                 ConfigAttributes.REPORTS_TO_OPEN: [ReportTypes.SHORT_REPORT],
+                ConfigAttributes.RESULTS_FILE: None,
+                ConfigAttributes.RESUME: False,
+                ConfigAttributes.SAVE_CHECKPOINT: False,
                 ConfigAttributes.SCALING_TYPE: ScalingTypes.AUTO,
                 ConfigAttributes.TEST_DURATION: None,
+                ConfigAttributes.TIME_LIMIT: None,
                 ConfigAttributes.TOLERANCE: None,
-                ConfigAttributes.USER_DEFINED_SCALES: None}
+                ConfigAttributes.UFIV_FILE: None,
+                ConfigAttributes.USER_DEFINED_SCALES: None,
+                ConfigAttributes.VALIDATE_PREFILTER: False,
+                ConfigAttributes.WORKER_MAX_MEMORY: _WORKER_MAX_MEMORY,
+                ConfigAttributes.WORKER_MAX_REPORTS: _WORKER_MAX_REPORTS}
 
 
 class ObjectsForReport(Enum):
@@ -93,6 +144,7 @@ class ObjectsForReport(Enum):
     BOARD = auto()
     ELEMENT = auto()
     PIN = auto()
+    QUERY = auto()
 
 
 class ReportGenerationSteps(Enum):
@@ -106,7 +158,10 @@ class ReportGenerationSteps(Enum):
     DRAW_BOARD_WITH_PINS = auto()
     DRAW_CLEAR_BOARD = auto()
     DRAW_FAULT_HISTOGRAM = auto()
+    DRAW_FAULTY_IVC = auto()
     DRAW_IVC = auto()
+    EXPORT_RESULTS = auto()
+    GENERATE_DIFF_REPORT = auto()
     GENERATE_FULL_REPORT = auto()
     GENERATE_MAP_REPORT = auto()
     GENERATE_REPORT = auto()
@@ -116,14 +171,163 @@ class UserStop(Exception):
     pass
 
 
+class _StepSignal:
+    """
+    Class replaces the step_done signal in the functions that draw images for pins, so that the done steps are counted
+    by the generator.
+    """
+
+    def __init__(self, step_done: Callable[[int], None]) -> None:
+        """
+        :param step_done: function to be called when the step is done.
+        """
+
+        self._step_done: Callable[[int], None] = step_done
+
+    def emit(self) -> None:
+        self._step_done(1)
+
+
+class ReportContext:
+    """
+    Class with the state of one report generation run: settings read from the config and data computed during the
+    generation. Each run gets its own context, so the generator keeps no other state between steps.
+    """
+
+    def __init__(self) -> None:
+        self.app_name: Optional[str] = None
+        self.app_version: Optional[str] = None
+        self.bad_pins_info: List[ut.PinInfo] = []
+        self.board: Optional[Board] = None
+        self.board_index: Optional[BoardIndex] = None
+        self.changes: List[Dict[str, Any]] = []
+        self.checkpoint: Optional[Checkpoint] = None
+        # Time (as returned by time.time()) after which IV-curves of passing pins are not drawn
+        self.deadline: Optional[float] = None
+        self.diff: Optional[RunDiff] = None
+        self.diff_with: Optional[Union[Board, str]] = None
+        self.dir_name: str = ut.get_default_dir_path()
+        self.english: bool = False
+        self.export_curves: bool = False
+        self.export_formats: List[ExportFormats] = []
+        self.general_info: Optional[Dict[str, Any]] = None
+        self.image_cache_dir_name: Optional[str] = None
+        self.image_cache_size: int = _IMAGE_CACHE_SIZE
+        self.is_report_for_test_board: Optional[bool] = None
+        self.iv_image_format: ImageFormats = ImageFormats.PNG
+        # Pins whose IV-curves are drawn. They are all pins of the report or only faulty pins
+        self.iv_pins_info: List[ut.PinInfo] = []
+        self.iv_svg_images: Optional[Dict[str, Any]] = None
+        self.noise_amplitudes: Optional[List[Optional[Tuple[float, float]]]] = None
+        self.omitted_pins_info: List[ut.PinInfo] = []
+        self.open_report_at_finish: bool = False
+        self.pin_diameter: Optional[int] = None
+        self.pin_rows: Dict[int, str] = dict()
+        self.pin_width: int = _PIN_WIDTH
+        self.pins_info: List[ut.PinInfo] = []
+        self.prefilter: bool = True
+        self.progress: Optional[ProgressReporter] = None
+        self.queries: List[PinQuery] = []
+        # Interval in seconds after which the report is reloaded in the browser while it is updated
+        self.refresh_interval: Optional[int] = None
+        self.render_in_worker: bool = False
+        self.reports_to_generate: List[ReportTypes] = list(ReportTypes)
+        self.reports_to_open: List[ReportTypes] = []
+        self.required_board: bool = False
+        self.required_elements: List[int] = []
+        self.required_pins: List[int] = []
+        self.results_by_steps: Dict[ReportGenerationSteps, Any] = dict()
+        self.results_file: Optional[str] = None
+        self.resume: bool = False
+        # If True, the progress is saved to the checkpoint, so the generation can be resumed
+        self.save_checkpoint: bool = False
+        self.scaling_type: ScalingTypes = ScalingTypes.AUTO
+        self.static_dir_name: Optional[str] = None
+        self.svg_renderer: Optional[SvgRenderer] = None
+        self.test_duration: Optional[timedelta] = None
+        self.tolerance: Optional[float] = None
+        self.translate: Callable[[str], str] = get_translation(False)
+        self.ufiv_file: Optional[str] = None
+        self.user_defined_scales: Optional[List[Tuple[float, float]]] = None
+        self.validate_prefilter: bool = False
+        self.worker_max_memory: Optional[int] = _WORKER_MAX_MEMORY
+        self.worker_max_reports: int = _WORKER_MAX_REPORTS
+
+    @classmethod
+    def create_from_config(cls, config: Dict[ConfigAttributes, Any]) -> "ReportContext":
+        """
+        :param config: dictionary with full information about required report.
+        :return: context for the report generation run.
+        """
+
+        context = cls()
+        context.app_name = config.get(ConfigAttributes.APP_NAME, None)
+        context.app_version = config.get(ConfigAttributes.APP_VERSION, None)
+        context.board = config.get(ConfigAttributes.BOARD, None)
+        context.diff_with = config.get(ConfigAttributes.DIFF_WITH, None)
+        parent_directory = config.get(ConfigAttributes.DIRECTORY, ut.get_default_dir_path())
+        context.dir_name = ut.create_report_directory_name(parent_directory, _DEFAULT_REPORT_DIR_NAME)
+        context.english = config.get(ConfigAttributes.ENGLISH, False)
+        context.translate = get_translation(context.english)
+        context.export_curves = config.get(ConfigAttributes.EXPORT_CURVES, False)
+        context.export_formats = list(config.get(ConfigAttributes.EXPORT_FORMATS, None) or [])
+        context.image_cache_dir_name = config.get(ConfigAttributes.IMAGE_CACHE_DIRECTORY, None)
+        context.image_cache_size = config.get(ConfigAttributes.IMAGE_CACHE_SIZE, _IMAGE_CACHE_SIZE)
+        context.is_report_for_test_board = config.get(ConfigAttributes.IS_REPORT_FOR_TEST_BOARD, None)
+        context.iv_image_format = config.get(ConfigAttributes.IV_IMAGE_FORMAT, ImageFormats.PNG)
+        context.noise_amplitudes = config.get(ConfigAttributes.NOISE_AMPLITUDES, None)
+        context.open_report_at_finish = config.get(ConfigAttributes.OPEN_REPORT_AT_FINISH, False)
+        context.pin_width = config.get(ConfigAttributes.PIN_SIZE, _PIN_WIDTH)
+        context.prefilter = config.get(ConfigAttributes.PREFILTER, True)
+        context.render_in_worker = config.get(ConfigAttributes.RENDER_IN_WORKER, False)
+        context.reports_to_open = list(set(config.get(ConfigAttributes.REPORTS_TO_OPEN, [ReportTypes.SHORT_REPORT])))
+        if config.get(ConfigAttributes.ONLY_REPORTS_TO_OPEN, False) and context.reports_to_open:
+            context.reports_to_generate = sorted(context.reports_to_open, key=lambda report: report.name)
+        context.results_file = config.get(ConfigAttributes.RESULTS_FILE, None)
+        context.resume = config.get(ConfigAttributes.RESUME, False)
+        context.save_checkpoint = context.resume or config.get(ConfigAttributes.SAVE_CHECKPOINT, False)
+        context.scaling_type = config.get(ConfigAttributes.SCALING_TYPE, ScalingTypes.AUTO)
+        context.test_duration = config.get(ConfigAttributes.TEST_DURATION, None)
+        time_limit = config.get(ConfigAttributes.TIME_LIMIT, None)
+        if time_limit is not None:
+            context.deadline = time.time() + time_limit
+        tolerance = config.get(ConfigAttributes.TOLERANCE, None)
+        if tolerance is not None:
+            # The tolerance is given in relative units (0 - minimum value, 1 - maximum). Convert this value to %.
+            # The transition to percentages is carried out in the task #85658
+            context.tolerance = 100 * tolerance
+        context.ufiv_file = config.get(ConfigAttributes.UFIV_FILE, None)
+        context.user_defined_scales = config.get(ConfigAttributes.USER_DEFINED_SCALES, None)
+        context.validate_prefilter = config.get(ConfigAttributes.VALIDATE_PREFILTER, False)
+        context.worker_max_memory = config.get(ConfigAttributes.WORKER_MAX_MEMORY, _WORKER_MAX_MEMORY)
+        context.worker_max_reports = config.get(ConfigAttributes.WORKER_MAX_REPORTS, _WORKER_MAX_REPORTS)
+        required_objects = config.get(ConfigAttributes.OBJECTS, {})
+        if required_objects.get(ObjectsForReport.BOARD):
+            context.required_board = True
+        else:
+            context.required_board = False
+            context.required_elements = required_objects.get(ObjectsForReport.ELEMENT, [])
+            context.required_pins = required_objects.get(ObjectsForReport.PIN, [])
+            context.queries = get_queries(required_objects.get(ObjectsForReport.QUERY))
+        return context
+
+
 class ReportGenerator(QObject):
     """
-    Class to generate report for Board object.
+    Class to generate report for Board object. The state of a run is kept in a separate context, and matplotlib is used
+    without pyplot, so separate generators can run in parallel threads. IV-curves in PNG format are drawn by a Qt
+    widget that can be used only in the GUI thread, so generators running in other threads draw them in the worker
+    process. If ConfigAttributes.RENDER_IN_WORKER is True, all images are drawn in the worker process that is recycled
+    from time to time, so the memory of the main process does not grow.
+    Each produced file is reported with the artifact_ready signal as soon as it is saved.
     """
 
+    artifact_ready: pyqtSignal = pyqtSignal(Artifact)
     exception_raised: pyqtSignal = pyqtSignal(str)
     generation_finished: pyqtSignal = pyqtSignal(str)
     generation_stopped: pyqtSignal = pyqtSignal()
+    progress_changed: pyqtSignal = pyqtSignal(ProgressInfo)
+    short_report_ready: pyqtSignal = pyqtSignal(str)
     step_done: pyqtSignal = pyqtSignal()
     step_started: pyqtSignal = pyqtSignal(str)
     total_number_of_steps_calculated: pyqtSignal = pyqtSignal(int)
@@ -134,81 +338,104 @@ class ReportGenerator(QObject):
         """
 
         super().__init__(parent=parent)
-        self._app_name: str = None
-        self._app_version: str = None
-        self._bad_pins_info: List[ut.PinInfo] = []
-        self._board: Board = None
         self._config: Dict[ConfigAttributes, Any] = None
-        self._dir_name: str = ut.get_default_dir_path()
+        self._context: ReportContext = ReportContext()
         self._dir_template: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                                _TEMPLATES_DIR_NAME)
-        self._english: bool = False
-        self._is_report_for_test_board: Optional[bool] = None
-        self._noise_amplitudes: Optional[List[Optional[Tuple[float, float]]]] = None
-        self._open_report_at_finish: bool = False
-        self._pin_diameter: int = None
-        self._pin_width: int = _PIN_WIDTH
-        self._pins_info: List[ut.PinInfo] = []
-        self._reports_to_open: List[ReportTypes] = []
-        self._required_board: bool = False
-        self._required_elements: List[int] = []
-        self._required_pins: List[int] = []
-        self._results_by_steps: Dict[ReportGenerationSteps, bool] = dict()
-        self._scaling_type: ScalingTypes = ScalingTypes.AUTO
-        self._static_dir_name: str = None
-        self._test_duration: timedelta = None
-        self._tolerance: Optional[float] = None
-        self._user_defined_scales: Optional[List[Tuple[float, float]]] = None
+        self._worker: Optional[RenderWorker] = None
         self.stop: bool = False
 
+    def _add_artifact(self, artifact_type: ArtifactTypes, file_name: Optional[str], data: Any = None) -> None:
+        """
+        :param artifact_type: type of the produced artifact;
+        :param file_name: name of the produced file;
+        :param data: data of the artifact.
+        """
+
+        self.artifact_ready.emit(Artifact(artifact_type, file_name, data))
+
     def _analyze_required_report_type(self) -> None:
         """
         Method determines the type of report to be generated (for a test board or for a reference board).
         """
 
-        if self._is_report_for_test_board is None:
-            self._is_report_for_test_board = False
-            for element in self._board.elements:
-                self._check_stop_operation()
-                for pin in element.pins:
-                    self._check_stop_operation()
-                    if len(pin.measurements) > 0:
-                        for measurement in pin.measurements:
-                            if not measurement.is_reference:
-                                self._is_report_for_test_board = True
-                                return
+        context = self._context
+        if context.is_report_for_test_board is None:
+            context.is_report_for_test_board = context.board_index.has_test_measurements
 
     def _calculate_total_number_of_steps(self) -> None:
         """
-        Method calculates the total number of steps to generate a report.
+        Method calculates the total number of steps to generate a report. Drawing of IV-curves takes a step for each
+        drawn pin.
         """
 
-        pins_number = len(self._pins_info)
-        processes = (self._copy_static_files, self._create_required_dirs, self._draw_board, self._draw_board_with_pins,
-                     self._draw_board_with_pins, self._draw_fault_histogram, self._generate_report_with_map,
-                     self._generate_full_report, self._generate_report)
-        processes_for_pins = (self._draw_ivc,)
-        number_of_steps = len(processes) + pins_number * len(processes_for_pins)
+        number_of_steps = sum(self._get_steps_number(step) for step, _ in self._get_steps())
         self.total_number_of_steps_calculated.emit(number_of_steps)
+        self._context.progress.set_total(number_of_steps)
 
     def _check_stop_operation(self) -> None:
         if self.stop:
             raise UserStop()
 
+    def _collect_general_info(self) -> Dict[str, Any]:
+        """
+        :return: dictionary with general information.
+        """
+
+        context = self._context
+        if context.board.image is None:
+            board_image_width = None
+            pin_img_size = None
+        else:
+            board_image_width = context.board.image.width
+            pin_img_size = context.pin_width
+        pcb_name = None
+        pcb_comment = None
+        if context.board.pcb is not None:
+            if context.board.pcb.pcb_name is not None:
+                pcb_name = context.board.pcb.pcb_name
+            if context.board.pcb.comment is not None:
+                pcb_comment = context.board.pcb.comment
+        iv_svg_images = context.iv_svg_images
+
+        return {"app_name": context.app_name,
+                "app_version": context.app_version,
+                "board_img_width": board_image_width,
+                "computer": os.environ.get("COMPUTERNAME", context.translate("Unknown")),
+                "date": datetime.strftime(datetime.now(), "%Y.%m.%d %H:%M:%S"),
+                "elements_number": ut.get_elements_number(context.pins_info),
+                "fault_histogram": context.results_by_steps.get(ReportGenerationSteps.DRAW_FAULT_HISTOGRAM),
+                "generated_reports": [report.name for report in context.reports_to_generate],
+                "iv_image_format": context.iv_image_format,
+                "iv_svg_definitions": iv_svg_images["definitions"] if iv_svg_images else None,
+                "iv_svg_images": iv_svg_images["images"] if iv_svg_images else None,
+                "omitted_pins": {pin_info.total_pin_index for pin_info in context.omitted_pins_info},
+                "operating_system": f"{platform.system()} {platform.release()} {platform.architecture()[0]}",
+                "pcb_comment": pcb_comment,
+                "pcb_name": pcb_name,
+                "pin_img_size": pin_img_size,
+                "pin_map": create_pin_map_json(context.pins_info, self._get_pin_radius()),
+                "pins": context.pins_info,
+                "pins_number": len(context.pins_info),
+                "refresh_interval": context.refresh_interval,
+                "test_duration": ut.get_duration_in_str(context.test_duration, context.translate),
+                "tolerance": context.tolerance,
+                "_": context.translate}
+
     def _copy_static_files(self) -> None:
         """
         Method copies favicons, style and script files to the directory with generated report.
         """
 
         self._check_stop_operation()
-        self.step_started.emit("Copying static files")
+        self._start_step("Copying static files")
         logger.info("Copying static files...")
 
         files_info = [{"file_names": ["style_for_map.css", "style_for_report.css"],
                        "dir_name": _STYLES_DIR_NAME},
                       {"file_names": ["favicon-16x16.png", "favicon-32x32.png"],
                        "dir_name": _IMG_DIR_NAME},
-                      {"file_names": ["excanvas.js", "full_image_script.js", "report_script.js"],
+                      {"file_names": ["excanvas.js", "full_image_script.js", "pin_map_script.js", "report_script.js"],
                        "dir_name": _SCRIPTS_DIR_NAME}]
 
         for file_info in files_info:
@@ -216,28 +443,46 @@ class ReportGenerator(QObject):
             for file_name in file_info["file_names"]:
                 self._check_stop_operation()
                 src_path = os.path.join(self._dir_template, file_name)
-                dst_path = os.path.join(self._static_dir_name, dir_name, file_name)
+                dst_path = os.path.join(self._context.static_dir_name, dir_name, file_name)
                 shutil.copyfile(src_path, dst_path)
 
         logger.info("Copying static files completed")
-        self.step_done.emit()
+        self._step_done()
 
     def _create_required_dirs(self) -> None:
         """
         Method checks for the presence of the required directories and creates them if necessary.
         """
 
+        context = self._context
         self._check_stop_operation()
-        self.step_started.emit("Creating directories")
+        self._start_step("Creating directories")
         logger.info("Creating directories...")
 
-        self._static_dir_name = os.path.join(self._dir_name, _STATIC_DIR_NAME)
+        context.static_dir_name = os.path.join(context.dir_name, _STATIC_DIR_NAME)
         for dir_name in (_IMG_DIR_NAME, _SCRIPTS_DIR_NAME, _STYLES_DIR_NAME):
             self._check_stop_operation()
-            os.makedirs(os.path.join(self._static_dir_name, dir_name), exist_ok=True)
+            os.makedirs(os.path.join(context.static_dir_name, dir_name), exist_ok=True)
 
         logger.info("Creating directories completed")
-        self.step_done.emit()
+        self._step_done()
+
+    def _create_pin_info(self, total_pin_index: int, score: Optional[float], pair_scores: Optional[List[float]]
+                         ) -> ut.PinInfo:
+        """
+        :param total_pin_index: total index of the pin;
+        :param score: score of the pin;
+        :param pair_scores: scores of the pairs of measurements of the pin.
+        :return: information about the pin.
+        """
+
+        context = self._context
+        index = context.board_index
+        pin = index.pins[total_pin_index]
+        pin_type = ut.get_pin_type(pin, score, context.tolerance, context.is_report_for_test_board)
+        return ut.PinInfo(index.get_element(total_pin_index).name, index.element_indices[total_pin_index],
+                          index.pin_indices[total_pin_index], pin.x, pin.y, pin.measurements, score, pin_type,
+                          total_pin_index, pin.comment, pin.multiplexer_output, pair_scores)
 
     def _draw_board(self) -> bool:
         """
@@ -245,20 +490,22 @@ class ReportGenerator(QObject):
         :return: True if the image was drawn and saved.
         """
 
+        context = self._context
         self._check_stop_operation()
-        self.step_started.emit("Saving a board image")
+        self._start_step("Saving a board image")
         logger.info("Saving a board image...")
 
-        if self._board.image:
-            file_name = os.path.join(self._static_dir_name, _IMG_DIR_NAME, _BOARD_IMAGE)
-            save_board(self._board.image, file_name)
+        if context.board.image:
+            file_name = os.path.join(context.static_dir_name, _IMG_DIR_NAME, _BOARD_IMAGE)
+            save_board(context.board.image, file_name)
             result = True
+            self._add_artifact(ArtifactTypes.BOARD_IMAGE, file_name)
             logger.info("The board image is saved to '%s'", os.path.basename(file_name))
         else:
             result = False
             logger.info("The board image is not saved: the board has no image")
 
-        self.step_done.emit()
+        self._step_done()
         return result
 
     def _draw_board_with_pins(self, bad_pins: bool = False) -> bool:
@@ -268,31 +515,33 @@ class ReportGenerator(QObject):
         :return: True if the image was drawn and saved.
         """
 
+        context = self._context
         self._check_stop_operation()
         if bad_pins:
             pins_name = "faulty pins"
             board_file_name = _BOARD_WITH_BAD_PINS_IMAGE
-            pins = self._bad_pins_info
+            pins = context.bad_pins_info
         else:
             pins_name = "pins"
             board_file_name = _BOARD_WITH_PINS_IMAGE
-            pins = self._pins_info
+            pins = context.pins_info
 
         self._check_stop_operation()
-        self.step_started.emit(f"Drawing and saving an image of a board with {pins_name}")
+        self._start_step(f"Drawing and saving an image of a board with {pins_name}")
         logger.info("Drawing and saving an image of a board with %s...", pins_name)
 
-        if self._board.image:
-            self._pin_diameter = ut.get_pin_diameter(self._board.image)
-            file_name = os.path.join(self._static_dir_name, _IMG_DIR_NAME, board_file_name)
-            draw_board_with_pins(self._board.image, pins, file_name, self._pin_diameter, self._check_stop_operation)
+        if context.board.image:
+            context.pin_diameter = ut.get_pin_diameter(context.board.image)
+            file_name = os.path.join(context.static_dir_name, _IMG_DIR_NAME, board_file_name)
+            self._render(RenderTasks.DRAW_BOARD_WITH_PINS, context.board.image, pins, file_name, context.pin_diameter)
             result = True
+            self._add_artifact(ArtifactTypes.BOARD_IMAGE, file_name)
             logger.info("The board image with %s is saved to '%s'", pins_name, os.path.basename(file_name))
         else:
             result = False
             logger.info("The board image with %s is not saved: the board has no image", pins_name)
 
-        self.step_done.emit()
+        self._step_done()
         return result
 
     def _draw_fault_histogram(self) -> bool:
@@ -301,40 +550,60 @@ class ReportGenerator(QObject):
         :return: True if the histogram was drawn and saved.
         """
 
+        context = self._context
         self._check_stop_operation()
-        self.step_started.emit("Drawing and saving a fault histogram")
+        self._start_step("Drawing and saving a fault histogram")
         logger.info("Drawing and saving a fault histogram...")
 
-        scores = [pin_info.score for pin_info in self._pins_info if pin_info.score is not None]
-        if scores and self._tolerance is not None:
+        scores = [pin_info.score for pin_info in context.pins_info if pin_info.score is not None]
+        if scores and context.tolerance is not None:
             self._check_stop_operation()
-            file_name = os.path.join(self._static_dir_name, _FAULT_HISTOGRAM_IMAGE)
-            draw_fault_histogram(scores, self._tolerance, file_name)
+            file_name = os.path.join(context.static_dir_name, _FAULT_HISTOGRAM_IMAGE)
+            self._render(RenderTasks.DRAW_FAULT_HISTOGRAM, scores, context.tolerance, file_name)
             result = True
+            self._add_artifact(ArtifactTypes.FAULT_HISTOGRAM, file_name)
             logger.info("The fault histogram is saved to '%s'", file_name)
         else:
             result = False
-            comment = "there is no tolerance" if self._tolerance is None else \
+            comment = "there is no tolerance" if context.tolerance is None else \
                 "there are no pins with test and reference IV-curves"
             logger.info("The fault histogram is not saved: %s", comment)
 
-        self.step_done.emit()
+        self._step_done()
         return result
 
-    def _draw_ivc(self) -> bool:
+    def _draw_ivc(self, faulty_pins: bool = False) -> bool:
         """
-        Method draws and saves IV-curves for the pins.
+        Method draws and saves IV-curves for the pins. IV-curves of faulty pins are drawn at a separate stage before the
+        short report, IV-curves of other pins are drawn after it.
+        :param faulty_pins: if True, then IV-curves of faulty pins will be drawn, otherwise IV-curves of other pins.
         :return: True if images were drawn and saved.
         """
 
+        context = self._context
+        stage_pins_info = self._get_stage_pins(faulty_pins)
+        pins_name = "faulty pins" if faulty_pins else "pins"
         self._check_stop_operation()
-        self.step_started.emit("Drawing and saving IV-curves of pins")
-        logger.info("Drawing and saving IV-curves of pins...")
-
-        if len(self._pins_info) > 0:
-            dir_name = os.path.join(self._static_dir_name, _IMG_DIR_NAME)
-            draw_ivc_for_pins(self._pins_info, dir_name, self.step_done, self._scaling_type, self._user_defined_scales,
-                              self._check_stop_operation)
+        self._start_step(f"Drawing and saving IV-curves of {pins_name}", len(stage_pins_info))
+        logger.info("Drawing and saving IV-curves of %s...", pins_name)
+
+        if len(stage_pins_info) > 0:
+            dir_name = os.path.join(context.static_dir_name, _IMG_DIR_NAME)
+            pins_info, user_defined_scales = self._get_pins_to_draw(stage_pins_info, dir_name)
+            if len(pins_info) < len(stage_pins_info):
+                logger.info("IV-curves of %d pins were drawn before interruption",
+                            len(stage_pins_info) - len(pins_info))
+                self._step_done(len(stage_pins_info) - len(pins_info))
+            pins_iterator = iter(pins_info)
+            # Faulty pins are drawn regardless of the time limit
+            required_number = len(pins_info) if faulty_pins else 0
+            self._render_ivc(pins_info, user_defined_scales, required_number, self._get_pins_step_done(pins_iterator))
+            # Pins are drawn in order, so the pins that are not drawn because of the time limit remain in the iterator
+            context.omitted_pins_info = list(pins_iterator)
+            if context.omitted_pins_info:
+                logger.warning("IV-curves of %d passing pins are not drawn because of the time limit",
+                               len(context.omitted_pins_info))
+                self._step_done(len(context.omitted_pins_info))
             result = True
             logger.info("The IV-curve images are saved in the '%s' directory", dir_name)
         else:
@@ -343,6 +612,80 @@ class ReportGenerator(QObject):
 
         return result
 
+    def _compare_runs(self) -> None:
+        """
+        Method compares the current test run with the earlier one and collects the changed pins.
+        """
+
+        context = self._context
+        self._check_stop_operation()
+        self._start_step("Comparing test runs", 0)
+        logger.info("Comparing test runs...")
+
+        new_run = context.board if context.board is not None else context.results_file
+        if new_run is None:
+            raise ValueError("There is no board or results of the test run to compare")
+        context.diff = RunDiff(context.diff_with, new_run, context.tolerance, context.is_report_for_test_board,
+                               self._check_stop_operation)
+        context.changes = context.diff.get_changes()
+        context.pins_info = [change["pin"] for change in context.changes if change["pin"] is not None]
+        context.iv_pins_info = context.pins_info
+        if not isinstance(context.board, Board):
+            context.board = Board()
+        logger.info("Comparing test runs completed: %d pins changed", len(context.changes))
+
+    def _export_results(self) -> List[str]:
+        """
+        Method saves the table with results of the report in machine-readable formats.
+        :return: names of saved files.
+        """
+
+        context = self._context
+        if not context.export_formats:
+            self._step_done()
+            return []
+
+        self._check_stop_operation()
+        self._start_step("Exporting results")
+        logger.info("Exporting results...")
+
+        file_names = export_results(context.pins_info, context.dir_name, context.export_formats, context.tolerance,
+                                    context.export_curves, self._check_stop_operation)
+        for file_name in file_names:
+            self._add_artifact(ArtifactTypes.RESULTS, file_name)
+
+        logger.info("Exporting results completed")
+        self._step_done()
+        return file_names
+
+    def _generate_diff_report(self) -> str:
+        """
+        Method generates a report with the changes between two test runs. The report contains only changed pins.
+        :return: name of file with generated report.
+        """
+
+        context = self._context
+        self._check_stop_operation()
+        self._start_step("Generating a report with changes")
+        logger.info("Generating a report with changes...")
+
+        self._check_stop_operation()
+        data = self._get_general_info()
+        data["changes"] = context.changes
+        data["diff_summary"] = context.diff.get_summary()
+        self._check_stop_operation()
+        data["pin_rows"] = self._get_pin_rows(context.pins_info, data)
+
+        self._check_stop_operation()
+        file_name = os.path.join(context.dir_name, _TEMPLATE_FILE_WITH_DIFF)
+        ut.generate_report(self._dir_template, _TEMPLATE_FILE_WITH_DIFF, file_name, **data)
+
+        logger.info("The report with changes is saved to '%s'", file_name)
+        self._add_artifact(ArtifactTypes.REPORT, file_name)
+        self._step_done()
+        self.generation_finished.emit(os.path.dirname(file_name))
+        return file_name
+
     def _generate_full_report(self) -> str:
         """
         Method generates a full report.
@@ -350,18 +693,21 @@ class ReportGenerator(QObject):
         """
 
         self._check_stop_operation()
-        self.step_started.emit("Generating a full report")
+        self._start_step("Generating a full report")
         logger.info("Generating a full report...")
 
         self._check_stop_operation()
         data = self._get_general_info()
+        self._check_stop_operation()
+        data["pin_rows"] = self._get_pin_rows(self._context.pins_info, data)
 
         self._check_stop_operation()
-        file_name = os.path.join(self._dir_name, _TEMPLATE_FILE_WITH_FULL_REPORT)
+        file_name = os.path.join(self._context.dir_name, _TEMPLATE_FILE_WITH_FULL_REPORT)
         ut.generate_report(self._dir_template, _TEMPLATE_FILE_WITH_FULL_REPORT, file_name, **data)
 
         logger.info("The full report is saved to '%s'", file_name)
-        self.step_done.emit()
+        self._add_artifact(ArtifactTypes.REPORT, file_name, ReportTypes.FULL_REPORT)
+        self._step_done()
         return file_name
 
     def _generate_report(self) -> str:
@@ -371,21 +717,24 @@ class ReportGenerator(QObject):
         """
 
         self._check_stop_operation()
-        self.step_started.emit("Generating a report")
+        self._start_step("Generating a report")
         logger.info("Generating a report...")
 
         self._check_stop_operation()
         data = self._get_general_info()
         self._check_stop_operation()
         data.update(self._get_info_about_faulty_elements_and_pins())
+        self._check_stop_operation()
+        data["pin_rows"] = self._get_pin_rows(self._context.bad_pins_info, data)
 
         self._check_stop_operation()
-        file_name = os.path.join(self._dir_name, _TEMPLATE_FILE_WITH_REPORT)
+        file_name = os.path.join(self._context.dir_name, _TEMPLATE_FILE_WITH_REPORT)
         ut.generate_report(self._dir_template, _TEMPLATE_FILE_WITH_REPORT, file_name, **data)
 
         logger.info("The report is saved to '%s'", file_name)
-        self.step_done.emit()
-        self.generation_finished.emit(os.path.dirname(file_name))
+        self._add_artifact(ArtifactTypes.REPORT, file_name, ReportTypes.SHORT_REPORT)
+        self._step_done()
+        self.short_report_ready.emit(file_name)
         return file_name
 
     def _generate_report_with_map(self) -> Optional[str]:
@@ -394,19 +743,24 @@ class ReportGenerator(QObject):
         :return: name of file with generated report.
         """
 
-        if not self._results_by_steps[ReportGenerationSteps.DRAW_BOARD_WITH_PINS]:
-            self.step_done.emit()
+        context = self._context
+        if not context.results_by_steps.get(ReportGenerationSteps.DRAW_BOARD_WITH_PINS):
+            self._step_done()
             return
 
         self._check_stop_operation()
-        self.step_started.emit("Generating a report with board map")
+        self._start_step("Generating a report with board map")
         logger.info("Generating a report with board map...")
 
-        file_name = os.path.join(self._dir_name, _TEMPLATE_FILE_WITH_MAP)
-        ut.generate_report(self._dir_template, _TEMPLATE_FILE_WITH_MAP, file_name, pins=self._pins_info, _=_)
+        file_name = os.path.join(context.dir_name, _TEMPLATE_FILE_WITH_MAP)
+        pin_map = self._get_general_info()["pin_map"]
+        ut.generate_report(self._dir_template, _TEMPLATE_FILE_WITH_MAP, file_name,
+                           iv_image_extension=ut.get_iv_image_extension(context.iv_image_format), pin_map=pin_map,
+                           refresh_interval=context.refresh_interval, _=context.translate)
 
         logger.info("The report with board map is saved to '%s'", file_name)
-        self.step_done.emit()
+        self._add_artifact(ArtifactTypes.REPORT, file_name, ReportTypes.MAP_REPORT)
+        self._step_done()
         return file_name
 
     def _get_faulty_pins(self) -> List[ut.PinInfo]:
@@ -415,49 +769,24 @@ class ReportGenerator(QObject):
         the tolerance.
         """
 
+        context = self._context
         self._check_stop_operation()
         faulty_pins = []
-        if self._tolerance is not None:
-            faulty_pins = [pin_info for pin_info in self._pins_info
-                           if pin_info.score is not None and pin_info.score > self._tolerance]
+        if context.tolerance is not None:
+            faulty_pins = [pin_info for pin_info in context.pins_info
+                           if pin_info.score is not None and pin_info.score > context.tolerance]
         return faulty_pins
 
     def _get_general_info(self) -> Dict[str, Any]:
         """
-        :return: dictionary with general information.
+        :return: dictionary with general information. The information is collected once and then reused by all
+        reports.
         """
 
-        if self._board.image is None:
-            board_image_width = None
-            pin_img_size = None
-        else:
-            board_image_width = self._board.image.width
-            pin_img_size = self._pin_width
-        pcb_name = None
-        pcb_comment = None
-        if self._board.pcb is not None:
-            if self._board.pcb.pcb_name is not None:
-                pcb_name = self._board.pcb.pcb_name
-            if self._board.pcb.comment is not None:
-                pcb_comment = self._board.pcb.comment
-
-        return {"app_name": self._app_name,
-                "app_version": self._app_version,
-                "board_img_width": board_image_width,
-                "computer": os.environ.get("COMPUTERNAME", _("Unknown")),
-                "date": datetime.strftime(datetime.now(), "%Y.%m.%d %H:%M:%S"),
-                "elements_number": ut.get_elements_number(self._pins_info),
-                "fault_histogram": self._results_by_steps[ReportGenerationSteps.DRAW_FAULT_HISTOGRAM],
-                "operating_system": f"{platform.system()} {platform.release()} {platform.architecture()[0]}",
-                "pcb_comment": pcb_comment,
-                "pcb_name": pcb_name,
-                "pin_img_size": pin_img_size,
-                "pin_radius": _PIN_RADIUS if self._pin_diameter is None else int(self._pin_diameter / 2),
-                "pins": self._pins_info,
-                "pins_number": len(self._pins_info),
-                "test_duration": ut.get_duration_in_str(self._test_duration),
-                "tolerance": self._tolerance,
-                "_": _}
+        context = self._context
+        if context.general_info is None:
+            context.general_info = self._collect_general_info()
+        return dict(context.general_info)
 
     def _get_info_about_faulty_elements_and_pins(self) -> Dict[str, Any]:
         """
@@ -465,44 +794,332 @@ class ReportGenerator(QObject):
         greater or equal to the tolerance. Faulty element has at least one faulty pin.
         """
 
-        return {"bad_elements_number": ut.get_elements_number(self._bad_pins_info),
-                "bad_pins": self._bad_pins_info,
-                "bad_pins_number": len(self._bad_pins_info)}
+        context = self._context
+        return {"bad_elements_number": ut.get_elements_number(context.bad_pins_info),
+                "bad_pin_map": create_pin_map_json(context.bad_pins_info, self._get_pin_radius()),
+                "bad_pins": context.bad_pins_info,
+                "bad_pins_number": len(context.bad_pins_info)}
+
+    def _get_iv_pins(self) -> List[ut.PinInfo]:
+        """
+        :return: list with information about pins whose IV-curves are drawn. Images of passing pins are shown only in
+        the full report and in the report with board map.
+        """
+
+        context = self._context
+        if ReportTypes.FULL_REPORT in context.reports_to_generate or \
+                ReportTypes.MAP_REPORT in context.reports_to_generate:
+            return context.pins_info
+        return context.bad_pins_info
+
+    def _get_ivc_step_done(self, pins_info: List[ut.PinInfo], dir_name: str, step_done: Callable[[int], None]
+                           ) -> Callable[[int], None]:
+        """
+        :param pins_info: list with information about pins whose images are drawn;
+        :param dir_name: directory with images of IV-curves;
+        :param step_done: function to be called with the number of done steps.
+        :return: function to be called with the number of done steps while images of the pins are drawn. Pins are drawn
+        in order, so the done steps report the images of the next pins as ready.
+        """
+
+        pins_iterator = iter(pins_info)
+        image_format = self._context.iv_image_format
+
+        def ivc_step_done(steps_number: int = 1) -> None:
+            for pin_info in itertools.islice(pins_iterator, steps_number):
+                # Pins without measurements have no images
+                if pin_info.measurements:
+                    self._add_artifact(ArtifactTypes.IV_IMAGE,
+                                       os.path.join(dir_name, ut.get_iv_image_name(pin_info, image_format)), pin_info)
+            step_done(steps_number)
+
+        return ivc_step_done
+
+    def _get_metrics(self) -> Dict[str, Any]:
+        """
+        :return: dictionary with numbers of elements and pins of the report.
+        """
+
+        context = self._context
+        return {"bad_elements_number": ut.get_elements_number(context.bad_pins_info),
+                "bad_pins_number": len(context.bad_pins_info),
+                "elements_number": ut.get_elements_number(context.pins_info),
+                "omitted_pins_number": len(context.omitted_pins_info),
+                "pins_number": len(context.pins_info),
+                "tolerance": context.tolerance}
+
+    def _get_noise_amplitudes(self, total_pin_indices: List[int]) -> Optional[List[Optional[Tuple[float, float]]]]:
+        """
+        :param total_pin_indices: total indices of the compared pins.
+        :return: list with noise amplitudes for the compared pins. Noise amplitudes in the config are given for all pins
+        of the board by total pin index.
+        """
+
+        noise_amplitudes = self._context.noise_amplitudes
+        if not isinstance(noise_amplitudes, (list, tuple)):
+            return noise_amplitudes
+        return [noise_amplitudes[total_pin_index] if total_pin_index < len(noise_amplitudes) else None
+                for total_pin_index in total_pin_indices]
+
+    def _get_pin_radius(self) -> int:
+        """
+        :return: radius of pin on the board image.
+        """
+
+        # The diameter depends only on the board image, so it is known even if the board was drawn before interruption
+        pin_diameter = ut.get_pin_diameter(self._context.board.image)
+        return _PIN_RADIUS if pin_diameter is None else int(pin_diameter / 2)
+
+    def _get_pin_rows(self, pins_info: List[ut.PinInfo], data: Dict[str, Any]) -> Dict[int, str]:
+        """
+        Method renders the rows of the table for pins whose rows have not yet been rendered. Rows are shared by all
+        reports.
+        :param pins_info: list with information about pins whose rows are required;
+        :param data: arguments for template.
+        :return: dictionary with rendered rows.
+        """
+
+        return ut.render_pin_rows(self._dir_template, pins_info, self._context.pin_rows, **data)
+
+    def _get_pin_scores(self, total_pin_indices: List[int]
+                        ) -> List[Tuple[Optional[float], Optional[List[Optional[float]]]]]:
+        """
+        :param total_pin_indices: total indices of the pins to be compared.
+        :return: list with the score of the pin and the list with scores of pairs of measurements for each pin.
+        """
+
+        context = self._context
+        index = context.board_index
+        return ut.get_pin_scores([index.pins[total_pin_index] for total_pin_index in total_pin_indices],
+                                 self._get_noise_amplitudes(total_pin_indices), self._check_stop_operation,
+                                 context.prefilter, context.validate_prefilter,
+                                 [(index.element_indices[total_pin_index], index.pin_indices[total_pin_index])
+                                  for total_pin_index in total_pin_indices])
 
     def _get_pins(self) -> List[ut.PinInfo]:
         """
         :return: list with information about pins for which report should be generated.
         """
 
-        comparator = IVCComparator()
+        context = self._context
         pins_info = []
-        accounted_pin_index = 0
-        total_pin_index = 0
-        for element_index, element in enumerate(self._board.elements):
-            for pin_index, pin in enumerate(element.pins):
-                if (self._required_board or element_index in self._required_elements or
-                        total_pin_index in self._required_pins):
-                    if len(pin.measurements) > 1:
-                        if isinstance(self._noise_amplitudes, (list, tuple)) and\
-                                len(self._noise_amplitudes) > accounted_pin_index and\
-                                len(self._noise_amplitudes[accounted_pin_index]) == 2:
-                            voltage_noise, current_noise = self._noise_amplitudes[accounted_pin_index]
-                        else:
-                            voltage_noise, current_noise = ut.get_noise_amplitudes(pin)
-                        comparator.set_min_ivc(voltage_noise, current_noise)
-                        # Score is in relative units (0 - minimum value, 1 - maximum). Convert this value to %.
-                        # The transition to percentages is carried out in the task # 85658
-                        score = round(100 * comparator.compare_ivc(pin.measurements[0].ivc, pin.measurements[1].ivc), 1)
-                    else:
-                        score = None
-                    pin_type = ut.get_pin_type(pin, score, self._tolerance, self._is_report_for_test_board)
-                    info = ut.PinInfo(element.name, element_index, pin_index, pin.x, pin.y, pin.measurements, score,
-                                      pin_type, total_pin_index, pin.comment, pin.multiplexer_output)
-                    pins_info.append(info)
-                    accounted_pin_index += 1
-                total_pin_index += 1
+        index = context.board_index
+        mask = index.get_mask(context.required_board, context.required_elements, context.required_pins)
+        query_masks = [(query, query.get_mask(index)) for query in context.queries]
+        selected_pins = np.flatnonzero(np.logical_or.reduce([mask] + [query_mask for _, query_mask in query_masks]))
+        selected_pins = selected_pins.tolist()
+        scores = self._get_pin_scores(selected_pins)
+        for total_pin_index, (score, pair_scores) in zip(selected_pins, scores):
+            self._check_stop_operation()
+            info = self._create_pin_info(total_pin_index, score, pair_scores)
+            if mask[total_pin_index] or any(query_mask[total_pin_index] and query.match_result(info)
+                                            for query, query_mask in query_masks):
+                pins_info.append(info)
         return pins_info
 
+    def _get_pins_step_done(self, pins_iterator: Iterator[ut.PinInfo]) -> Callable[[int], None]:
+        """
+        :param pins_iterator: iterator over the pins to be drawn.
+        :return: function to be called with the number of done steps while images of the pins are drawn. Pins are drawn
+        in order, so the done steps take the next pins from the iterator and mark them as drawn in the checkpoint.
+        """
+
+        checkpoint = self._context.checkpoint
+
+        def step_done(steps_number: int = 1) -> None:
+            pins_info = list(itertools.islice(pins_iterator, steps_number))
+            if checkpoint is not None:
+                checkpoint.set_pins_done(pin_info.total_pin_index for pin_info in pins_info)
+            self._step_done(steps_number)
+
+        return step_done
+
+    def _get_pins_to_draw(self, stage_pins_info: List[ut.PinInfo], dir_name: str
+                          ) -> Tuple[List[ut.PinInfo], Optional[list]]:
+        """
+        :param stage_pins_info: list with information about pins whose images are drawn at the stage;
+        :param dir_name: directory with images of IV-curves.
+        :return: list with information about pins whose images should be drawn and list with user defined scales for
+        these pins. Pins drawn before interruption of the generation are skipped if their images exist.
+        """
+
+        context = self._context
+        check_files = context.checkpoint is not None and context.iv_image_format != ImageFormats.INLINE_SVG
+        if not check_files and stage_pins_info is context.pins_info:
+            return context.pins_info, context.user_defined_scales
+
+        # User defined scales are given for all pins of the report
+        iv_pins = {pin_info.total_pin_index for pin_info in stage_pins_info}
+        indices = [index for index, pin_info in enumerate(context.pins_info) if pin_info.total_pin_index in iv_pins and
+                   (not check_files or not context.checkpoint.is_pin_done(pin_info.total_pin_index) or
+                    not os.path.isfile(os.path.join(dir_name, ut.get_iv_image_name(pin_info,
+                                                                                   context.iv_image_format))))]
+        user_defined_scales = context.user_defined_scales
+        if isinstance(user_defined_scales, (list, tuple)):
+            user_defined_scales = [user_defined_scales[index] if index < len(user_defined_scales) else None
+                                   for index in indices]
+        return [context.pins_info[index] for index in indices], user_defined_scales
+
+    def _get_stage_pins(self, faulty_pins: bool) -> List[ut.PinInfo]:
+        """
+        :param faulty_pins: if True, then faulty pins are required, otherwise other pins whose IV-curves are drawn.
+        :return: list with information about pins whose IV-curves are drawn at the stage.
+        """
+
+        context = self._context
+        if faulty_pins:
+            return context.bad_pins_info
+        if not context.bad_pins_info:
+            return context.iv_pins_info
+        if context.iv_pins_info is context.bad_pins_info:
+            return []
+
+        bad_pins = {pin_info.total_pin_index for pin_info in context.bad_pins_info}
+        return [pin_info for pin_info in context.iv_pins_info if pin_info.total_pin_index not in bad_pins]
+
+    def _get_steps(self) -> List[Tuple[ReportGenerationSteps, Callable[[], Any]]]:
+        """
+        :return: list with stages of report generation and methods that perform them. Stages whose results are not
+        used by the reports to generate are skipped. The stages required by the short report are performed first, so
+        the short report is ready before IV-curves of passing pins are drawn.
+        """
+
+        reports = self._context.reports_to_generate
+        required_steps = {ReportTypes.FULL_REPORT: (ReportGenerationSteps.DRAW_BOARD_WITH_PINS,
+                                                    ReportGenerationSteps.DRAW_CLEAR_BOARD,
+                                                    ReportGenerationSteps.DRAW_FAULT_HISTOGRAM,
+                                                    ReportGenerationSteps.GENERATE_FULL_REPORT),
+                          ReportTypes.MAP_REPORT: (ReportGenerationSteps.DRAW_BOARD_WITH_PINS,
+                                                   ReportGenerationSteps.GENERATE_MAP_REPORT),
+                          ReportTypes.SHORT_REPORT: (ReportGenerationSteps.DRAW_BOARD_WITH_BAD_PINS,
+                                                     ReportGenerationSteps.DRAW_CLEAR_BOARD,
+                                                     ReportGenerationSteps.DRAW_FAULT_HISTOGRAM,
+                                                     ReportGenerationSteps.GENERATE_REPORT)}
+        steps = {ReportGenerationSteps.COPY_STATIC_FILES, ReportGenerationSteps.CREATE_DIRS,
+                 ReportGenerationSteps.DRAW_FAULTY_IVC, ReportGenerationSteps.DRAW_IVC,
+                 ReportGenerationSteps.EXPORT_RESULTS}
+        for report in reports:
+            steps.update(required_steps[report])
+        methods = ((ReportGenerationSteps.CREATE_DIRS, self._create_required_dirs),
+                   (ReportGenerationSteps.COPY_STATIC_FILES, self._copy_static_files),
+                   (ReportGenerationSteps.DRAW_CLEAR_BOARD, self._draw_board),
+                   (ReportGenerationSteps.DRAW_BOARD_WITH_BAD_PINS, (lambda: self._draw_board_with_pins(True))),
+                   (ReportGenerationSteps.DRAW_FAULT_HISTOGRAM, self._draw_fault_histogram),
+                   (ReportGenerationSteps.DRAW_FAULTY_IVC, (lambda: self._draw_ivc(True))),
+                   (ReportGenerationSteps.GENERATE_REPORT, self._generate_report),
+                   (ReportGenerationSteps.DRAW_BOARD_WITH_PINS, (lambda: self._draw_board_with_pins(False))),
+                   (ReportGenerationSteps.DRAW_IVC, self._draw_ivc),
+                   (ReportGenerationSteps.EXPORT_RESULTS, self._export_results),
+                   (ReportGenerationSteps.GENERATE_MAP_REPORT, self._generate_report_with_map),
+                   (ReportGenerationSteps.GENERATE_FULL_REPORT, self._generate_full_report))
+        return [(step, method) for step, method in methods if step in steps]
+
+    def _get_steps_number(self, step: ReportGenerationSteps) -> int:
+        """
+        :param step: stage of report generation.
+        :return: number of steps at the stage. Drawing of IV-curves takes a step for each drawn pin.
+        """
+
+        if step in (ReportGenerationSteps.DRAW_FAULTY_IVC, ReportGenerationSteps.DRAW_IVC):
+            return len(self._get_stage_pins(step == ReportGenerationSteps.DRAW_FAULTY_IVC))
+        return 1
+
+    def _get_worker(self) -> RenderWorker:
+        """
+        :return: worker to draw images in a separate process. The worker is kept between reports.
+        """
+
+        if self._worker is None:
+            self._worker = RenderWorker()
+        self._worker.max_memory = self._context.worker_max_memory
+        self._worker.max_reports = self._context.worker_max_reports
+        return self._worker
+
+    def _is_step_resumable(self, step: ReportGenerationSteps) -> bool:
+        """
+        :param step: stage of report generation.
+        :return: True if the result of the stage is kept in files, so the stage can be skipped when the generation is
+        resumed. Reports and exported results are always generated again, inline SVG images are kept in memory.
+        """
+
+        if step in (ReportGenerationSteps.DRAW_FAULTY_IVC, ReportGenerationSteps.DRAW_IVC):
+            return self._context.iv_image_format != ImageFormats.INLINE_SVG
+        return step not in (ReportGenerationSteps.CREATE_DIRS, ReportGenerationSteps.EXPORT_RESULTS,
+                            ReportGenerationSteps.GENERATE_FULL_REPORT, ReportGenerationSteps.GENERATE_MAP_REPORT,
+                            ReportGenerationSteps.GENERATE_REPORT)
+
+    def _is_rendered_in_worker(self, task: RenderTasks) -> bool:
+        """
+        :param task: task of drawing images.
+        :return: True if the task should be performed in the worker process. IV-curves in PNG format are drawn by a Qt
+        widget, so they are drawn in the worker process if the generator does not run in the GUI thread.
+        """
+
+        if self._context.render_in_worker:
+            return True
+        if task == RenderTasks.DRAW_IVC_FOR_PINS and not is_gui_thread():
+            logger.info("IV-curves are drawn in the worker process, because the generator does not run in the GUI "
+                        "thread")
+            return True
+        return False
+
+    def _load_board(self) -> None:
+        """
+        Method reads the board from the UFIV file with compact IV-curves.
+        """
+
+        context = self._context
+        self._check_stop_operation()
+        self._start_step("Reading a board file", 0)
+        logger.info("Reading a board from '%s'...", context.ufiv_file)
+        context.board = load_board_from_ufiv(context.ufiv_file, self._check_stop_operation)
+
+    def _open_checkpoint(self) -> None:
+        """
+        Method opens the checkpoint of the report. If the generation should be resumed, the report directory of the
+        interrupted generation of the same report is used. The fingerprint of the report is computed from all IV-curves
+        of the report, so the checkpoint is opened only if it is required.
+        """
+
+        context = self._context
+        if not context.save_checkpoint:
+            return
+
+        fingerprint = get_fingerprint(context.pins_info, VERSION, context.english, context.is_report_for_test_board,
+                                      context.iv_image_format.name, context.pin_width, context.scaling_type.name,
+                                      context.tolerance, context.user_defined_scales,
+                                      [report.name for report in context.reports_to_generate])
+        if context.resume:
+            dir_name = find_checkpoint(os.path.dirname(context.dir_name), fingerprint)
+            if dir_name is not None:
+                context.dir_name = dir_name
+                logger.info("Report generation is resumed in the '%s' directory", dir_name)
+            else:
+                logger.info("There is no interrupted generation of the report to resume")
+        context.checkpoint = Checkpoint.open(context.dir_name, fingerprint)
+
+    def _perform(self, method: Callable[[], Any]) -> bool:
+        """
+        Method performs the report generation. Errors are reported with the exception_raised signal.
+        :param method: method that generates the report.
+        :return: True if the report was generated without errors and was not stopped.
+        """
+
+        try:
+            method()
+            if self.stop:
+                self.generation_stopped.emit()
+                return False
+            return True
+        except UserStop:
+            logger.info("Report generation stopped by user")
+        except Exception as exc:
+            error_str = f" ({exc})" if str(exc) else ""
+            exception_text = f"An error occurred while generating the report{error_str}"
+            self.exception_raised.emit(exception_text)
+            logger.error(exception_text, exc_info=sys.exc_info())
+        return False
+
     def _read_config(self, config: Dict[ConfigAttributes, Any]) -> None:
         """
         Method reads dictionary with full information about required report.
@@ -510,114 +1127,200 @@ class ReportGenerator(QObject):
         """
 
         if not isinstance(config, dict):
-            config = ConfigAttributes.get_default_config(self._board) if not isinstance(self._config, dict) else \
-                self._config
+            config = self._config if isinstance(self._config, dict) else \
+                ConfigAttributes.get_default_config(self._context.board)
 
         self._config = config
-        self._app_name = self._config.get(ConfigAttributes.APP_NAME, None)
-        self._app_version = self._config.get(ConfigAttributes.APP_VERSION, None)
-        self._board = self._config.get(ConfigAttributes.BOARD, None)
-        parent_directory = self._config.get(ConfigAttributes.DIRECTORY, ut.get_default_dir_path())
-        self._dir_name = ut.create_report_directory_name(parent_directory, _DEFAULT_REPORT_DIR_NAME)
-        self._english = self._config.get(ConfigAttributes.ENGLISH, False)
-        self._is_report_for_test_board = self._config.get(ConfigAttributes.IS_REPORT_FOR_TEST_BOARD, None)
-        self._noise_amplitudes = self._config.get(ConfigAttributes.NOISE_AMPLITUDES, None)
-        self._open_report_at_finish = self._config.get(ConfigAttributes.OPEN_REPORT_AT_FINISH, False)
-        self._pin_width = self._config.get(ConfigAttributes.PIN_SIZE, _PIN_WIDTH)
-        self._reports_to_open = list(set(self._config.get(ConfigAttributes.REPORTS_TO_OPEN,
-                                                          [ReportTypes.SHORT_REPORT])))
-        self._scaling_type = self._config.get(ConfigAttributes.SCALING_TYPE, ScalingTypes.AUTO)
-        self._test_duration = self._config.get(ConfigAttributes.TEST_DURATION, None)
-        tolerance = self._config.get(ConfigAttributes.TOLERANCE, None)
-        if tolerance is not None:
-            # The tolerance is given in relative units (0 - minimum value, 1 - maximum). Convert this value to %.
-            # The transition to percentages is carried out in the task #85658
-            self._tolerance = 100 * tolerance
-        self._user_defined_scales = self._config.get(ConfigAttributes.USER_DEFINED_SCALES, None)
-        required_objects = self._config.get(ConfigAttributes.OBJECTS, {})
-        if required_objects.get(ObjectsForReport.BOARD):
-            self._required_board = True
-        else:
-            self._required_board = False
-            self._required_elements = required_objects.get(ObjectsForReport.ELEMENT, [])
-            self._required_pins = required_objects.get(ObjectsForReport.PIN, [])
+        self._context = ReportContext.create_from_config(config)
+        # The generator passes the translation explicitly, but applications may still use builtins._
+        install_translation(self._context.english)
+
+    def _render(self, task: RenderTasks, *args, step_done: Optional[Callable[[int], None]] = None) -> Any:
+        """
+        Method performs the task of drawing images in the current process or in the worker process.
+        :param task: task to be performed;
+        :param args: arguments of the task;
+        :param step_done: function to be called with the number of done steps.
+        :return: result of the task.
+        """
+
+        context = self._context
+        step_done = step_done or self._step_done
+        if self._is_rendered_in_worker(task):
+            return self._get_worker().run_task(task, args, context.english, self._check_stop_operation, step_done)
+        return perform_task(task, args, _StepSignal(step_done), self._check_stop_operation, context.translate)
+
+    def _render_ivc(self, pins_info: List[ut.PinInfo], user_defined_scales: Optional[list], required_number: int,
+                    step_done: Callable[[int], None]) -> None:
+        """
+        Method draws and saves IV-curves for the pins in the format of the report. Inline SVG images are added to the
+        images drawn before.
+        :param pins_info: list with information about pins whose images should be drawn;
+        :param user_defined_scales: list with user defined scales for these pins;
+        :param required_number: number of the first pins to be drawn regardless of the time limit;
+        :param step_done: function to be called with the number of done steps.
+        """
+
+        context = self._context
+        # The general information includes inline images and pins that are not drawn, so it is collected again
+        context.general_info = None
+        dir_name = os.path.join(context.static_dir_name, _IMG_DIR_NAME)
+        if self.receivers(self.artifact_ready):
+            step_done = self._get_ivc_step_done(pins_info, dir_name, step_done)
+        if context.iv_image_format == ImageFormats.PNG:
+            self._render(RenderTasks.DRAW_IVC_FOR_PINS, pins_info, dir_name, context.scaling_type, user_defined_scales,
+                         context.image_cache_dir_name, context.image_cache_size, context.deadline, required_number,
+                         step_done=step_done)
+            return
+
+        # SVG images are drawn without Qt, so they are drawn in the current process. The renderer is kept, so the
+        # images drawn later share the axes with the images drawn before
+        if context.svg_renderer is None:
+            inline_height = None if context.board.image is None else context.pin_width
+            context.svg_renderer = SvgRenderer(context.translate, context.iv_image_format == ImageFormats.INLINE_SVG,
+                                               inline_height)
+        iv_svg_images = draw_ivc_svg_for_pins(pins_info, dir_name, _StepSignal(step_done), context.scaling_type,
+                                              user_defined_scales, self._check_stop_operation, context.translate,
+                                              context.iv_image_format, None, context.deadline, required_number,
+                                              context.svg_renderer)
+        if iv_svg_images is not None and context.iv_svg_images is not None:
+            iv_svg_images["images"] = {**context.iv_svg_images["images"], **iv_svg_images["images"]}
+        context.iv_svg_images = iv_svg_images
 
     def _run(self) -> None:
         """
         Method runs report generation.
         """
 
-        if not isinstance(self._board, Board):
+        context = self._context
+        context.progress = ProgressReporter(self.progress_changed.emit)
+        if context.board is None and context.ufiv_file:
+            self._load_board()
+        if context.diff_with is not None:
+            self._run_diff()
+            return
+        if not isinstance(context.board, Board):
             return
 
+        context.board_index = BoardIndex(context.board, self._check_stop_operation)
         self._analyze_required_report_type()
-        self._pins_info = self._get_pins()
+        context.pins_info = self._get_pins()
+        context.bad_pins_info = self._get_faulty_pins()
+        context.iv_pins_info = self._get_iv_pins()
         self._calculate_total_number_of_steps()
-        self._bad_pins_info = self._get_faulty_pins()
-        if not self._pins_info:
+        self._open_checkpoint()
+        if not context.pins_info:
             logger.info("There are no objects for which report should be created")
 
-        self._results_by_steps = dict()
+        context.results_by_steps = dict()
+        checkpoint = context.checkpoint
+        for step, method in self._get_steps():
+            resumable = checkpoint is not None and self._is_step_resumable(step)
+            if resumable and checkpoint.is_step_done(step.name):
+                logger.info("The step %s was done before interruption", step.name)
+                context.results_by_steps[step] = checkpoint.get_step_result(step.name)
+                self._step_done(self._get_steps_number(step))
+                continue
+
+            context.results_by_steps[step] = method()
+            # Pins omitted because of the time limit are drawn when the generation is resumed
+            if resumable and not (step == ReportGenerationSteps.DRAW_IVC and context.omitted_pins_info):
+                checkpoint.set_step_done(step.name, context.results_by_steps[step])
+        if checkpoint is not None:
+            checkpoint.finish()
+        context.progress.flush()
+        self._add_artifact(ArtifactTypes.METRICS, None, self._get_metrics())
+        self.generation_finished.emit(context.dir_name)
+
+        correspondence_dict = {ReportTypes.MAP_REPORT: ReportGenerationSteps.GENERATE_MAP_REPORT,
+                               ReportTypes.FULL_REPORT: ReportGenerationSteps.GENERATE_FULL_REPORT,
+                               ReportTypes.SHORT_REPORT: ReportGenerationSteps.GENERATE_REPORT}
+        if context.open_report_at_finish:
+            for report_to_open in context.reports_to_open:
+                report_file_name = context.results_by_steps.get(correspondence_dict.get(report_to_open, None), None)
+                if report_file_name:
+                    webbrowser.open(report_file_name, new=2)
+
+    def _run_diff(self) -> None:
+        """
+        Method runs generation of the report with the changes between two test runs. Images are drawn only for the
+        changed pins.
+        """
+
+        context = self._context
+        self._compare_runs()
         methods = ((ReportGenerationSteps.CREATE_DIRS, self._create_required_dirs),
                    (ReportGenerationSteps.DRAW_CLEAR_BOARD, self._draw_board),
                    (ReportGenerationSteps.DRAW_BOARD_WITH_PINS, (lambda: self._draw_board_with_pins(False))),
-                   (ReportGenerationSteps.DRAW_BOARD_WITH_BAD_PINS, (lambda: self._draw_board_with_pins(True))),
-                   (ReportGenerationSteps.DRAW_FAULT_HISTOGRAM, self._draw_fault_histogram),
                    (ReportGenerationSteps.DRAW_IVC, self._draw_ivc),
                    (ReportGenerationSteps.COPY_STATIC_FILES, self._copy_static_files),
-                   (ReportGenerationSteps.GENERATE_MAP_REPORT, self._generate_report_with_map),
-                   (ReportGenerationSteps.GENERATE_REPORT, self._generate_report),
-                   (ReportGenerationSteps.GENERATE_FULL_REPORT, self._generate_full_report))
+                   (ReportGenerationSteps.GENERATE_DIFF_REPORT, self._generate_diff_report))
+        # Drawing of IV-curves takes a step for each pin
+        number_of_steps = len(methods) - 1 + len(context.pins_info)
+        self.total_number_of_steps_calculated.emit(number_of_steps)
+        context.progress.set_total(number_of_steps)
+
+        context.results_by_steps = dict()
         for step, method in methods:
-            self._results_by_steps[step] = method()
+            context.results_by_steps[step] = method()
+        context.progress.flush()
 
-        correspondence_dict = {ReportTypes.MAP_REPORT: ReportGenerationSteps.GENERATE_MAP_REPORT,
-                               ReportTypes.FULL_REPORT: ReportGenerationSteps.GENERATE_FULL_REPORT,
-                               ReportTypes.SHORT_REPORT: ReportGenerationSteps.GENERATE_REPORT}
-        if self._open_report_at_finish:
-            for report_to_open in self._reports_to_open:
-                report_file_name = self._results_by_steps.get(correspondence_dict.get(report_to_open, None), None)
-                if report_file_name:
-                    webbrowser.open(report_file_name, new=2)
+        if context.open_report_at_finish:
+            webbrowser.open(context.results_by_steps[ReportGenerationSteps.GENERATE_DIFF_REPORT], new=2)
 
     def _set_to_init_state(self) -> None:
         """
         Method returns the generator to its initial state.
         """
 
-        self._app_name = None
-        self._app_version = None
-        self._bad_pins_info.clear()
-        del self._board
-        self._board = None
         self._config = None
-        self._dir_name = ut.get_default_dir_path()
-        self._english = False
-        self._is_report_for_test_board = None
-        self._noise_amplitudes = None
-        self._open_report_at_finish = False
-        self._pin_diameter = None
-        self._pin_width = _PIN_WIDTH
-        self._pins_info.clear()
-        self._reports_to_open.clear()
-        self._required_board = False
-        self._required_elements.clear()
-        self._required_pins.clear()
-        self._results_by_steps.clear()
-        self._scaling_type = ScalingTypes.AUTO
-        self._static_dir_name = None
-        self._test_duration = None
-        self._tolerance = None
-        self._user_defined_scales = None
+        self._context = ReportContext()
         self.stop = False
 
+    def _start_step(self, step_name: str, steps_number: int = 1) -> None:
+        """
+        :param step_name: name of the started step;
+        :param steps_number: number of steps to be done at this stage.
+        """
+
+        self.step_started.emit(step_name)
+        if self._context.progress is not None:
+            self._context.progress.start_stage(step_name, steps_number)
+
+    def _step_done(self, steps_number: int = 1) -> None:
+        """
+        Method counts the done steps. The step_done signal is emitted for each step only if it is connected, the
+        aggregated progress is sent with the rate-limited progress_changed signal.
+        :param steps_number: number of done steps.
+        """
+
+        if self.receivers(self.step_done):
+            for _ in range(steps_number):
+                self.step_done.emit()
+        if self._context.progress is not None:
+            self._context.progress.advance(steps_number)
+
     def clear(self) -> None:
         """
-        Method clears all data from the generator.
+        Method clears all data from the generator. If images were drawn in the worker process, garbage is not collected
+        forcibly, because the memory is freed when the worker process is recycled.
         """
 
+        render_in_worker = self._context.render_in_worker
         self._set_to_init_state()
-        gc.collect()
+        if not render_in_worker:
+            gc.collect()
+        # IV-curves are drawn in the worker process also if the generator does not run in the GUI thread
+        if self._worker is not None:
+            self._worker.finish_report()
+
+    def close_worker(self) -> None:
+        """
+        Method stops the worker process used to draw images.
+        """
+
+        if self._worker is not None:
+            self._worker.close()
 
     @classmethod
     def get_version(cls) -> str:
@@ -635,19 +1338,9 @@ class ReportGenerator(QObject):
 
         logger.info("Start report generation")
         self._read_config(config)
-        install_translation(self._english)
-        try:
-            self._run()
-            if self.stop:
-                self.generation_stopped.emit()
-        except UserStop:
-            logger.info("Report generation stopped by user")
-        except Exception as exc:
-            error_str = f" ({exc})" if str(exc) else ""
-            exception_text = f"An error occurred while generating the report{error_str}"
-            self.exception_raised.emit(exception_text)
-            logger.error(exception_text, exc_info=sys.exc_info())
-
+        self._perform(self._run)
+        if self._context.checkpoint is not None:
+            self._context.checkpoint.save()
         self.clear()
 
     def stop_process(self) -> None:
@@ -657,3 +1350,282 @@ class ReportGenerator(QObject):
 
         logger.info("User want to stop report generation")
         self.stop = True
+        if self._worker is not None:
+            self._worker.stop()
+
+
+class ReportSession(ReportGenerator):
+    """
+    Class keeps a report open while the board is being tested. The report for all pins of the board is generated once
+    by the method open. Then the method update takes new and updated pins: only their scores, rows of the table and
+    IV-curve images are computed again, and only their markers are redrawn on the images of the board, so the work of
+    an update depends on the number of changed pins rather than on the size of the board. The HTML files are assembled
+    from the rendered rows and are reloaded in the browser until the session is closed. The generation_finished
+    signal is emitted when the session is opened and closed, the report_updated signal is emitted after each update.
+    """
+
+    report_updated: pyqtSignal = pyqtSignal(str)
+
+    def __init__(self, parent=None, refresh_interval: int = _REFRESH_INTERVAL) -> None:
+        """
+        :param parent: parent object;
+        :param refresh_interval: interval in seconds after which the report is reloaded in the browser.
+        """
+
+        super().__init__(parent=parent)
+        self._is_open: bool = False
+        self._refresh_interval: int = refresh_interval
+
+    def _close(self) -> None:
+        """
+        Method generates the reports and exports the results for the last time.
+        """
+
+        context = self._context
+        context.general_info = None
+        context.progress = ProgressReporter(self.progress_changed.emit)
+        context.refresh_interval = None
+        self._run_steps({ReportGenerationSteps.EXPORT_RESULTS: self._export_results,
+                         ReportGenerationSteps.GENERATE_FULL_REPORT: self._generate_full_report,
+                         ReportGenerationSteps.GENERATE_MAP_REPORT: self._generate_report_with_map,
+                         ReportGenerationSteps.GENERATE_REPORT: self._generate_report})
+
+    def _get_changed_stage_pins(self, changed_pins_info: List[ut.PinInfo], faulty_pins: bool) -> List[ut.PinInfo]:
+        """
+        :param changed_pins_info: list with information about changed pins;
+        :param faulty_pins: if True, then faulty pins are required, otherwise other pins whose IV-curves are drawn.
+        :return: list with information about changed pins whose IV-curves are drawn at the stage.
+        """
+
+        stage_pins = {pin_info.total_pin_index for pin_info in self._get_stage_pins(faulty_pins)}
+        return [pin_info for pin_info in changed_pins_info if pin_info.total_pin_index in stage_pins]
+
+    def _get_total_pin_indices(self, pins: Iterable[Tuple[int, int]]) -> List[int]:
+        """
+        Method updates the index of the board and the list with information about pins after pins are added to the
+        board. Pins added not to the end of the board shift the total indices of the next pins, such pins are updated
+        as well.
+        :param pins: element and pin indices of the new and updated pins.
+        :return: sorted list with total indices of the pins to be updated.
+        """
+
+        context = self._context
+        index = context.board_index
+        pins_numbers = [len(element.pins) for element in context.board.elements]
+        if pins_numbers == np.diff(index.element_offsets).tolist():
+            total_pin_indices = set()
+        else:
+            index = BoardIndex(context.board, self._check_stop_operation)
+            if len(index) < len(context.pins_info):
+                raise ValueError("Pins cannot be removed from the board while the report is updated")
+
+            # The information about a pin is kept if the pin has the same total index
+            old_pins_info = context.pins_info
+            context.board_index = index
+            context.pins_info = [old_pins_info[total_pin_index] if total_pin_index < len(old_pins_info) and
+                                 old_pins_info[total_pin_index].measurements is pin.measurements else None
+                                 for total_pin_index, pin in enumerate(index.pins)]
+            total_pin_indices = {total_pin_index for total_pin_index, pin_info in enumerate(context.pins_info)
+                                 if pin_info is None}
+
+        for element_index, pin_index in pins:
+            if not 0 <= element_index < len(pins_numbers) or not 0 <= pin_index < pins_numbers[element_index]:
+                raise ValueError(f"There is no pin {pin_index} in the element {element_index}")
+            total_pin_indices.add(index.element_offsets[element_index] + pin_index)
+        index.update_pins(total_pin_indices)
+        return sorted(total_pin_indices)
+
+    def _open(self) -> None:
+        """
+        Method generates the report for all pins of the board.
+        """
+
+        context = self._context
+        if context.diff_with is not None:
+            raise ValueError("The report with changes cannot be updated")
+
+        context.required_board = True
+        context.refresh_interval = self._refresh_interval
+        context.resume = False
+        self._run()
+        if context.board_index is None:
+            raise ValueError("There is no board for the report")
+
+    def _patch_board_with_pins(self, changed_pins_info: List[ut.PinInfo], bad_pins: bool = False) -> bool:
+        """
+        Method redraws the markers of the changed pins on the image of the board with pins.
+        :param changed_pins_info: list with information about changed pins;
+        :param bad_pins: if True, then the image of the board with faulty pins will be updated.
+        :return: True if the image was updated.
+        """
+
+        context = self._context
+        self._check_stop_operation()
+        if bad_pins:
+            pins_name = "faulty pins"
+            board_file_name = _BOARD_WITH_BAD_PINS_IMAGE
+            pins = context.bad_pins_info
+        else:
+            pins_name = "pins"
+            board_file_name = _BOARD_WITH_PINS_IMAGE
+            pins = context.pins_info
+
+        self._start_step(f"Updating an image of a board with {pins_name}")
+        logger.info("Updating an image of a board with %s...", pins_name)
+
+        if context.board.image:
+            file_name = os.path.join(context.static_dir_name, _IMG_DIR_NAME, board_file_name)
+            self._render(RenderTasks.PATCH_BOARD_WITH_PINS, context.board.image, pins, changed_pins_info, file_name,
+                         ut.get_pin_diameter(context.board.image))
+            result = True
+            logger.info("The board image with %s is updated", pins_name)
+        else:
+            result = False
+            logger.info("The board image with %s is not updated: the board has no image", pins_name)
+
+        self._step_done()
+        return result
+
+    def _redraw_ivc(self, changed_pins_info: List[ut.PinInfo], faulty_pins: bool = False) -> bool:
+        """
+        Method draws and saves IV-curves for the changed pins.
+        :param changed_pins_info: list with information about changed pins;
+        :param faulty_pins: if True, then IV-curves of faulty pins will be drawn, otherwise IV-curves of other pins.
+        :return: True if images were drawn and saved.
+        """
+
+        context = self._context
+        pins_info = self._get_changed_stage_pins(changed_pins_info, faulty_pins)
+        pins_name = "faulty pins" if faulty_pins else "pins"
+        self._check_stop_operation()
+        self._start_step(f"Drawing and saving IV-curves of {pins_name}", len(pins_info))
+        logger.info("Drawing and saving IV-curves of %d %s...", len(pins_info), pins_name)
+
+        # The report contains all pins of the board, so user defined scales are given by total pin indices
+        user_defined_scales = context.user_defined_scales
+        if isinstance(user_defined_scales, (list, tuple)):
+            user_defined_scales = [user_defined_scales[pin_info.total_pin_index]
+                                   if pin_info.total_pin_index < len(user_defined_scales) else None
+                                   for pin_info in pins_info]
+        if pins_info:
+            self._render_ivc(pins_info, user_defined_scales, len(pins_info), self._step_done)
+        return bool(pins_info)
+
+    def _run_steps(self, methods: Dict[ReportGenerationSteps, Callable[[], Any]],
+                   steps_numbers: Optional[Dict[ReportGenerationSteps, int]] = None) -> None:
+        """
+        Method performs the stages of report generation that are required by the reports to generate.
+        :param methods: dictionary with methods that perform the stages;
+        :param steps_numbers: dictionary with numbers of steps at the stages that take more than one step.
+        """
+
+        context = self._context
+        steps = [step for step, _ in self._get_steps() if step in methods]
+        number_of_steps = sum((steps_numbers or {}).get(step, 1) for step in steps)
+        self.total_number_of_steps_calculated.emit(number_of_steps)
+        context.progress.set_total(number_of_steps)
+        for step in steps:
+            context.results_by_steps[step] = methods[step]()
+        context.progress.flush()
+
+    def _update(self, pins: Iterable[Tuple[int, int]]) -> None:
+        """
+        Method updates the report with the new and updated pins.
+        :param pins: element and pin indices of the new and updated pins.
+        """
+
+        context = self._context
+        context.progress = ProgressReporter(self.progress_changed.emit)
+        total_pin_indices = self._get_total_pin_indices(pins)
+        logger.info("Updating the report with %d pins...", len(total_pin_indices))
+
+        scores = self._get_pin_scores(total_pin_indices)
+        changed_pins_info = [self._create_pin_info(total_pin_index, score, pair_scores)
+                             for total_pin_index, (score, pair_scores) in zip(total_pin_indices, scores)]
+        for pin_info in changed_pins_info:
+            context.pins_info[pin_info.total_pin_index] = pin_info
+            context.pin_rows.pop(pin_info.total_pin_index, None)
+            if context.iv_svg_images is not None:
+                context.iv_svg_images["images"].pop(pin_info.total_pin_index, None)
+        context.bad_pins_info = self._get_faulty_pins()
+        context.iv_pins_info = self._get_iv_pins()
+        changed_pins = set(total_pin_indices)
+        context.omitted_pins_info = [pin_info for pin_info in context.omitted_pins_info
+                                     if pin_info.total_pin_index not in changed_pins]
+        context.general_info = None
+
+        # Drawing of IV-curves takes a step for each drawn pin
+        steps_numbers = {step: len(self._get_changed_stage_pins(changed_pins_info, faulty_pins))
+                         for step, faulty_pins in ((ReportGenerationSteps.DRAW_FAULTY_IVC, True),
+                                                   (ReportGenerationSteps.DRAW_IVC, False))}
+        self._run_steps({ReportGenerationSteps.DRAW_BOARD_WITH_BAD_PINS:
+                         (lambda: self._patch_board_with_pins(changed_pins_info, True)),
+                         ReportGenerationSteps.DRAW_BOARD_WITH_PINS:
+                         (lambda: self._patch_board_with_pins(changed_pins_info, False)),
+                         ReportGenerationSteps.DRAW_FAULT_HISTOGRAM: self._draw_fault_histogram,
+                         ReportGenerationSteps.DRAW_FAULTY_IVC: (lambda: self._redraw_ivc(changed_pins_info, True)),
+                         ReportGenerationSteps.DRAW_IVC: (lambda: self._redraw_ivc(changed_pins_info)),
+                         ReportGenerationSteps.GENERATE_FULL_REPORT: self._generate_full_report,
+                         ReportGenerationSteps.GENERATE_MAP_REPORT: self._generate_report_with_map,
+                         ReportGenerationSteps.GENERATE_REPORT: self._generate_report}, steps_numbers)
+        logger.info("The report is updated")
+
+    def close(self) -> None:
+        """
+        Method generates the final reports without reloading in the browser, exports the results and closes the
+        session.
+        """
+
+        if not self._is_open:
+            return
+
+        logger.info("Close the report session")
+        self._is_open = False
+        if self._perform(self._close):
+            self.generation_finished.emit(self._context.dir_name)
+        self.clear()
+
+    @property
+    def is_open(self) -> bool:
+        """
+        :return: True if the session is open and the report can be updated.
+        """
+
+        return self._is_open
+
+    def open(self, config: Dict[ConfigAttributes, Any]) -> bool:
+        """
+        Method generates the report for all pins of the board and opens the session. The objects for the report given
+        in the config are ignored. The report type (for a test board or for a reference board) is determined when the
+        session is opened, so it is better to set ConfigAttributes.IS_REPORT_FOR_TEST_BOARD if the board has no test
+        measurements yet.
+        :param config: dictionary with full information about required report.
+        :return: True if the session is opened.
+        """
+
+        self.close()
+        logger.info("Open the report session")
+        self._read_config(config)
+        self._is_open = self._perform(self._open)
+        if not self._is_open:
+            self.clear()
+        return self._is_open
+
+    def update(self, pins: Iterable[Tuple[int, int]]) -> bool:
+        """
+        Method updates the report with the new and updated pins of the board. New pins and elements should be added to
+        the board of the session before the update, pins cannot be removed.
+        :param pins: element and pin indices of the new and updated pins.
+        :return: True if the report is updated. If the update failed or was stopped, the session is closed.
+        """
+
+        if not self._is_open:
+            logger.warning("The report cannot be updated: the session is not open")
+            return False
+
+        self._is_open = self._perform(lambda: self._update(pins))
+        if self._is_open:
+            self.report_updated.emit(self._context.dir_name)
+        else:
+            self.clear()
+        return self._is_open
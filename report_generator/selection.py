@@ -0,0 +1,131 @@
+"""
+File with class to select pins for the report by their properties.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from epcore.elements import Board, Pin
+from report_generator.boardindex import BoardIndex
+from report_generator.definitions import PinInfo, PinTypes
+
+
+class PinQuery:
+    """
+    Class with conditions for selecting pins for the report. The pin is selected if it satisfies all the given
+    conditions. Conditions on the element name, the position and the measurement settings are evaluated against the
+    board index before the pins are compared, conditions on the score and the pin type are evaluated after that.
+    """
+
+    def __init__(self, element_name: Optional[str] = None,
+                 score_range: Optional[Tuple[Optional[float], Optional[float]]] = None,
+                 pin_types: Optional[Iterable[PinTypes]] = None,
+                 rectangle: Optional[Tuple[float, float, float, float]] = None,
+                 settings: Optional[Dict[str, Any]] = None) -> None:
+        """
+        :param element_name: pattern for the element name in Unix shell style, for example "R*" or "C1?";
+        :param score_range: minimum and maximum score in relative units (0 - minimum value, 1 - maximum) like
+        ConfigAttributes.TOLERANCE. Any of the bounds may be None;
+        :param pin_types: types of pins to be selected;
+        :param rectangle: x_min, y_min, x_max and y_max of the area on the board image in which the pins should be;
+        :param settings: dictionary with values of the measurement settings, for example
+        {"probe_signal_frequency": 100}. Instead of a value a function that takes the value of the setting and returns
+        True or False can be given. Pins without measurements do not satisfy this condition.
+        """
+
+        self.element_name: Optional[str] = element_name
+        self.pin_types: Optional[frozenset] = None if pin_types is None else frozenset(pin_types)
+        self.rectangle: Optional[Tuple[float, float, float, float]] = rectangle
+        self.score_range: Optional[Tuple[Optional[float], Optional[float]]] = score_range
+        self.settings: Optional[Dict[str, Any]] = settings
+
+    def _check_settings(self, pin: Pin) -> bool:
+        """
+        :param pin: pin.
+        :return: True if the settings of the first measurement of the pin satisfy the condition.
+        """
+
+        if not pin.measurements:
+            return False
+
+        settings = pin.measurements[0].settings
+        for name, required_value in self.settings.items():
+            value = getattr(settings, name, None)
+            if callable(required_value):
+                if not required_value(value):
+                    return False
+            elif value != required_value:
+                return False
+        return True
+
+    def get_mask(self, index: BoardIndex) -> np.ndarray:
+        """
+        :param index: board index.
+        :return: boolean array with a value for each pin of the board, the value is True if the pin satisfies the
+        conditions that do not depend on the comparison of measurements.
+        """
+
+        mask = np.ones(len(index), dtype=bool)
+        if self.element_name is not None:
+            element_mask = np.array([fnmatchcase(element.name or "", self.element_name)
+                                     for element in index.board.elements], dtype=bool)
+            mask &= index.expand_element_mask(element_mask)
+
+        if self.rectangle is not None:
+            x_min, y_min, x_max, y_max = self.rectangle
+            x, y = index.get_coordinates()
+            mask &= (x_min <= x) & (x <= x_max) & (y_min <= y) & (y <= y_max)
+
+        if self.settings:
+            for total_pin_index in np.flatnonzero(mask):
+                mask[total_pin_index] = self._check_settings(index.pins[total_pin_index])
+        return mask
+
+    def match_result(self, pin_info: PinInfo) -> bool:
+        """
+        :param pin_info: information about the pin with the score and the pin type.
+        :return: True if the pin satisfies the conditions on the score and the pin type.
+        """
+
+        if self.pin_types is not None and pin_info.pin_type not in self.pin_types:
+            return False
+
+        if self.score_range is not None:
+            if pin_info.score is None:
+                return False
+            # The score of the pin is in %
+            score_min, score_max = self.score_range
+            if score_min is not None and pin_info.score < 100 * score_min:
+                return False
+            if score_max is not None and pin_info.score > 100 * score_max:
+                return False
+        return True
+
+
+def get_queries(queries: Any) -> List[PinQuery]:
+    """
+    :param queries: query or list of queries.
+    :return: list of queries.
+    """
+
+    if queries is None:
+        return []
+    if isinstance(queries, PinQuery):
+        return [queries]
+    return list(queries)
+
+
+def select_pins(board: Board, queries: Any) -> List[int]:
+    """
+    Function selects pins of the board that satisfy at least one of the queries. Conditions on the score and the pin
+    type are not taken into account, because the pins are not compared.
+    :param board: board;
+    :param queries: query or list of queries.
+    :return: sorted list with total indices of the selected pins.
+    """
+
+    index = BoardIndex(board)
+    mask = np.zeros(len(index), dtype=bool)
+    for query in get_queries(queries):
+        mask |= query.get_mask(index)
+    return np.flatnonzero(mask).tolist()
@@ -0,0 +1,299 @@
+"""
+File with functions to draw IV-curves in SVG format without Qt.
+"""
+
+import logging
+import math
+import os
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+from xml.sax.saxutils import escape
+import numpy as np
+from report_generator import utils as ut
+from report_generator.curves import decimate_curve, get_curve_pairs, get_scales, join_curve_pairs
+from report_generator.definitions import ImageFormats, PinInfo, ScalingTypes
+from report_generator.translation import get_translation
+
+
+logger = logging.getLogger("report_generator")
+_AREA_BOTTOM: int = 165
+_AREA_LEFT: int = 45
+_AREA_RIGHT: int = 292
+_AREA_TOP: int = 22
+_CLIP_PATH_ID: str = "iv_plot_area"
+_HEIGHT: int = 200
+_REFERENCE_CURVE_STYLE: Tuple[str, int] = "#00f", 2
+_TEST_CURVE_STYLE: Tuple[str, int] = "#f00", 4
+_WIDTH: int = 300
+
+
+class _Signal(Protocol):
+    """
+    Object with the emit method, for example, the step_done signal of the generator or its replacement in the worker
+    process. The module does not depend on Qt.
+    """
+
+    def emit(self) -> None:
+        ...
+
+
+def _format_number(value: float) -> str:
+    """
+    :param value: number.
+    :return: short representation of the number for the axis label.
+    """
+
+    return f"{round(value, 10):g}"
+
+
+def _get_ticks(max_value: float) -> List[float]:
+    """
+    :param max_value: scale of the axis, the axis shows the range from -max_value to max_value.
+    :return: values of the axis ticks with a step of 1, 2 or 5 multiplied by a power of 10.
+    """
+
+    if not max_value > 0 or not math.isfinite(max_value):
+        return [0]
+
+    raw_step = max_value / 2.5
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(multiplier * magnitude for multiplier in (1, 2, 5, 10) if multiplier * magnitude >= raw_step)
+    ticks_number = int(max_value / step + 1e-9)
+    return [index * step for index in range(-ticks_number, ticks_number + 1)]
+
+
+def _to_x(voltages: np.ndarray, v_max: float) -> np.ndarray:
+    """
+    :param voltages: voltages in V;
+    :param v_max: scale of the voltage axis in V.
+    :return: x coordinates on the image.
+    """
+
+    return _AREA_LEFT + (np.asarray(voltages) + v_max) * ((_AREA_RIGHT - _AREA_LEFT) / (2 * v_max))
+
+
+def _to_y(currents: np.ndarray, i_max: float) -> np.ndarray:
+    """
+    :param currents: currents in mA;
+    :param i_max: scale of the current axis in mA.
+    :return: y coordinates on the image.
+    """
+
+    return _AREA_TOP + (i_max - np.asarray(currents)) * ((_AREA_BOTTOM - _AREA_TOP) / (2 * i_max))
+
+
+class SvgRenderer:
+    """
+    Class to draw IV-curves in SVG format. Axes, grid and legend of the graph depend only on the scales and on the set
+    of curves, so they are created once for each such combination and are shared by all images of the report with
+    inline images.
+    """
+
+    def __init__(self, _: Callable[[str], str] = get_translation(False), inline: bool = False,
+                 inline_height: Optional[int] = None) -> None:
+        """
+        :param _: function to translate strings;
+        :param inline: if True, elements to be inlined into the report are created for images;
+        :param inline_height: height of the images inlined into the report.
+        """
+
+        self._axes: List[str] = []
+        self._axes_ids: Dict[Tuple[float, float, bool, bool], str] = dict()
+        self._inline: bool = inline
+        self._inline_height: Optional[int] = inline_height
+        titles = "Напряжение, В", "Ток, мА", "Тест", "Эталон"
+        self._titles: Tuple[str, str, str, str] = tuple(escape(_(title)) for title in titles)
+
+    def _create_axes(self, v_max: float, i_max: float, has_test: bool, has_ref: bool) -> str:
+        """
+        :param v_max: scale of the voltage axis in V;
+        :param i_max: scale of the current axis in mA;
+        :param has_test: if True, the test curve is shown in the legend;
+        :param has_ref: if True, the reference curve is shown in the legend.
+        :return: SVG elements with the background, grid, axes, labels and legend.
+        """
+
+        x_title, y_title, test_title, ref_title = self._titles
+        x_ticks = _get_ticks(v_max)
+        y_ticks = _get_ticks(i_max)
+        xs = _to_x(x_ticks, v_max)
+        ys = _to_y(y_ticks, i_max)
+        grid = "".join(f"M{x:.1f} {_AREA_TOP}V{_AREA_BOTTOM}" for x in xs) + \
+            "".join(f"M{_AREA_LEFT} {y:.1f}H{_AREA_RIGHT}" for y in ys)
+        x_zero = _to_x(0, v_max)
+        y_zero = _to_y(0, i_max)
+        elements = [f'<rect x="{_AREA_LEFT}" y="{_AREA_TOP}" width="{_AREA_RIGHT - _AREA_LEFT}" '
+                    f'height="{_AREA_BOTTOM - _AREA_TOP}" fill="#fff" stroke="#000"/>',
+                    f'<path d="{grid}" stroke="#ccc" stroke-dasharray="2,2" fill="none"/>',
+                    f'<path d="M{_AREA_LEFT} {y_zero:.1f}H{_AREA_RIGHT}M{x_zero:.1f} {_AREA_TOP}V{_AREA_BOTTOM}" '
+                    f'stroke="#000" fill="none"/>',
+                    '<g font-size="9" text-anchor="middle">']
+        elements.extend(f'<text x="{x:.1f}" y="{_AREA_BOTTOM + 11}">{_format_number(tick)}</text>'
+                        for x, tick in zip(xs, x_ticks))
+        elements.append("</g>")
+        elements.append('<g font-size="9" text-anchor="end">')
+        elements.extend(f'<text x="{_AREA_LEFT - 3}" y="{y + 3:.1f}">{_format_number(tick)}</text>'
+                        for y, tick in zip(ys, y_ticks))
+        elements.append("</g>")
+        elements.append(f'<text x="{(_AREA_LEFT + _AREA_RIGHT) / 2:.1f}" y="{_HEIGHT - 6}" font-size="12" '
+                        f'text-anchor="middle">{x_title}</text>')
+        elements.append(f'<text transform="translate(12 {(_AREA_TOP + _AREA_BOTTOM) / 2:.1f}) rotate(-90)" '
+                        f'font-size="12" text-anchor="middle">{y_title}</text>')
+        legend_x = _AREA_LEFT
+        for title, style, shown in ((test_title, _TEST_CURVE_STYLE, has_test),
+                                    (ref_title, _REFERENCE_CURVE_STYLE, has_ref)):
+            if shown:
+                elements.append(f'<path d="M{legend_x} 11h12" stroke="{style[0]}" stroke-width="3"/>'
+                                f'<text x="{legend_x + 16}" y="15" font-size="11">{title}</text>')
+                legend_x += (_AREA_RIGHT - _AREA_LEFT) // 2
+        return '<g font-family="Times,serif">' + "".join(elements) + "</g>"
+
+    @staticmethod
+    def _create_curve(voltages: np.ndarray, currents: np.ndarray, v_max: float, i_max: float,
+                      style: Tuple[str, int]) -> str:
+        """
+        :param voltages: voltages of the IV-curve in V;
+        :param currents: currents of the IV-curve in A;
+        :param v_max: scale of the voltage axis in V;
+        :param i_max: scale of the current axis in mA;
+        :param style: color and width of the curve.
+        :return: SVG element with the closed curve.
+        """
+
+        voltages, currents = decimate_curve(voltages, currents, v_max, i_max, _AREA_RIGHT - _AREA_LEFT,
+                                            _AREA_BOTTOM - _AREA_TOP)
+        xs = _to_x(voltages, v_max).tolist()
+        ys = _to_y(1000 * currents, i_max).tolist()
+        points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+        color, width = style
+        return f'<polygon points="{points}" fill="none" stroke="{color}" stroke-width="{width}" ' \
+               f'stroke-linejoin="round"/>'
+
+    def _get_axes_id(self, v_max: float, i_max: float, has_test: bool, has_ref: bool) -> str:
+        """
+        :param v_max: scale of the voltage axis in V;
+        :param i_max: scale of the current axis in mA;
+        :param has_test: if True, the test curve is shown in the legend;
+        :param has_ref: if True, the reference curve is shown in the legend.
+        :return: identifier of the shared axes. The axes are created if necessary.
+        """
+
+        key = float(v_max), float(i_max), has_test, has_ref
+        axes_id = self._axes_ids.get(key)
+        if axes_id is None:
+            axes_id = f"iv_axes_{len(self._axes_ids)}"
+            self._axes_ids[key] = axes_id
+            self._axes.append(f'<g id="{axes_id}">{self._create_axes(*key)}</g>')
+        return axes_id
+
+    def create_image(self, pin_info: PinInfo, index: int, scaling_type: ScalingTypes, user_defined_scales: list
+                     ) -> Tuple[str, Optional[str]]:
+        """
+        :param pin_info: information about pin for which to draw IV-curves;
+        :param index: pin index;
+        :param scaling_type: type of scaling for a graph with IV-curve;
+        :param user_defined_scales: list with user defined scales.
+        :return: SVG document with the image and SVG element to be inlined into the report. The element is None if
+        images are not inlined.
+        """
+
+        pairs = get_curve_pairs(pin_info)
+        v_max, i_max = get_scales(pin_info, index, scaling_type, user_defined_scales, join_curve_pairs(pairs))
+        has_ref = any(len(ref_voltages) and len(ref_currents) for ref_voltages, ref_currents, _, _ in pairs)
+        has_test = any(len(test_voltages) and len(test_currents) for _, _, test_voltages, test_currents in pairs)
+        # The reference curves are drawn over the test curves as in the raster images
+        curves = []
+        for _, _, test_voltages, test_currents in pairs:
+            if len(test_voltages) and len(test_currents):
+                curves.append(self._create_curve(test_voltages, test_currents, v_max, i_max, _TEST_CURVE_STYLE))
+        for ref_voltages, ref_currents, _, _ in pairs:
+            if len(ref_voltages) and len(ref_currents):
+                curves.append(self._create_curve(ref_voltages, ref_currents, v_max, i_max, _REFERENCE_CURVE_STYLE))
+        curves = f'<g clip-path="url(#{_CLIP_PATH_ID})">{"".join(curves)}</g>'
+
+        document = f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {_WIDTH} {_HEIGHT}" width="{_WIDTH}" ' \
+                   f'height="{_HEIGHT}"><defs>{self._get_clip_path()}</defs>' \
+                   f"{self._create_axes(v_max, i_max, has_test, has_ref)}{curves}</svg>"
+        element = None
+        if self._inline:
+            axes_id = self._get_axes_id(v_max, i_max, has_test, has_ref)
+            size = f'width="{_WIDTH}"' if self._inline_height is None else f'height="{self._inline_height}"'
+            element = f'<svg viewBox="0 0 {_WIDTH} {_HEIGHT}" {size} role="img"><use href="#{axes_id}"/>{curves}</svg>'
+        return document, element
+
+    @staticmethod
+    def _get_clip_path() -> str:
+        """
+        :return: SVG element with the clip path for curves.
+        """
+
+        return f'<clipPath id="{_CLIP_PATH_ID}"><rect x="{_AREA_LEFT}" y="{_AREA_TOP}" ' \
+               f'width="{_AREA_RIGHT - _AREA_LEFT}" height="{_AREA_BOTTOM - _AREA_TOP}"/></clipPath>'
+
+    def get_definitions(self) -> str:
+        """
+        :return: hidden SVG element with the shared axes for inline images. It should be inserted into the report
+        once.
+        """
+
+        return f'<svg width="0" height="0" style="position:absolute"><defs>{self._get_clip_path()}' \
+               f'{"".join(self._axes)}</defs></svg>'
+
+
+@ut.write_time("DRAW IVC SVG FOR PINS")
+def draw_ivc_svg_for_pins(pins_info: List[PinInfo], dir_name: str, signal: _Signal,
+                          scaling_type: ScalingTypes = ScalingTypes.AUTO, user_defined_scales: list = None,
+                          check_stop: Callable[[], None] = lambda: None,
+                          _: Callable[[str], str] = get_translation(False),
+                          image_format: ImageFormats = ImageFormats.SVG,
+                          inline_height: Optional[int] = None, deadline: Optional[float] = None,
+                          required_number: int = 0, renderer: Optional[SvgRenderer] = None
+                          ) -> Optional[Dict[str, object]]:
+    """
+    Function draws and saves the IV-curves for the pins in SVG format.
+    :param pins_info: list with information about pins for which to draw IV-curves;
+    :param dir_name: name of directory where images should be saved;
+    :param signal: signal;
+    :param scaling_type: type of scaling for a graph with IV-curve;
+    :param user_defined_scales: list with user defined scales;
+    :param check_stop: function that checks whether the operation is stopped;
+    :param _: function to translate strings;
+    :param image_format: ImageFormats.SVG or ImageFormats.INLINE_SVG;
+    :param inline_height: height of the images inlined into the report;
+    :param deadline: time (as returned by time.time()) after which IV-curves are not drawn. The signal is not emitted
+    for the pins that are not drawn;
+    :param required_number: number of the first pins that are drawn regardless of the deadline;
+    :param renderer: renderer whose shared axes are used for the images. It is given if images of the report are drawn
+    in parts, otherwise a new renderer is created.
+    :return: dictionary with shared definitions and images to be inlined into the report (by total pin indices) if
+    the images should be inlined. The definitions include the axes of all images drawn by the renderer.
+    """
+
+    inline = image_format == ImageFormats.INLINE_SVG
+    if renderer is None:
+        renderer = SvgRenderer(_, inline, inline_height)
+    images = dict()
+    pins_number = len(pins_info)
+    for index, pin_info in enumerate(pins_info):
+        check_stop()
+        if index >= required_number and ut.is_time_limit_reached(deadline):
+            logger.info("The time limit is reached, IV-curves of %d pins are not drawn", len(pins_info) - index)
+            pins_number = index
+            break
+
+        if not pin_info.measurements:
+            signal.emit()
+            continue
+
+        document, element = renderer.create_image(pin_info, index, scaling_type, user_defined_scales)
+        file_name = os.path.join(dir_name, ut.get_iv_image_name(pin_info, image_format))
+        with open(file_name, "w", encoding="utf-8") as file:
+            file.write(document)
+        if element is not None:
+            images[pin_info.total_pin_index] = element
+        signal.emit()
+
+    logger.info("IV-curves of %d pins are saved in SVG format", pins_number)
+    if inline:
+        return {"definitions": renderer.get_definitions(),
+                "images": images}
+    return None
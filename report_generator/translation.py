@@ -2,21 +2,57 @@ import builtins
 import gettext
 import logging
 import os
+import threading
+from typing import Callable, Dict
 
 
 logger = logging.getLogger("report_generator")
+_LOCK: threading.Lock = threading.Lock()
+_TRANSLATIONS: Dict[bool, gettext.NullTranslations] = {}
+
+
+def _get_catalogue(english: bool) -> gettext.NullTranslations:
+    """
+    :param english: if True, then the English catalogue is returned.
+    :return: translation catalogue. The catalogue is loaded from the locales directory only once, then it is taken from
+    the cache.
+    """
+
+    with _LOCK:
+        catalogue = _TRANSLATIONS.get(english)
+        if catalogue is None:
+            if english:
+                dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+                catalogue = gettext.translation("translation", localedir=dir_path, languages=["en"])
+                logger.info("English translation loaded")
+            else:
+                # Russian is the language of the source strings
+                catalogue = gettext.NullTranslations()
+            _TRANSLATIONS[english] = catalogue
+    return catalogue
+
+
+def get_translation(english: bool) -> Callable[[str], str]:
+    """
+    :param english: if True, then the function for English translation is returned.
+    :return: function that translates a string. The function does not depend on global state, so reports in different
+    languages can be generated at the same time.
+    """
+
+    return _get_catalogue(english).gettext
 
 
 def install_translation(english: bool) -> None:
     """
+    Function installs the translation into builtins._. The report generator passes translation explicitly and installs
+    it only for compatibility with applications that use builtins._, so the language of the last started report is
+    installed.
     :param english: if True, then the English translation is set.
     """
 
-    dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
     if english:
-        en = gettext.translation("translation", localedir=dir_path, languages=["en"])
-        en.install()
+        _get_catalogue(english).install()
         logger.info("English translation installed")
     else:
-        builtins._ = lambda string: string
+        builtins._ = get_translation(english)
         logger.info("Russian translation installed")
@@ -0,0 +1,51 @@
+"""
+File with functions to load boards from UFIV files with compact IV-curves.
+"""
+
+import logging
+import os
+from typing import Callable
+import numpy as np
+from PIL import Image
+from epcore.elements import Board, Element
+from epcore.filemanager import load_board_from_ufiv as load_board
+
+
+logger = logging.getLogger("report_generator")
+_IMAGE_FILE: str = "image.png"
+
+
+def _compact_element(element: Element) -> None:
+    """
+    Function replaces lists with IV-curves of the element by arrays. An array takes several times less memory than
+    a list of floats.
+    :param element: element.
+    """
+
+    for pin in element.pins:
+        for measurement in pin.measurements:
+            measurement.ivc.currents = np.asarray(measurement.ivc.currents, dtype=float)
+            measurement.ivc.voltages = np.asarray(measurement.ivc.voltages, dtype=float)
+
+
+def load_board_from_ufiv(file_name: str, check_stop: Callable[[], None] = lambda: None) -> Board:
+    """
+    Function loads the board from the UFIV file with the loader of epcore, so the file is checked and converted in the
+    same way. Then IV-curves of the board are converted to arrays, so the board takes less memory while the report is
+    generated. If the loader has not read the image of the board, it is taken from the file image.png in the same
+    directory.
+    :param file_name: name of the UFIV file (elements.json);
+    :param check_stop: function that checks whether the operation is stopped.
+    :return: board.
+    """
+
+    board = load_board(file_name)
+    for element in board.elements:
+        check_stop()
+        _compact_element(element)
+
+    image_file_name = os.path.join(os.path.dirname(os.path.abspath(file_name)), _IMAGE_FILE)
+    if board.image is None and os.path.isfile(image_file_name):
+        board.image = Image.open(image_file_name)
+    logger.info("The board with %d elements is read from '%s'", len(board.elements), file_name)
+    return board
@@ -7,20 +7,79 @@ import logging
 import os
 import time
 from datetime import datetime, timedelta
-from typing import Any, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
 from mako.lookup import TemplateLookup
 from PIL.Image import Image
-from epcore.elements import Pin
-from report_generator.definitions import PIN_COLORS, PinInfo, PinTypes
+from epcore.elements import IVCurve, MeasurementSettings, Pin
+from epcore.measurementmanager import IVCComparator
+from report_generator.curves import get_measurement_pairs
+from report_generator.definitions import ImageFormats, PIN_COLORS, PinInfo, PinTypes
+from report_generator.logger import get_pin_logging_level
+from report_generator.translation import get_translation
 
 
 logger = logging.getLogger("report_generator")
+# IV-curves that differ by less than this fraction of the noise amplitudes have the score less than 0.05%, which is
+# rounded to zero
+_PREFILTER_TOLERANCE: float = 0.0005
+_TEMPLATE_FILE_WITH_FUNCTIONS: str = "functions.mako"
 
 
-def write_time(process_name: str):
+def _get_compared_measurements(pin: Pin) -> List[Tuple[Any, Any]]:
+    """
+    :param pin: pin.
+    :return: list with pairs of measurements of the pin to be compared. Measurements without a pair are paired with
+    None.
+    """
+
+    if len(pin.measurements) == 2:
+        return [tuple(pin.measurements)]
+    if len(pin.measurements) > 2:
+        return get_measurement_pairs(pin.measurements)
+    return []
+
+
+def _get_noise_amplitudes(settings: MeasurementSettings) -> Tuple[float, float]:
+    """
+    :param settings: measurement settings.
+    :return: voltage and current noise amplitudes for the measurement with given settings.
+    """
+
+    return settings.max_voltage / 20, 1000.0 * settings.max_voltage / (20 * settings.internal_resistance)
+
+
+def _is_near_identical(first_ivc: IVCurve, second_ivc: IVCurve, noise_amplitudes: Tuple[float, float],
+                       tolerance: float = _PREFILTER_TOLERANCE) -> bool:
+    """
+    :param first_ivc: first IV-curve;
+    :param second_ivc: second IV-curve;
+    :param noise_amplitudes: voltage and current noise amplitudes;
+    :param tolerance: maximum difference of voltages and currents at each point as a fraction of the noise amplitudes.
+    :return: True if the IV-curves have the same number of points and differ by not more than the given fraction of
+    the noise amplitudes. Identical IV-curves always pass.
+    """
+
+    first_voltages = np.asarray(first_ivc.voltages, dtype=float)
+    second_voltages = np.asarray(second_ivc.voltages, dtype=float)
+    first_currents = np.asarray(first_ivc.currents, dtype=float)
+    second_currents = np.asarray(second_ivc.currents, dtype=float)
+    if first_voltages.shape != second_voltages.shape or first_currents.shape != second_currents.shape or \
+            not len(first_voltages):
+        return False
+
+    voltage_noise, current_noise = noise_amplitudes
+    return bool(np.amax(np.absolute(first_voltages - second_voltages)) <= tolerance * voltage_noise and
+                np.amax(np.absolute(first_currents - second_currents)) <= tolerance * current_noise)
+
+
+def write_time(process_name: str, per_pin: bool = False):
     """
     A decorator that measures the execution time of the decorated operation and outputs it to the log.
-    :param process_name: name of the operation whose execution time needs to be measured.
+    :param process_name: name of the operation whose execution time needs to be measured;
+    :param per_pin: if True, the operation is performed for each pin and the time is logged with the logging level of
+    messages about separate pins. The time is not measured if such messages are not logged.
     """
 
     def decorator(func):
@@ -29,9 +88,14 @@ def write_time(process_name: str):
         """
 
         def wrapper(*args, **kwargs) -> Any:
+            level = get_pin_logging_level() if per_pin else logging.INFO
+            if not logger.isEnabledFor(level):
+                return func(*args, **kwargs)
+
             start_time = time.time()
             result = func(*args, **kwargs)
-            logger.info("[TIME_SPENT] Time spent on the process '%s': %f sec", process_name, time.time() - start_time)
+            logger.log(level, "[TIME_SPENT] Time spent on the process '%s': %f sec", process_name,
+                       time.time() - start_time)
             return result
 
         return wrapper
@@ -79,8 +143,7 @@ def generate_report(template_dir: str, template_file: str, report_file: str, **k
     :param kwargs: arguments for template.
     """
 
-    template_lookup = TemplateLookup(directories=[template_dir])
-    template = template_lookup.get_template(template_file)
+    template = get_template_lookup(template_dir).get_template(template_file)
     with open(report_file, "w", encoding="utf-8") as file:
         kwargs["PIN_COLORS"] = convert_dict_to_json(PIN_COLORS)
         file.write(template.render(**kwargs))
@@ -94,10 +157,11 @@ def get_default_dir_path() -> str:
     return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
-def get_duration_in_str(duration: timedelta) -> Optional[str]:
+def get_duration_in_str(duration: timedelta, _: Callable[[str], str] = get_translation(False)) -> Optional[str]:
     """
     Function returns duration in min and sec.
-    :param duration: duration.
+    :param duration: duration;
+    :param _: function to translate strings.
     :return: duration in min and sec.
     """
 
@@ -117,6 +181,26 @@ def get_elements_number(pins_info: List[PinInfo]) -> int:
     return len({pin_info.element_index for pin_info in pins_info})
 
 
+def get_iv_image_extension(image_format: ImageFormats = ImageFormats.PNG) -> str:
+    """
+    :param image_format: format of images with IV-curves.
+    :return: extension of files with images of IV-curves. Inline SVG images are also saved to files for the report
+    with board map.
+    """
+
+    return "png" if image_format == ImageFormats.PNG else "svg"
+
+
+def get_iv_image_name(pin_info: PinInfo, image_format: ImageFormats = ImageFormats.PNG) -> str:
+    """
+    :param pin_info: information about pin;
+    :param image_format: format of images with IV-curves.
+    :return: name of the file with image of IV-curves for the pin.
+    """
+
+    return f"{pin_info.element_index}_{pin_info.pin_index}_iv.{get_iv_image_extension(image_format)}"
+
+
 def get_noise_amplitudes(pin: Pin) -> Tuple[float, float]:
     """
     Function calculates noise amplitudes for given pin.
@@ -127,8 +211,7 @@ def get_noise_amplitudes(pin: Pin) -> Tuple[float, float]:
     default_voltage_noise_amplitude = 0.6
     default_current_noise_amplitude = 0.2
     if pin.measurements:
-        settings = pin.measurements[0].settings
-        return settings.max_voltage / 20, 1000.0 * settings.max_voltage / (20 * settings.internal_resistance)
+        return _get_noise_amplitudes(pin.measurements[0].settings)
     return default_voltage_noise_amplitude, default_current_noise_amplitude
 
 
@@ -141,6 +224,133 @@ def get_pin_diameter(image: Image) -> Optional[int]:
     return image.width // 38 if image else None
 
 
+def get_pin_row_labels(_: Callable[[str], str] = get_translation(False)) -> Dict[str, str]:
+    """
+    :param _: function to translate strings.
+    :return: dictionary with translated labels for rows of the table with pins.
+    """
+
+    return {"channel_number": _("Номер канала"),
+            "element_index": _("Индекс компонента"),
+            "element_name": _("Название компонента"),
+            "frequency": _("Частота"),
+            "hertz": _("Гц"),
+            "internal_resistance": _("Внутреннее сопротивление"),
+            "ivc_image": _("Сигнатуры в точке тестирования"),
+            "measurement_comment": _("Комментарий к измерению"),
+            "module_number": _("Номер модуля"),
+            "multiplexer_output": _("Выход мультиплексора"),
+            "no_ivc": _("Сигнатур нет"),
+            "omitted_ivc": _("Сигнатуры не нарисованы из-за ограничения времени"),
+            "ohms": _("Ом"),
+            "pin_comment": _("Комментарий к пину"),
+            "pin_index": _("Индекс точки"),
+            "pixels": _("пк"),
+            "score": _("Различие"),
+            "scores": _("Различие по измерениям"),
+            "settings": _("Параметры измерения"),
+            "voltage": _("Напряжение"),
+            "volts": _("В")}
+
+
+def get_pin_row_values(pin_info: PinInfo, image_format: ImageFormats = ImageFormats.PNG) -> Dict[str, Any]:
+    """
+    :param pin_info: information about pin;
+    :param image_format: format of images with IV-curves.
+    :return: dictionary with formatted values to be displayed in the row of the table with pins.
+    """
+
+    settings = None
+    measurement_comment = None
+    if pin_info.measurements:
+        measurement_settings = pin_info.measurements[0].settings
+        settings = (round(measurement_settings.probe_signal_frequency, 2), round(measurement_settings.max_voltage, 2),
+                    round(measurement_settings.internal_resistance, 2))
+        measurement_comment = "<br>".join(measurement.comment for measurement in pin_info.measurements
+                                          if measurement.comment)
+    scores = None
+    if pin_info.scores is not None:
+        scores = [None if score is None else round(score, 1) for score in pin_info.scores]
+    return {"image": get_iv_image_name(pin_info, image_format),
+            "measurement_comment": measurement_comment,
+            "score": None if pin_info.score is None else round(pin_info.score, 1),
+            "scores": scores,
+            "settings": settings,
+            "x": round(pin_info.x, 2),
+            "y": round(pin_info.y, 2)}
+
+
+def get_pin_scores(pins: List[Pin], noise_amplitudes: Optional[List[Optional[Tuple[float, float]]]] = None,
+                   check_stop: Callable[[], None] = lambda: None,
+                   prefilter: bool = True, validate_prefilter: bool = False,
+                   pin_indices: Optional[List[Tuple[int, int]]] = None
+                   ) -> List[Tuple[Optional[float], Optional[List[Optional[float]]]]]:
+    """
+    Function calculates scores of pins. If a pin has two measurements, they are compared with each other. If a pin has
+    more measurements, each test measurement is compared with the matching reference measurement, and the score of
+    the pin is the maximum score of the pairs. Identical and near-identical IV-curves get zero score without the
+    comparator. Other comparisons of all pins are grouped by noise amplitudes, so the comparator is set up once for
+    each group.
+    :param pins: list of pins;
+    :param noise_amplitudes: list with voltage and current noise amplitudes for pins. If they are not given for a pin,
+    they are calculated from the settings of the compared measurements;
+    :param check_stop: function that checks whether the operation is stopped;
+    :param prefilter: if True, identical and near-identical IV-curves are not compared by the comparator;
+    :param validate_prefilter: if True, IV-curves settled by the pre-filter are also compared by the comparator, and
+    mismatches are written to the log. The scores of the comparator are used;
+    :param pin_indices: list with element and pin indices of the pins for the log.
+    :return: list with the score of the pin in % (or None) and the list with scores of pairs of measurements (or None
+    if the pin has not more than one pair).
+    """
+
+    comparisons = dict()
+    pair_scores = []
+    prefiltered_number = 0
+    for pin_index, pin in enumerate(pins):
+        pairs = _get_compared_measurements(pin)
+        pair_scores.append([None] * len(pairs))
+        pin_noise_amplitudes = noise_amplitudes[pin_index] if isinstance(noise_amplitudes, (list, tuple)) and \
+            pin_index < len(noise_amplitudes) else None
+        for pair_index, (first, second) in enumerate(pairs):
+            if first is None or second is None:
+                continue
+            if isinstance(pin_noise_amplitudes, (list, tuple)) and len(pin_noise_amplitudes) == 2:
+                key = tuple(pin_noise_amplitudes)
+            else:
+                key = _get_noise_amplitudes(first.settings)
+            prefiltered = prefilter and _is_near_identical(first.ivc, second.ivc, key)
+            if prefiltered:
+                prefiltered_number += 1
+                pair_scores[pin_index][pair_index] = 0.0
+            if not prefiltered or validate_prefilter:
+                comparisons.setdefault(key, []).append((pin_index, pair_index, first.ivc, second.ivc, prefiltered))
+
+    comparator = IVCComparator()
+    mismatches_number = 0
+    for (voltage_noise, current_noise), group in comparisons.items():
+        comparator.set_min_ivc(voltage_noise, current_noise)
+        for pin_index, pair_index, first_ivc, second_ivc, prefiltered in group:
+            check_stop()
+            # Score is in relative units (0 - minimum value, 1 - maximum). Convert this value to %.
+            # The transition to percentages is carried out in the task # 85658
+            score = round(100 * comparator.compare_ivc(first_ivc, second_ivc), 1)
+            if prefiltered and score != 0.0:
+                mismatches_number += 1
+                pin_name = "'{}_{}' ".format(*pin_indices[pin_index]) if pin_indices else ""
+                logger.warning("The pre-filter gave zero score to the pin %s(x=%s, y=%s), but the comparator gave "
+                               "%s%%", pin_name, pins[pin_index].x, pins[pin_index].y, score)
+            pair_scores[pin_index][pair_index] = score
+
+    if prefiltered_number:
+        logger.debug("The pre-filter settled %d comparisons of IV-curves", prefiltered_number)
+    if validate_prefilter:
+        logger.info("The pre-filter is validated: %d mismatches in %d comparisons", mismatches_number,
+                    prefiltered_number)
+
+    return [(max((score for score in pin_pair_scores if score is not None), default=None),
+             pin_pair_scores if len(pin_pair_scores) > 1 else None) for pin_pair_scores in pair_scores]
+
+
 def get_pin_type(pin: Pin, score: Optional[float], tolerance: Optional[float], is_report_for_test_board: bool
                  ) -> PinTypes:
     """
@@ -170,3 +380,44 @@ def get_pin_type(pin: Pin, score: Optional[float], tolerance: Optional[float], i
         if getattr(pin, "is_loss", None):
             return PinTypes.REFERENCE_LOSS
         return PinTypes.REFERENCE_NOT_EMPTY
+
+
+@lru_cache(maxsize=None)
+def get_template_lookup(template_dir: str) -> TemplateLookup:
+    """
+    :param template_dir: directory where the report templates are located.
+    :return: template lookup. The lookup is created once for the directory, so the templates are compiled once.
+    """
+
+    return TemplateLookup(directories=[template_dir])
+
+
+def is_time_limit_reached(deadline: Optional[float]) -> bool:
+    """
+    :param deadline: time in seconds since the epoch (as returned by time.time()) or None if there is no time limit.
+    The time is the same in all processes.
+    :return: True if the deadline has passed.
+    """
+
+    return deadline is not None and time.time() > deadline
+
+
+@write_time("RENDER PIN ROWS")
+def render_pin_rows(template_dir: str, pins_info: List[PinInfo], rows: Dict[int, str], **kwargs) -> Dict[int, str]:
+    """
+    Function renders rows of the table with pins in one pass. The rendered rows are saved to the dictionary with total
+    pin indices as keys. Rows that are already in the dictionary are not rendered again.
+    :param template_dir: directory where the report templates are located;
+    :param pins_info: list with information about pins whose rows should be rendered;
+    :param rows: dictionary with rendered rows;
+    :param kwargs: arguments for template. The function to translate strings is given by the argument "_".
+    :return: dictionary with rendered rows.
+    """
+
+    pins_to_render = [pin_info for pin_info in pins_info if pin_info.total_pin_index not in rows]
+    if pins_to_render:
+        template = get_template_lookup(template_dir).get_template(_TEMPLATE_FILE_WITH_FUNCTIONS)
+        kwargs["get_pin_row_values"] = get_pin_row_values
+        kwargs["labels"] = get_pin_row_labels(kwargs.get("_", get_translation(False)))
+        template.get_def("create_pin_rows").render(pins_to_render, rows, **kwargs)
+    return rows
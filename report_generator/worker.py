@@ -0,0 +1,332 @@
+"""
+File with class to draw images of the report in a separate process.
+"""
+
+import logging
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from enum import auto, Enum
+from logging.handlers import QueueHandler
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Optional, Tuple
+from report_generator.logger import get_pin_logging_level, set_logging_level, set_pin_logging_level, stop_logging
+
+
+logger = logging.getLogger("report_generator")
+_POLL_INTERVAL: float = 0.1
+_STEP_INTERVAL: float = 0.05
+
+
+class RenderTasks(Enum):
+    """
+    Tasks that can be performed in the worker process.
+    """
+
+    DRAW_BOARD_WITH_PINS = auto()
+    DRAW_FAULT_HISTOGRAM = auto()
+    DRAW_IVC_FOR_PINS = auto()
+    PATCH_BOARD_WITH_PINS = auto()
+
+
+class WorkerMessages(Enum):
+    """
+    Messages sent by the worker process.
+    """
+
+    ERROR = auto()
+    LOG = auto()
+    RESULT = auto()
+    STEP_DONE = auto()
+    STOPPED = auto()
+
+
+class _ConnectionHandler(QueueHandler):
+    """
+    Handler sends records of the worker process to the main process where they are written by the handlers of the
+    package logger.
+    """
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.queue.send((WorkerMessages.LOG, record, None))
+
+
+class _RemoteTraceback(Exception):
+    """
+    Exception keeps the traceback of the error in the worker process, so it is written to the log of the main process.
+    """
+
+    def __init__(self, traceback_text: str) -> None:
+        """
+        :param traceback_text: formatted traceback of the error.
+        """
+
+        super().__init__(traceback_text)
+        self.traceback_text: str = traceback_text
+
+    def __str__(self) -> str:
+        return self.traceback_text
+
+
+class _WorkerStop(Exception):
+    pass
+
+
+class _StepSignal:
+    """
+    Class replaces the step_done signal of the generator in the worker process. Done steps are sent to the main process
+    in batches no more often than the given interval.
+    """
+
+    def __init__(self, connection: Connection, interval: float = _STEP_INTERVAL) -> None:
+        """
+        :param connection: connection to the main process;
+        :param interval: minimum interval between messages in seconds.
+        """
+
+        self._connection: Connection = connection
+        self._interval: float = interval
+        self._last_send_time: float = time.monotonic()
+        self._steps_number: int = 0
+
+    def emit(self) -> None:
+        self._steps_number += 1
+        if time.monotonic() - self._last_send_time >= self._interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Method sends the number of done steps to the main process.
+        """
+
+        if self._steps_number:
+            self._connection.send((WorkerMessages.STEP_DONE, self._steps_number, None))
+            self._steps_number = 0
+        self._last_send_time = time.monotonic()
+
+
+def perform_task(task: RenderTasks, args: Tuple, signal: Any, check_stop: Callable[[], None],
+                 _: Callable[[str], str]) -> Any:
+    """
+    Function performs the task in the current process.
+    :param task: task to be performed;
+    :param args: arguments of the task;
+    :param signal: signal to be emitted when the IV-curve of the pin is drawn;
+    :param check_stop: function that checks whether the operation is stopped;
+    :param _: function to translate strings.
+    :return: result of the task.
+    """
+
+    from report_generator import plot
+    from report_generator.imagecache import get_image_cache
+
+    if task == RenderTasks.DRAW_BOARD_WITH_PINS:
+        return plot.draw_board_with_pins(*args, check_stop=check_stop)
+    if task == RenderTasks.DRAW_FAULT_HISTOGRAM:
+        return plot.draw_fault_histogram(*args, _=_)
+    if task == RenderTasks.DRAW_IVC_FOR_PINS:
+        pins_info, dir_name, scaling_type, user_defined_scales, cache_dir_name, cache_size, deadline, \
+            required_number = args
+        return plot.draw_ivc_for_pins(pins_info, dir_name, signal, scaling_type, user_defined_scales, check_stop, _,
+                                      get_image_cache(cache_dir_name, cache_size), deadline, required_number)
+    if task == RenderTasks.PATCH_BOARD_WITH_PINS:
+        return plot.patch_board_with_pins(*args, check_stop=check_stop)
+    raise ValueError(f"Unknown task {task}")
+
+
+def get_memory() -> Optional[int]:
+    """
+    :return: the non-swapped physical memory used by the current process in bytes or None if it cannot be determined.
+    The psutil module is used if it is installed.
+    """
+
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except ImportError:
+        pass
+
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _work(connection: Connection, stop_event: multiprocessing.Event) -> None:
+    """
+    Function is executed in the worker process. It performs the tasks received from the main process until the
+    connection is closed or None is received. Log records are sent to the main process.
+    :param connection: connection to the main process;
+    :param stop_event: event that is set when the operation is stopped.
+    """
+
+    from PyQt5.QtWidgets import QApplication
+    from report_generator.translation import get_translation
+
+    def check_stop() -> None:
+        if stop_event.is_set():
+            raise _WorkerStop()
+
+    package_logger = logging.getLogger("report_generator")
+    for handler in package_logger.handlers[:]:
+        package_logger.removeHandler(handler)
+    package_logger.addHandler(_ConnectionHandler(connection))
+    stop_logging()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+
+        task, args, english, (logging_level, pin_logging_level) = message
+        set_logging_level(logging_level)
+        set_pin_logging_level(pin_logging_level)
+        signal = _StepSignal(connection)
+        try:
+            result = (WorkerMessages.RESULT, perform_task(task, args, signal, check_stop, get_translation(english)))
+        except _WorkerStop:
+            result = (WorkerMessages.STOPPED, None)
+        except Exception as exc:
+            result = (WorkerMessages.ERROR, (str(exc) or type(exc).__name__, traceback.format_exc()))
+        signal.flush()
+        connection.send((*result, get_memory()))
+
+
+class RenderWorker:
+    """
+    Class to draw images of the report in a worker process. Most of the memory for drawing is allocated by matplotlib
+    and Qt, so the memory of the main process does not grow from report to report. The worker process is recycled
+    after the given number of reports or when its memory exceeds the given limit.
+    """
+
+    def __init__(self, max_reports: int = 20, max_memory: Optional[int] = None) -> None:
+        """
+        :param max_reports: number of reports after which the worker process is restarted;
+        :param max_memory: memory of the worker process in MB above which the process is restarted after the report.
+        """
+
+        self._connection: Optional[Connection] = None
+        self._context = multiprocessing.get_context("spawn")
+        self._memory: Optional[int] = None
+        self._process: Optional[multiprocessing.Process] = None
+        self._reports_number: int = 0
+        self._stop_event = self._context.Event()
+        self.max_memory: Optional[int] = max_memory
+        self.max_reports: int = max_reports
+
+    def _receive(self, step_done: Optional[Callable[[int], None]]) -> Tuple[WorkerMessages, Any]:
+        """
+        :param step_done: function to be called with the number of steps that the worker process reports as done.
+        :return: message and the value sent by the worker process.
+        """
+
+        while True:
+            if not self._connection.poll(_POLL_INTERVAL):
+                if not self._process.is_alive():
+                    self.close()
+                    raise RuntimeError("Worker process terminated unexpectedly")
+                continue
+
+            message, value, memory = self._connection.recv()
+            if message == WorkerMessages.LOG:
+                logger.handle(value)
+                continue
+            if message == WorkerMessages.STEP_DONE:
+                if step_done is not None:
+                    step_done(value)
+                continue
+            self._memory = memory
+            return message, value
+
+    def _start(self) -> None:
+        """
+        Method starts a new worker process.
+        """
+
+        self._connection, child_connection = self._context.Pipe()
+        self._process = self._context.Process(target=_work, args=(child_connection, self._stop_event), daemon=True,
+                                              name="report_generator_worker")
+        self._process.start()
+        child_connection.close()
+        self._memory = None
+        self._reports_number = 0
+        logger.info("Worker process %d started", self._process.pid)
+
+    def close(self) -> None:
+        """
+        Method stops the worker process.
+        """
+
+        if self._process is None:
+            return
+
+        try:
+            self._connection.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(5)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._connection.close()
+        logger.info("Worker process %d finished", self._process.pid)
+        self._connection = None
+        self._process = None
+
+    def finish_report(self) -> None:
+        """
+        Method should be called after each report. It restarts the worker process if it has generated the maximum
+        number of reports or uses too much memory.
+        """
+
+        if self._process is None:
+            return
+
+        self._reports_number += 1
+        memory_exceeded = self.max_memory is not None and self._memory is not None and \
+            self._memory > self.max_memory * pow(2, 20)
+        if self._reports_number >= self.max_reports or memory_exceeded:
+            logger.info("Worker process is recycled after %d reports", self._reports_number)
+            self.close()
+
+    def run_task(self, task: RenderTasks, args: Tuple, english: bool, check_stop: Callable[[], None],
+                 step_done: Optional[Callable[[int], None]] = None) -> Any:
+        """
+        :param task: task to be performed;
+        :param args: arguments of the task, they should be picklable;
+        :param english: if True, the language of images is English;
+        :param check_stop: function that checks whether the operation is stopped;
+        :param step_done: function to be called with the number of steps that the worker process reports as done.
+        :return: result of the task.
+        """
+
+        check_stop()
+        if self._process is None or not self._process.is_alive():
+            self.close()
+            self._start()
+
+        self._stop_event.clear()
+        logging_levels = logger.getEffectiveLevel(), get_pin_logging_level()
+        self._connection.send((task, args, english, logging_levels))
+        message, value = self._receive(step_done)
+        if message == WorkerMessages.STOPPED:
+            check_stop()
+            raise RuntimeError("Worker process was stopped")
+        if message == WorkerMessages.ERROR:
+            error_text, traceback_text = value
+            raise RuntimeError(error_text) from _RemoteTraceback(traceback_text)
+        return value
+
+    def stop(self) -> None:
+        """
+        Method stops the current task of the worker process.
+        """
+
+        self._stop_event.set()
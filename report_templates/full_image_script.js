@@ -40,17 +40,14 @@ function handle_mouse_move_event(event) {
 
 /**
  * Function hides or shows image of IV-curve for pin.
- * @param pin: area on big image of board that represents pin;
- * @param show: if false image is hidden.
+ * @param pin: position of the pin in the arrays of the map of pins or -1 if image should be hidden.
  */
-function hide_or_show_img(pin, show) {
-    let coords = pin.getAttribute("coords");
-    let pin_iv_img = document.getElementById("img" + coords);
-    let board_x = document.getElementById("board_img").getBoundingClientRect().x;
-    if (board_x < 0)
-        board_x = 0;
-    if (show) {
-        if (check_point_inside(pin_iv_img))
+function hide_or_show_img(pin) {
+    let pin_iv_img = document.getElementById("pin_iv_img");
+    if (pin >= 0 && PIN_MAP.with_ivc[pin]) {
+        let img = pin_iv_img.getElementsByTagName("img")[0];
+        img.src = "static/img/" + PIN_MAP.element_indices[pin] + "_" + PIN_MAP.pin_indices[pin] + "_iv." + IV_IMAGE_EXTENSION;
+        if (check_point_inside(img))
             change_position(pin_iv_img);
         pin_iv_img.style.display = "block";
     }
@@ -61,10 +58,17 @@ function hide_or_show_img(pin, show) {
 }
 
 
+/**
+ * Function sets handlers for hovering over pins on the board image.
+ */
+function set_handlers() {
+    let board_img = document.getElementById("board_img");
+    set_pin_map_handlers(board_img, PIN_MAP, null, hide_or_show_img);
+}
+
+
 window.onresize = function() {
-    let imgs = document.getElementsByTagName("figure");
-    for (let i = 0; i < imgs.length; i++) {
-        let pin_iv_img = imgs[i];
+    let pin_iv_img = document.getElementById("pin_iv_img");
+    if (pin_iv_img != null)
         pin_iv_img.style.width = "20%";
-    }
 }
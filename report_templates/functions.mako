@@ -28,45 +28,52 @@
                 </td>
             </tr>
             % endif
+            ${pin_rows[pin.total_pin_index]}
+        % endfor
+        </tbody>
+    </table>
+</%def>
+
+
+<%def name="create_pin_row(pin, values)">
             <tr>
                 <td class="align_left">
-                    <a class="anchor" id="top" name="point_${pin.x}_${pin.y}"></a>
+                    <a class="anchor" id="top" name="point_${pin.total_pin_index}"></a>
                     <span>#${pin.total_pin_index + 1}</span><br>
-                    <span>${_("Название компонента")}: ${pin.element_name}</span><br>
-                    <span>${_("Индекс компонента")}: ${pin.element_index + 1}</span><br>
-                    <span>${_("Индекс точки")}: ${pin.pin_index + 1}</span><br>
-                    <span>X = ${round(pin.x, 2)} ${_("пк")}</span><br>
-                    <span>Y = ${round(pin.y, 2)} ${_("пк")}</span><br>
-                % if pin.score is not None:
-                    <span>${_("Различие")} = ${round(pin.score, 1)}%</span><br>
+                    <span>${labels["element_name"]}: ${pin.element_name}</span><br>
+                    <span>${labels["element_index"]}: ${pin.element_index + 1}</span><br>
+                    <span>${labels["pin_index"]}: ${pin.pin_index + 1}</span><br>
+                    <span>X = ${values["x"]} ${labels["pixels"]}</span><br>
+                    <span>Y = ${values["y"]} ${labels["pixels"]}</span><br>
+                % if values["score"] is not None:
+                    <span>${labels["score"]} = ${values["score"]}%</span><br>
+                % endif
+                % if values["scores"]:
+                    <span>${labels["scores"]}: ${", ".join("-" if score is None else f"{score}%" for score in values["scores"])}</span><br>
                 % endif
                 % if pin.multiplexer_output:
-                    <button class="collapsible" onclick="handle_click(this)">${_("Выход мультиплексора")}</button>
+                    <button class="collapsible" onclick="handle_click(this)">${labels["multiplexer_output"]}</button>
                     <div class="hidden_options">
-                        <span>${_("Номер модуля")} = ${pin.multiplexer_output.module_number}</span><br>
-                        <span>${_("Номер канала")} = ${pin.multiplexer_output.channel_number}</span><br>
+                        <span>${labels["module_number"]} = ${pin.multiplexer_output.module_number}</span><br>
+                        <span>${labels["channel_number"]} = ${pin.multiplexer_output.channel_number}</span><br>
                     </div><br>
                 % endif
-                % if pin.measurements:
-                    <button class="collapsible" onclick="handle_click(this)">${_("Параметры измерения")}</button>
+                % if values["settings"]:
+                    <button class="collapsible" onclick="handle_click(this)">${labels["settings"]}</button>
                     <div class="hidden_options">
-                        <span>${_("Частота")} = ${round(pin.measurements[0].settings.probe_signal_frequency, 2)} ${_("Гц")}</span><br>
-                        <span>${_("Напряжение")} = ${round(pin.measurements[0].settings.max_voltage, 2)} ${_("В")}</span><br>
-                        <span>${_("Внутреннее сопротивление")} = ${round(pin.measurements[0].settings.internal_resistance, 2)} ${_("Ом")}</span><br>
+                        <span>${labels["frequency"]} = ${values["settings"][0]} ${labels["hertz"]}</span><br>
+                        <span>${labels["voltage"]} = ${values["settings"][1]} ${labels["volts"]}</span><br>
+                        <span>${labels["internal_resistance"]} = ${values["settings"][2]} ${labels["ohms"]}</span><br>
                     </div><br>
-                    <%
-                        comments = [measurement.comment for measurement in pin.measurements if measurement.comment]
-                        comment = "<br>".join(comments)
-                    %>
-                    % if comment:
-                    <button class="collapsible" onclick="handle_click(this)">${_("Комментарий к измерению")}</button>
+                    % if values["measurement_comment"]:
+                    <button class="collapsible" onclick="handle_click(this)">${labels["measurement_comment"]}</button>
                     <div class="hidden_options">
-                        <span>${comment}</span>
+                        <span>${values["measurement_comment"]}</span>
                     </div><br>
                     % endif
                 % endif
                 % if pin.comment:
-                    <button class="collapsible" onclick="handle_click(this)">${_("Комментарий к пину")}</button>
+                    <button class="collapsible" onclick="handle_click(this)">${labels["pin_comment"]}</button>
                     <div class="hidden_options">
                         <span>${pin.comment}</span>
                     </div>
@@ -85,20 +92,141 @@
                 </td>
                 % endif
                 <td>
-                % if pin.measurements:
-                    <img src="static/img/${pin.element_index}_${pin.pin_index}_iv.png" height="${pin_img_size}" alt="${_('Сигнатуры в точке тестирования')}">
+                % if values["settings"] and pin.total_pin_index in omitted_pins:
+                    <span>${labels["omitted_ivc"]}</span>
+                % elif values["settings"] and iv_svg_images:
+                    ${iv_svg_images[pin.total_pin_index]}
+                % elif values["settings"]:
+                    <img src="static/img/${values['image']}" height="${pin_img_size}" alt="${labels['ivc_image']}">
                 % else:
-                    <span>${_("Сигнатур нет")}</span>
+                    <span>${labels["no_ivc"]}</span>
+                % endif
+                </td>
+            </tr>
+</%def>
+
+
+<%def name="create_pin_rows(pins_info, rows)">
+    % for pin in pins_info:
+        <%
+            rows[pin.total_pin_index] = capture(create_pin_row, pin, get_pin_row_values(pin, iv_image_format))
+        %>
+    % endfor
+</%def>
+
+
+<%def name="create_diff_table(changes)">
+    % if len(changes) == 0:
+        <% return "" %>
+    % endif
+
+    <table id="report" cellspacing="0" cellpadding="0">
+        <thead>
+            <tr>
+                <th class="column_name"><span>${_("Точка")}</span></th>
+            % if board_img_width is not None:
+                <th class="column_image"><span>${_("Изображение")}</span></th>
+            % endif
+                <th class="column_plot"><span>${_("Сигнатура")}</span></th>
+            </tr>
+        </thead>
+        <tbody>
+        <%
+            change_names = {"ADDED": _("Точка добавлена"), "REMOVED": _("Точка удалена"), "SCORE": _("Изменилось различие"),
+                            "TYPE": _("Изменился тип точки")}
+            prev_element_index = None
+        %>
+        % for change in changes:
+            % if change["element_index"] != prev_element_index:
+            <%
+                prev_element_index = change["element_index"]
+            %>
+            <tr>
+                <td class="element_name" colspan="3">
+                    <h2>#${change["element_index"] + 1} - ${change["element_name"]}</h2>
+                </td>
+            </tr>
+            % endif
+            <tr>
+                <td class="align_left" colspan="3">
+                    <span><b>${change_names[change["change"].name]}</b>: ${_("Индекс точки")}: ${change["pin_index"] + 1}</span><br>
+                % if change["old_score"] is not None or change["new_score"] is not None:
+                    <span>${_("Различие")}: ${change["old_score"] if change["old_score"] is not None else "-"}% &rarr; ${change["new_score"] if change["new_score"] is not None else "-"}%
+                    % if change["score_delta"] is not None:
+                        (${"{:+.1f}".format(change["score_delta"])}%)
+                    % endif
+                    </span><br>
                 % endif
+                    <span>${_("Тип точки")}: ${change["old_type"] or "-"} &rarr; ${change["new_type"] or "-"}</span>
                 </td>
             </tr>
+            % if change["pin"] is not None:
+            ${pin_rows[change["pin"].total_pin_index]}
+            % endif
         % endfor
         </tbody>
     </table>
 </%def>
 
 
-<%def name="create_general_info_table(other_report_file, other_report_name, full_report, board_image_file, pins_info)">
+<%def name="create_diff_info_table(summary, pin_map)">
+    <table id="general_info" cellspacing="0" cellpadding="0">
+        <tbody>
+            <tr>
+                <th>
+                    <h2>${_("Общая информация")}</h2>
+                </th>
+            </tr>
+
+            <tr>
+                <td class="align_left">
+                % if app_name:
+                    <span>${_("Диагностическая система")}: ${app_name}</span><br>
+                % endif
+                % if app_version:
+                    <span>${_("Версия")}: ${app_version}</span><br>
+                % endif
+                    <span>${_("Дата")}: ${date}</span><br>
+                % if pcb_name:
+                    <span>${_("Название платы")}: ${pcb_name}</span><br>
+                % endif
+                    <span>${_("Количество точек тестирования в предыдущем/текущем прогоне")}: ${summary["old_pins_number"]}/${summary["new_pins_number"]}</span><br>
+                    <span>${_("Количество точек с изменениями")}: ${summary["changed"]}</span><br>
+                    <span>${_("Различие увеличилось/уменьшилось")}: ${summary["score_increased"]}/${summary["score_decreased"]}</span><br>
+                    <span>${_("Добавлено/удалено точек")}: ${summary["added"]}/${summary["removed"]}</span><br>
+                % for old_type, new_type, count in summary["transitions"]:
+                    <span>${old_type} &rarr; ${new_type}: ${count}</span><br>
+                % endfor
+                % if tolerance:
+                    <span>${_("Допуск")}: ${round(tolerance, 1)}%</span><br>
+                % endif
+                    <span>HTML: v4.01</span><br>
+                </td>
+            </tr>
+
+        % if board_img_width is not None:
+            <tr>
+                <th>
+                    <h2>${_("Карта точек с изменениями")}</h2>
+                </th>
+            </tr>
+
+            <tr>
+                <td>
+                    <img id="board" src="static/img/board.jpeg" alt="${_('Карта точек с изменениями')}" title="${_('Карта точек с изменениями')}">
+                    <script type="text/javascript">
+                        const PIN_MAP = ${pin_map};
+                    </script>
+                    <img id="board_clear" src="static/img/board_clear.jpeg" alt="${_('Изображение платы')}" title="${_('Изображение платы')}" style="display: none;">
+                </td>
+            </tr>
+        % endif
+        </tbody>
+    </table>
+</%def>
+
+
+<%def name="create_general_info_table(other_report_file, other_report_name, full_report, board_image_file, pin_map)">
     <table id="general_info" cellspacing="0" cellpadding="0">
         <tbody>
             <tr>
@@ -138,10 +266,15 @@
                 % endif
                 % if pcb_comment:
                     <span>${_("Комментарий")}: ${pcb_comment}</span><br>
+                % endif
+                % if omitted_pins:
+                    <span>${_("Количество точек без сигнатур из-за ограничения времени")}: ${len(omitted_pins)}</span><br>
                 % endif
                     <span>HTML: v4.01</span><br>
+                % if other_report_file:
                     <span><a href="${other_report_file}" target="_blank">${other_report_name}</a></span><br>
-                % if board_img_width:
+                % endif
+                % if board_img_width and "MAP_REPORT" in generated_reports:
                     <span><a href="full_img.html" target="_blank">${_("Просмотреть изображение платы")}</a></span><br>
                 % endif
                 </td>
@@ -172,14 +305,10 @@
             % else:
                 <td>
             % endif
-                    <img id="board" src="static/img/${board_image_file}" usemap="#map" alt="${points_map_name}" title="${points_map_name}">
-                    <p>
-                        <map name="map">
-                        % for pin in pins_info:
-                            <area shape="circle" coords="${pin.x},${pin.y},${pin_radius}" href="#point_${pin.x}_${pin.y}" alt="">
-                        % endfor
-                        </map>
-                    </p>
+                    <img id="board" src="static/img/${board_image_file}" alt="${points_map_name}" title="${points_map_name}">
+                    <script type="text/javascript">
+                        const PIN_MAP = ${pin_map};
+                    </script>
                     <img id="board_clear" src="static/img/board_clear.jpeg" alt="${_('Изображение платы')}" title="${_('Изображение платы')}" style="display: none;">
                 </td>
             </tr>
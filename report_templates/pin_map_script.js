@@ -0,0 +1,95 @@
+/**
+ * Functions to find pins on the board image using the packed map of pins with a grid index.
+ */
+
+
+const MIN_HIT_RADIUS = 4;
+
+
+/**
+ * Function finds the pin nearest to the given point on the board image.
+ * @param pin_map: packed map of pins;
+ * @param x: x coordinate of the point in pixels of the original board image;
+ * @param y: y coordinate of the point in pixels of the original board image;
+ * @param radius: maximum distance from the point to the pin.
+ * @return: position of the pin in the arrays of the map or -1 if there is no pin near the point.
+ */
+function find_pin(pin_map, x, y, radius) {
+    let column = Math.floor(x / pin_map.cell_size);
+    let row = Math.floor(y / pin_map.cell_size);
+    let nearest = -1;
+    let nearest_distance = radius * radius;
+    for (let cell_row = row - 1; cell_row <= row + 1; cell_row++) {
+        if (cell_row < 0 || cell_row >= pin_map.rows)
+            continue;
+        for (let cell_column = column - 1; cell_column <= column + 1; cell_column++) {
+            if (cell_column < 0 || cell_column >= pin_map.columns)
+                continue;
+            let cell = cell_row * pin_map.columns + cell_column;
+            for (let i = pin_map.cell_starts[cell]; i < pin_map.cell_starts[cell + 1]; i++) {
+                let pin = pin_map.cell_pins[i];
+                let dx = pin_map.coords[2 * pin] - x;
+                let dy = pin_map.coords[2 * pin + 1] - y;
+                let distance = dx * dx + dy * dy;
+                if (distance <= nearest_distance) {
+                    nearest = pin;
+                    nearest_distance = distance;
+                }
+            }
+        }
+    }
+    return nearest;
+}
+
+
+/**
+ * Function finds the pin under the mouse pointer.
+ * @param board_img: board image;
+ * @param pin_map: packed map of pins;
+ * @param event: mouse event.
+ * @return: position of the pin in the arrays of the map or -1 if there is no pin under the pointer.
+ */
+function find_pin_under_pointer(board_img, pin_map, event) {
+    let rect = board_img.getBoundingClientRect();
+    if (rect.width == 0)
+        return -1;
+
+    let scale = board_img.naturalWidth / rect.width;
+    let x = (event.clientX - rect.left) * scale;
+    let y = (event.clientY - rect.top) * scale;
+    let radius = Math.min(Math.max(pin_map.radius, MIN_HIT_RADIUS * scale), pin_map.cell_size);
+    return find_pin(pin_map, x, y, radius);
+}
+
+
+/**
+ * Function sets handlers for clicking on pins and hovering over pins on the board image.
+ * @param board_img: board image;
+ * @param pin_map: packed map of pins;
+ * @param handle_pin_click: function to be called with the position of the clicked pin;
+ * @param handle_pin_hover: function to be called with the position of the pin under the pointer or -1.
+ */
+function set_pin_map_handlers(board_img, pin_map, handle_pin_click, handle_pin_hover) {
+    let current_pin = -1;
+    board_img.addEventListener("mousemove", function(event) {
+        let pin = find_pin_under_pointer(board_img, pin_map, event);
+        board_img.style.cursor = pin < 0 ? "default" : "pointer";
+        if (pin != current_pin) {
+            current_pin = pin;
+            if (handle_pin_hover)
+                handle_pin_hover(pin);
+        }
+    });
+    board_img.addEventListener("mouseleave", function() {
+        if (current_pin >= 0) {
+            current_pin = -1;
+            if (handle_pin_hover)
+                handle_pin_hover(-1);
+        }
+    });
+    board_img.addEventListener("click", function(event) {
+        let pin = find_pin_under_pointer(board_img, pin_map, event);
+        if (pin >= 0 && handle_pin_click)
+            handle_pin_click(pin);
+    });
+}
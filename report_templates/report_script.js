@@ -2,7 +2,7 @@ var flag = false;
 
 
 /**
- * Function changes size of board image and position of area pins on it.
+ * Function changes size of board image and sets handlers for clicking on pins on it.
  */
 function change_size() {
     if (flag)
@@ -20,15 +20,8 @@ function change_size() {
     if (natural_width == null)
         return;
 
-    let pin_areas = document.getElementsByTagName("area");
-    for (let i = 0; i < pin_areas.length; i++) {
-        let pin = pin_areas[i];
-        let coords = pin.getAttribute("coords").split(",");
-        let x = coords[0] * WIDTH / natural_width;
-        let y = coords[1] * WIDTH / natural_width;
-        let r = coords[2] * WIDTH / natural_width / 5;
-        pin.setAttribute("coords", x + "," + y + "," + r);
-    }
+    let board_img = document.getElementById("board");
+    set_pin_map_handlers(board_img, PIN_MAP, go_to_pin, null);
 
     draw_pins();
 }
@@ -81,6 +74,15 @@ function draw_pins() {
 }
 
 
+/**
+ * Function scrolls the report to the pin.
+ * @param pin: position of the pin in the arrays of the map of pins.
+ */
+function go_to_pin(pin) {
+    window.location.hash = "point_" + PIN_MAP.total_pin_indices[pin];
+}
+
+
 /**
  * Function handles click on button.
  * @param button: button.
@@ -0,0 +1,71 @@
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from PIL import Image
+from report_generator import ArtifactTypes, ConfigAttributes, ImageFormats, iter_generate, ObjectsForReport, ReportTypes
+from tests.utils import create_board_with_faulty_pin
+
+
+logger = logging.getLogger("report_generator")
+logger.setLevel(logging.ERROR)
+
+
+class TestArtifacts(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        board = create_board_with_faulty_pin()
+        board.image = Image.new("RGB", (400, 300), (200, 200, 200))
+        for index, pin in enumerate(board.elements[0].pins):
+            pin.x, pin.y = 50 + 100 * index, 150
+        self.config = {ConfigAttributes.BOARD: board,
+                       ConfigAttributes.DIRECTORY: self._dir.name,
+                       ConfigAttributes.IV_IMAGE_FORMAT: ImageFormats.SVG,
+                       ConfigAttributes.OBJECTS: {ObjectsForReport.BOARD: True},
+                       ConfigAttributes.TOLERANCE: 0.2}
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def test_iter_generate(self) -> None:
+        artifacts = []
+        for artifact in iter_generate(self.config):
+            # The file is ready when the artifact is yielded
+            self.assertTrue(artifact.file_name is None or os.path.isfile(artifact.file_name))
+            artifacts.append(artifact)
+
+        names = [os.path.basename(artifact.file_name) for artifact in artifacts if artifact.file_name]
+        self.assertEqual({name for artifact, name in zip(artifacts, names)
+                          if artifact.artifact_type == ArtifactTypes.BOARD_IMAGE},
+                         {"board_clear.jpeg", "board_with_bad_pins.jpeg", "board.jpeg"})
+        self.assertEqual([(artifact.data.element_index, artifact.data.pin_index) for artifact in artifacts
+                          if artifact.artifact_type == ArtifactTypes.IV_IMAGE], [(0, 1), (0, 2)])
+        self.assertEqual({artifact.data for artifact in artifacts if artifact.artifact_type == ArtifactTypes.REPORT},
+                         set(ReportTypes))
+        # The short report is ready before IV-curves of the passing pin
+        self.assertLess(names.index("report.html"), names.index("0_2_iv.svg"))
+        self.assertIn("fault_histogram.jpeg", names)
+        self.assertEqual(artifacts[-1].artifact_type, ArtifactTypes.METRICS)
+        self.assertEqual((artifacts[-1].data["pins_number"], artifacts[-1].data["bad_pins_number"]), (3, 1))
+
+    def test_iter_generate_png(self) -> None:
+        del self.config[ConfigAttributes.IV_IMAGE_FORMAT]
+        file_names = [artifact.file_name for artifact in iter_generate(self.config)
+                      if artifact.artifact_type == ArtifactTypes.IV_IMAGE]
+        # IV-curves in PNG format are drawn in the worker process, so QApplication is not required
+        self.assertEqual([os.path.basename(file_name) for file_name in file_names], ["0_1_iv.png", "0_2_iv.png"])
+        self.assertTrue(all(os.path.isfile(file_name) for file_name in file_names))
+
+    def test_iter_generate_error(self) -> None:
+        self.config[ConfigAttributes.DIFF_WITH] = os.path.join(self._dir.name, "missing.npz")
+        with self.assertRaises(RuntimeError), self.assertLogs(logger, logging.ERROR):
+            list(iter_generate(self.config))
+
+    def test_iter_generate_stop(self) -> None:
+        threads_number = threading.active_count()
+        artifacts = iter_generate(self.config)
+        self.assertEqual(next(artifacts).artifact_type, ArtifactTypes.BOARD_IMAGE)
+        artifacts.close()
+        self.assertEqual(threading.active_count(), threads_number)
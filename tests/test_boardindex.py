@@ -0,0 +1,49 @@
+import unittest
+from epcore.elements import Board, Element, IVCurve, Measurement, MeasurementSettings, Pin
+from report_generator.boardindex import BoardIndex
+
+
+def create_measurement(is_reference: bool) -> Measurement:
+    """
+    :param is_reference: if True, then the reference measurement will be created.
+    :return: measurement.
+    """
+
+    settings = MeasurementSettings(sampling_rate=1, internal_resistance=1000.0, max_voltage=20.0,
+                                   probe_signal_frequency=1)
+    return Measurement(settings=settings, ivc=IVCurve(), is_reference=is_reference)
+
+
+class TestBoardIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        board = Board()
+        board.elements = [Element(name="element_0", pins=[Pin(x=0, y=0), Pin(x=1, y=1)]),
+                          Element(name="element_1", pins=[Pin(x=2, y=2, measurements=[create_measurement(True)])]),
+                          Element(name="element_2", pins=[Pin(x=3, y=3), Pin(x=4, y=4), Pin(x=5, y=5)])]
+        self.index: BoardIndex = BoardIndex(board)
+
+    def test_index(self) -> None:
+        self.assertEqual(len(self.index), 6)
+        self.assertEqual(self.index.element_offsets, [0, 2, 3, 6])
+        self.assertEqual(self.index.element_indices, [0, 0, 1, 2, 2, 2])
+        self.assertEqual(self.index.pin_indices, [0, 1, 0, 0, 1, 2])
+        self.assertEqual(self.index.get_element(4).name, "element_2")
+        self.assertEqual(list(self.index.measurement_flags), [0, 0, BoardIndex.REFERENCE_MEASUREMENT, 0, 0, 0])
+        self.assertFalse(self.index.has_test_measurements)
+
+    def test_get_mask(self) -> None:
+        self.assertEqual(self.index.get_mask(True).tolist(), [True] * 6)
+        self.assertEqual(self.index.get_mask(False, [2], [0, 4, 10]).tolist(), [True, False, False, True, True, True])
+        self.assertEqual(self.index.get_mask(False, [], []).tolist(), [False] * 6)
+
+    def test_update_pins(self) -> None:
+        pin = self.index.pins[3]
+        pin.measurements.append(create_measurement(False))
+        self.index.update_pins([3])
+        self.assertTrue(self.index.has_test_measurements)
+        self.assertEqual(self.index.measurement_flags[3], BoardIndex.TEST_MEASUREMENT)
+
+        pin.measurements.clear()
+        self.index.update_pins([3])
+        self.assertFalse(self.index.has_test_measurements)
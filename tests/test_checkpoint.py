@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+from report_generator.checkpoint import Checkpoint, find_checkpoint, get_fingerprint
+from report_generator.definitions import PinInfo, PinTypes
+from tests.utils import create_simple_board
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def test_fingerprint(self) -> None:
+        pins_info = [PinInfo("", 0, index, pin.x, pin.y, pin.measurements, None, PinTypes.TEST_EMPTY, index, None,
+                             None) for index, pin in enumerate(create_simple_board().elements[0].pins)]
+        fingerprint = get_fingerprint(pins_info, 0.2)
+        self.assertEqual(fingerprint, get_fingerprint(pins_info, 0.2))
+        self.assertNotEqual(fingerprint, get_fingerprint(pins_info, 0.3))
+        self.assertNotEqual(fingerprint, get_fingerprint(pins_info[:2], 0.2))
+
+    def test_resume(self) -> None:
+        with tempfile.TemporaryDirectory() as parent_dir_name:
+            dir_name = os.path.join(parent_dir_name, "report")
+            os.makedirs(dir_name)
+            checkpoint = Checkpoint.open(dir_name, "report_1")
+            checkpoint.set_step_done("DRAW_CLEAR_BOARD", True)
+            checkpoint.set_pins_done([0, 1, 2, 5])
+            checkpoint.save()
+
+            self.assertEqual(find_checkpoint(parent_dir_name, "report_1"), dir_name)
+            self.assertIsNone(find_checkpoint(parent_dir_name, "report_2"))
+            self.assertFalse(Checkpoint.open(dir_name, "report_2").is_step_done("DRAW_CLEAR_BOARD"))
+
+            checkpoint = Checkpoint.open(dir_name, "report_1")
+            self.assertTrue(checkpoint.is_step_done("DRAW_CLEAR_BOARD"))
+            self.assertTrue(checkpoint.get_step_result("DRAW_CLEAR_BOARD"))
+            self.assertEqual([index for index in range(7) if checkpoint.is_pin_done(index)], [0, 1, 2, 5])
+            self.assertEqual(Checkpoint.read(dir_name)["pins"], [[0, 3], [5, 6]])
+
+            checkpoint.finish()
+            checkpoint.save()
+            self.assertFalse(os.path.exists(checkpoint.file_name))
+            self.assertIsNone(find_checkpoint(parent_dir_name, "report_1"))
@@ -0,0 +1,88 @@
+import unittest
+import numpy as np
+from epcore.elements import IVCurve, Measurement, MeasurementSettings
+from report_generator.curves import (decimate_curve, get_curve_hash, get_curve_pairs, get_curves,
+                                     get_measurement_pairs, get_scales, join_curve_pairs)
+from report_generator.definitions import PinInfo, PinTypes, ScalingTypes
+from tests.utils import create_simple_board
+
+
+class TestCurves(unittest.TestCase):
+
+    def test_decimate_curve(self) -> None:
+        angles = np.linspace(0, 2 * np.pi, 100000)
+        voltages = np.sin(angles)
+        currents = 0.01 * np.cos(angles)
+        decimated_voltages, decimated_currents = decimate_curve(voltages, currents, 1, 10, 300, 200)
+        self.assertLess(len(decimated_voltages), 5000)
+        self.assertEqual((decimated_voltages[0], decimated_voltages[-1]), (voltages[0], voltages[-1]))
+
+        # All points of the original curve are near the points of the decimated curve on the image 300x200
+        x = voltages * 150
+        y = currents * 1000 * 10
+        decimated_x = decimated_voltages * 150
+        decimated_y = decimated_currents * 1000 * 10
+        decimated_index = 0
+        distances = []
+        for index in range(len(x)):
+            if decimated_index + 1 < len(decimated_voltages) and voltages[index] == decimated_voltages[
+                    decimated_index + 1] and currents[index] == decimated_currents[decimated_index + 1]:
+                decimated_index += 1
+            distances.append(np.hypot(x[index] - decimated_x[decimated_index], y[index] - decimated_y[decimated_index]))
+        self.assertLess(max(distances), 0.5)
+
+        short_voltages, short_currents = decimate_curve([0, 1], [0, 1], 1, 1, 300, 200)
+        self.assertEqual(list(short_voltages), [0, 1])
+
+    def test_get_curve_hash(self) -> None:
+        voltages = np.linspace(-1, 1, 10)
+        currents = np.linspace(-0.1, 0.1, 10)
+        self.assertEqual(get_curve_hash(voltages, currents), get_curve_hash(list(voltages), list(currents)))
+        self.assertNotEqual(get_curve_hash(voltages, currents), get_curve_hash(voltages, 2 * currents))
+        self.assertNotEqual(get_curve_hash(voltages[:5], currents), get_curve_hash(voltages, currents[:5]))
+        self.assertIsNone(get_curve_hash(np.array([]), np.array([])))
+
+    def test_get_measurement_pairs(self) -> None:
+        settings = [MeasurementSettings(sampling_rate=100000 * index, internal_resistance=475.0,
+                                        probe_signal_frequency=1000 * index, max_voltage=5.0)
+                    for index in range(1, 4)]
+        ref_1 = Measurement(settings=settings[0], ivc=IVCurve(voltages=[0, 1], currents=[0, 1]), is_reference=True)
+        ref_2 = Measurement(settings=settings[1], ivc=IVCurve(voltages=[0, 2], currents=[0, 2]), is_reference=True)
+        test_1 = Measurement(settings=settings[0], ivc=IVCurve(voltages=[0, 3], currents=[0, 3]), is_reference=False)
+        test_2 = Measurement(settings=settings[1], ivc=IVCurve(voltages=[0, 4], currents=[0, 4]), is_reference=False)
+        test_3 = Measurement(settings=settings[2], ivc=IVCurve(voltages=[0, 5], currents=[0, 5]), is_reference=False)
+
+        # Measurements with the same settings are paired regardless of the order
+        pairs = get_measurement_pairs([test_2, ref_1, test_1, ref_2])
+        self.assertEqual(len(pairs), 2)
+        self.assertTrue(pairs[0][0] is ref_2 and pairs[0][1] is test_2)
+        self.assertTrue(pairs[1][0] is ref_1 and pairs[1][1] is test_1)
+
+        # Test measurements with other settings are paired by ordinal numbers
+        pairs = get_measurement_pairs([ref_1, ref_2, test_3, test_2, test_1])
+        self.assertEqual([(ref is None, test is None) for ref, test in pairs], [(False, False)] * 2 + [(True, False)])
+        self.assertTrue(pairs[0][0] is ref_1 and pairs[0][1] is test_3)
+        self.assertTrue(pairs[1][0] is ref_2 and pairs[1][1] is test_2)
+
+        self.assertEqual(get_measurement_pairs([]), [])
+        self.assertEqual(len(get_measurement_pairs([test_1])), 1)
+        self.assertIsNone(get_measurement_pairs([test_1])[0][0])
+
+        pin_info = PinInfo("", 0, 0, 0, 0, [ref_1, ref_2, test_1], None, PinTypes.TEST_LOW_SCORE, 0, None, None)
+        curve_pairs = get_curve_pairs(pin_info)
+        self.assertEqual(len(curve_pairs), 2)
+        self.assertEqual(list(curve_pairs[0][2]), [0, 3])
+        self.assertEqual(len(curve_pairs[1][2]), 0)
+        ref_voltages, _, test_voltages, _ = join_curve_pairs(curve_pairs)
+        self.assertEqual((list(ref_voltages), list(test_voltages)), ([0, 1, 0, 2], [0, 3]))
+
+    def test_get_scales(self) -> None:
+        pin = create_simple_board().elements[0].pins[1]
+        pin_info = PinInfo("", 0, 1, pin.x, pin.y, pin.measurements, None, PinTypes.TEST_EMPTY, 1, None, None)
+        curves = get_curves(pin_info)
+        self.assertEqual(len(curves[0]), 0)
+        self.assertEqual(len(curves[2]), 100)
+        v_max, i_max = get_scales(pin_info, 0, ScalingTypes.AUTO, None, curves)
+        self.assertAlmostEqual(v_max, 1.2 * 0.5)
+        self.assertAlmostEqual(i_max, 1.2 * 1000 * 12.5)
+        self.assertEqual(get_scales(pin_info, 0, ScalingTypes.USER_DEFINED, [(2, 0.1)], curves), (2, 100))
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from epcore.elements import IVCurve, Measurement, Pin
+from report_generator.definitions import ExportFormats, PinChanges, PinInfo, PinTypes
+from report_generator.diff import compare_results, RunDiff
+from report_generator.export import export_results
+from tests.utils import create_simple_board
+
+
+def create_results(element_indices, pin_indices, scores, pin_types):
+    return {"element_index": np.array(element_indices, dtype=np.int64),
+            "pin_index": np.array(pin_indices, dtype=np.int64),
+            "pin_type": np.array(pin_types, dtype=str),
+            "score": np.array(scores, dtype=float),
+            "total_pin_index": np.arange(len(pin_indices), dtype=np.int64)}
+
+
+class TestDiff(unittest.TestCase):
+
+    def test_compare_results(self) -> None:
+        old = create_results([0, 0, 0, 1], [0, 1, 2, 0], [10.0, 20.0, np.nan, 30.0],
+                             ["TEST_LOW_SCORE", "TEST_LOW_SCORE", "TEST_EMPTY", "TEST_HIGH_SCORE"])
+        new = create_results([1, 0, 0, 2], [0, 0, 1, 0], [30.1, 10.0, 20.0, 5.0],
+                             ["TEST_HIGH_SCORE", "TEST_LOW_SCORE", "TEST_HIGH_SCORE", "TEST_LOW_SCORE"])
+        changes = compare_results(old, new)
+        self.assertEqual(changes["change"].tolist(), [PinChanges.TYPE.name, PinChanges.REMOVED.name,
+                                                      PinChanges.SCORE.name, PinChanges.ADDED.name])
+        self.assertEqual(changes["element_index"].tolist(), [0, 0, 1, 2])
+        self.assertEqual(changes["pin_index"].tolist(), [1, 2, 0, 0])
+        self.assertEqual(changes["old_position"].tolist(), [1, 2, 3, -1])
+        self.assertEqual(changes["new_position"].tolist(), [2, -1, 0, 3])
+        self.assertAlmostEqual(changes["score_delta"][2], 0.1)
+        self.assertEqual(changes["new_type"].tolist(), ["TEST_HIGH_SCORE", "", "TEST_HIGH_SCORE", "TEST_LOW_SCORE"])
+
+    def test_compare_boards(self) -> None:
+        old_board = create_simple_board()
+        new_board = create_simple_board()
+        pin = new_board.elements[0].pins[1]
+        ivc = pin.measurements[0].ivc
+        pin.measurements.append(Measurement(settings=pin.measurements[0].settings, is_reference=True,
+                                            ivc=IVCurve(currents=list(ivc.currents), voltages=list(ivc.voltages))))
+        new_board.elements[0].pins.append(Pin(x=1, y=1))
+
+        diff = RunDiff(old_board, new_board, 15, True)
+        changes = diff.get_changes()
+        self.assertEqual([(change["change"], change["pin_index"]) for change in changes],
+                         [(PinChanges.TYPE, 1), (PinChanges.ADDED, 3)])
+        self.assertIsNone(changes[0]["old_score"])
+        self.assertIsNotNone(changes[0]["new_score"])
+        self.assertIs(changes[0]["pin"].measurements, pin.measurements)
+        summary = diff.get_summary()
+        self.assertEqual((summary["old_pins_number"], summary["new_pins_number"], summary["changed"],
+                          summary["added"], summary["removed"]), (3, 4, 1, 1, 0))
+        self.assertEqual(summary["transitions"], [("TEST_EMPTY", "TEST_LOW_SCORE", 1)])
+
+    def test_compare_exported_results(self) -> None:
+        board = create_simple_board()
+        pins_info = [PinInfo("Element_name_0", 0, index, pin.x, pin.y, pin.measurements, None, PinTypes.TEST_LOW_SCORE,
+                             index, None, None) for index, pin in enumerate(board.elements[0].pins)]
+        with tempfile.TemporaryDirectory() as dir_name:
+            old_dir_name = os.path.join(dir_name, "old")
+            new_dir_name = os.path.join(dir_name, "new")
+            for directory, scores in ((old_dir_name, (0, 10, 20)), (new_dir_name, (0, 15, 20))):
+                os.makedirs(directory)
+                results = [pin_info._replace(score=score) for pin_info, score in zip(pins_info, scores)]
+                export_results(results, directory, [ExportFormats.CSV, ExportFormats.NPZ], with_curves=True)
+
+            diff = RunDiff(os.path.join(old_dir_name, "results.csv"), os.path.join(new_dir_name, "results.npz"))
+            changes = diff.get_changes()
+            self.assertEqual(len(changes), 1)
+            self.assertEqual((changes[0]["old_score"], changes[0]["new_score"], changes[0]["score_delta"]),
+                             (10.0, 15.0, 5.0))
+            pin_info = changes[0]["pin"]
+            self.assertEqual((pin_info.element_name, pin_info.pin_index, pin_info.score), ("Element_name_0", 1, 15.0))
+            np.testing.assert_array_equal(pin_info.measurements[0].ivc.voltages,
+                                          board.elements[0].pins[1].measurements[0].ivc.voltages)
@@ -0,0 +1,55 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from report_generator.definitions import ExportFormats, PinInfo, PinTypes
+from report_generator.export import export_results
+from tests.utils import create_simple_board
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self) -> None:
+        pins = create_simple_board().elements[0].pins
+        self.pins_info = [PinInfo("Element_name_0", 0, index, pin.x, pin.y, pin.measurements, 10.0 * index,
+                                  PinTypes.TEST_EMPTY, index, None, None) for index, pin in enumerate(pins)]
+
+    def test_export_results(self) -> None:
+        with tempfile.TemporaryDirectory() as dir_name:
+            file_names = export_results(self.pins_info, dir_name, [ExportFormats.NPZ, ExportFormats.CSV,
+                                                                   ExportFormats.JSONL], 15, True)
+            self.assertEqual([os.path.basename(file_name) for file_name in file_names],
+                             ["results.csv", "results.jsonl", "results.npz"])
+
+            with open(file_names[0], "r", encoding="utf-8", newline="") as file:
+                rows = list(csv.DictReader(file))
+            self.assertEqual(len(rows), 3)
+            self.assertEqual(rows[2]["score"], "20.0")
+            self.assertEqual(rows[2]["faulty"], "True")
+            self.assertEqual(rows[0]["max_voltage"], "")
+            self.assertNotIn("ref_voltages", rows[0])
+
+            with open(file_names[1], "r", encoding="utf-8") as file:
+                rows = [json.loads(line) for line in file]
+            self.assertEqual(rows[1]["pin_type"], "TEST_EMPTY")
+            self.assertEqual(rows[1]["internal_resistance"], 40)
+            self.assertEqual(len(rows[1]["test_voltages"]), 100)
+            self.assertEqual(rows[1]["ref_voltages"], [])
+
+            with np.load(file_names[2]) as data:
+                self.assertEqual(data["total_pin_index"].tolist(), [0, 1, 2])
+                self.assertEqual(data["module_number"].tolist(), [-1, -1, -1])
+                self.assertTrue(np.isnan(data["max_voltage"][0]))
+                self.assertEqual(data["test_voltages_offsets"].tolist(), [0, 0, 100, 200])
+                offsets = data["test_voltages_offsets"]
+                np.testing.assert_array_equal(data["test_voltages"][offsets[1]:offsets[2]],
+                                              self.pins_info[1].measurements[0].ivc.voltages)
+
+    def test_export_without_curves(self) -> None:
+        with tempfile.TemporaryDirectory() as dir_name:
+            file_name, = export_results(self.pins_info, dir_name, [ExportFormats.NPZ])
+            with np.load(file_name) as data:
+                self.assertNotIn("test_voltages", data)
+                self.assertEqual(data["faulty"].tolist(), [False, False, False])
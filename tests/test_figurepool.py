@@ -0,0 +1,26 @@
+import unittest
+from report_generator.figurepool import FigurePool
+
+
+class TestFigurePool(unittest.TestCase):
+
+    def test_figure_is_reused(self) -> None:
+        pool = FigurePool()
+        with pool.figure(4, 3, 100) as fig:
+            fig.add_subplot(111)
+        with pool.figure(4, 3, 100) as same_fig:
+            self.assertIs(same_fig, fig)
+            self.assertEqual(len(same_fig.axes), 0)
+            with pool.figure(4, 3, 100) as other_fig:
+                self.assertIsNot(other_fig, fig)
+
+    def test_max_size(self) -> None:
+        pool = FigurePool(max_size=2)
+        figures = []
+        for width in range(1, 4):
+            with pool.figure(width, 1, 100) as fig:
+                figures.append(fig)
+        with pool.figure(1, 1, 100) as fig:
+            self.assertIsNot(fig, figures[0])
+        with pool.figure(3, 1, 100) as fig:
+            self.assertIs(fig, figures[2])
@@ -1,12 +1,17 @@
 import logging
 import os
 import sys
+import tempfile
+import threading
 import unittest
 from bs4 import BeautifulSoup
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication
-from epcore.elements import Board
-from report_generator import ConfigAttributes, ObjectsForReport, ReportGenerator
-from tests.utils import create_simple_board, read_file
+from epcore.elements import Board, IVCurve
+from report_generator import (ConfigAttributes, ExportFormats, ObjectsForReport, PinQuery, ReportGenerator,
+                              ReportSession, ReportTypes)
+from report_generator.export import read_results
+from tests.utils import create_board_with_faulty_pin, create_simple_board, read_binary_file, read_file
 
 
 logger = logging.getLogger("report_generator")
@@ -103,3 +108,192 @@ class TestGenerator(unittest.TestCase):
         self.assertIsNotNone(TestGenerator.simple_report_dir)
         self.assertTrue(os.path.exists(TestGenerator.simple_report_dir))
         self._check_reports_creation(TestGenerator.simple_report_dir)
+
+    def test_image_cache_after_redrawing(self) -> None:
+        board = create_board_with_faulty_pin()
+        with tempfile.TemporaryDirectory() as cache_dir_name:
+            config = {ConfigAttributes.BOARD: board,
+                      ConfigAttributes.DIRECTORY: self._dir_for_report,
+                      ConfigAttributes.IMAGE_CACHE_DIRECTORY: cache_dir_name,
+                      ConfigAttributes.OBJECTS: {ObjectsForReport.BOARD: True},
+                      ConfigAttributes.TOLERANCE: 0.2}
+            ReportGenerator().run(config)
+            cached_images = {os.path.join(dir_path, file_name): read_binary_file(os.path.join(dir_path, file_name))
+                             for dir_path, _, file_names in os.walk(cache_dir_name) for file_name in file_names}
+            self.assertEqual(len(cached_images), 2)
+
+            # Images of the second report are taken from the cache, then the image of the faulty pin is drawn again
+            session = ReportSession()
+            dir_names = []
+            session.generation_finished.connect(dir_names.append)
+            self.assertTrue(session.open(config))
+            pin = board.elements[0].pins[1]
+            pin.measurements[1].ivc = IVCurve(currents=[3 * current for current in pin.measurements[0].ivc.currents],
+                                              voltages=list(pin.measurements[0].ivc.voltages))
+            self.assertTrue(session.update([(0, 1)]))
+            session.close()
+
+            file_name = os.path.join(dir_names[0], "static", "img", "0_1_iv.png")
+            for path, content in cached_images.items():
+                self.assertFalse(os.path.samefile(path, file_name))
+                self.assertEqual(read_binary_file(path), content)
+
+    def test_noise_amplitudes_for_required_pins(self) -> None:
+        board = create_board_with_faulty_pin()
+        reference = board.elements[0].pins[2].measurements[1]
+        reference.ivc = IVCurve(currents=[1.05 * current for current in reference.ivc.currents],
+                                voltages=list(reference.ivc.voltages))
+        report_generator = ReportGenerator()
+        dir_names = []
+        report_generator.generation_finished.connect(dir_names.append)
+        config = {ConfigAttributes.BOARD: board,
+                  ConfigAttributes.DIRECTORY: self._dir_for_report,
+                  ConfigAttributes.EXPORT_FORMATS: [ExportFormats.CSV],
+                  ConfigAttributes.NOISE_AMPLITUDES: [None, None, (1e4, 1e4)],
+                  ConfigAttributes.OBJECTS: {ObjectsForReport.BOARD: False,
+                                             ObjectsForReport.PIN: [2]},
+                  ConfigAttributes.REPORTS_TO_OPEN: [ReportTypes.SHORT_REPORT],
+                  ConfigAttributes.ONLY_REPORTS_TO_OPEN: True,
+                  ConfigAttributes.TOLERANCE: 0.2}
+        report_generator.run(config)
+
+        # Noise amplitudes are taken by total pin index, not by the position of the pin in the report
+        results = read_results(os.path.join(dir_names[0], "results.csv"))
+        self.assertEqual(results["pin_index"].tolist(), [2])
+        self.assertEqual(results["score"].tolist(), [0.0])
+
+    def test_noise_amplitudes_with_query(self) -> None:
+        board = create_board_with_faulty_pin()
+        pins = board.elements[0].pins
+        for index, pin in enumerate(pins):
+            pin.x = 10 * index
+        reference = pins[2].measurements[1]
+        reference.ivc = IVCurve(currents=[1.05 * current for current in reference.ivc.currents],
+                                voltages=list(reference.ivc.voltages))
+        report_generator = ReportGenerator()
+        dir_names = []
+        report_generator.generation_finished.connect(dir_names.append)
+        # Only the second and third pins are candidates of the query, the second pin is dropped because of its score
+        query = PinQuery(score_range=(None, 0.01), rectangle=(5, -1, 25, 1))
+        config = {ConfigAttributes.BOARD: board,
+                  ConfigAttributes.DIRECTORY: self._dir_for_report,
+                  ConfigAttributes.EXPORT_FORMATS: [ExportFormats.CSV],
+                  ConfigAttributes.NOISE_AMPLITUDES: [None, (1e-6, 1e-6), (1e4, 1e4)],
+                  ConfigAttributes.OBJECTS: {ObjectsForReport.QUERY: query},
+                  ConfigAttributes.REPORTS_TO_OPEN: [ReportTypes.SHORT_REPORT],
+                  ConfigAttributes.ONLY_REPORTS_TO_OPEN: True,
+                  ConfigAttributes.TOLERANCE: 0.2}
+        report_generator.run(config)
+
+        # Noise amplitudes are taken by total pin index, so the difference of the third pin is within the noise
+        results = read_results(os.path.join(dir_names[0], "results.csv"))
+        self.assertEqual(results["pin_index"].tolist(), [2])
+        self.assertEqual(results["score"].tolist(), [0.0])
+
+    def test_only_short_report(self) -> None:
+        report_generator = ReportGenerator()
+        dir_names = []
+        steps_numbers = []
+        report_generator.generation_finished.connect(dir_names.append)
+        report_generator.total_number_of_steps_calculated.connect(steps_numbers.append)
+        config = {ConfigAttributes.BOARD: create_simple_board(),
+                  ConfigAttributes.DIRECTORY: self._dir_for_report,
+                  ConfigAttributes.OBJECTS: {ObjectsForReport.BOARD: True},
+                  ConfigAttributes.ONLY_REPORTS_TO_OPEN: True,
+                  ConfigAttributes.REPORTS_TO_OPEN: [ReportTypes.SHORT_REPORT],
+                  ConfigAttributes.TOLERANCE: 0.2}
+        report_generator.run(config)
+
+        # There are no faulty pins, so IV-curves are not drawn
+        self.assertEqual(steps_numbers, [7])
+        self.assertEqual(sorted(os.listdir(dir_names[0])), ["report.html", "static"])
+        self.assertFalse(any(file_name.endswith("_iv.png")
+                             for file_name in os.listdir(os.path.join(dir_names[0], "static", "img"))))
+        soup = BeautifulSoup(read_file(os.path.join(dir_names[0], "report.html")), "html.parser")
+        self.assertIsNone(soup.find("a", {"href": "report_full.html"}))
+
+    def test_resume(self) -> None:
+        for save_checkpoint in (False, True):
+            report_generator = ReportGenerator()
+            report_generator.short_report_ready.connect(lambda _: report_generator.stop_process())
+            config = {ConfigAttributes.BOARD: create_board_with_faulty_pin(),
+                      ConfigAttributes.DIRECTORY: self._dir_for_report,
+                      ConfigAttributes.OBJECTS: {ObjectsForReport.BOARD: True},
+                      ConfigAttributes.SAVE_CHECKPOINT: save_checkpoint,
+                      ConfigAttributes.TOLERANCE: 0.2}
+            dir_names = []
+            report_generator.short_report_ready.connect(lambda file_name: dir_names.append(os.path.dirname(file_name)))
+            report_generator.run(config)
+            self.assertEqual(os.path.isfile(os.path.join(dir_names[0], "checkpoint.json")), save_checkpoint)
+            self.assertNotIn("0_2_iv.png", os.listdir(os.path.join(dir_names[0], "static", "img")))
+
+        # The generation is continued in the directory of the stopped generation
+        report_generator = ReportGenerator()
+        report_generator.generation_finished.connect(dir_names.append)
+        report_generator.run({**config, ConfigAttributes.RESUME: True})
+        self.assertEqual(dir_names[1], dir_names[0])
+        self.assertIn("0_2_iv.png", os.listdir(os.path.join(dir_names[0], "static", "img")))
+        self.assertFalse(os.path.isfile(os.path.join(dir_names[0], "checkpoint.json")))
+
+    def test_run_in_thread(self) -> None:
+        report_generator = ReportGenerator()
+        dir_names = []
+        report_generator.generation_finished.connect(dir_names.append, Qt.DirectConnection)
+        config = {ConfigAttributes.BOARD: create_board_with_faulty_pin(),
+                  ConfigAttributes.DIRECTORY: self._dir_for_report,
+                  ConfigAttributes.OBJECTS: {ObjectsForReport.BOARD: True},
+                  ConfigAttributes.TOLERANCE: 0.2}
+        thread = threading.Thread(target=report_generator.run, args=(config,))
+        thread.start()
+        thread.join()
+        report_generator.close_worker()
+
+        # The Qt widget cannot be used outside the GUI thread, so IV-curves are drawn in the worker process
+        images = os.listdir(os.path.join(dir_names[0], "static", "img"))
+        self.assertIn("0_1_iv.png", images)
+        self.assertIn("0_2_iv.png", images)
+
+    def test_short_report_first(self) -> None:
+        report_generator = ReportGenerator()
+        dir_names = []
+        report_generator.generation_finished.connect(dir_names.append)
+        ready_files = []
+
+        def save_ready_files(file_name: str) -> None:
+            dir_name = os.path.dirname(file_name)
+            ready_files.extend(os.listdir(dir_name) + os.listdir(os.path.join(dir_name, "static", "img")))
+
+        report_generator.short_report_ready.connect(save_ready_files)
+        config = {ConfigAttributes.BOARD: create_board_with_faulty_pin(),
+                  ConfigAttributes.DIRECTORY: self._dir_for_report,
+                  ConfigAttributes.OBJECTS: {ObjectsForReport.BOARD: True},
+                  ConfigAttributes.TOLERANCE: 0.2}
+        report_generator.run(config)
+
+        # The short report is written after IV-curves of the faulty pin, but before IV-curves of other pins
+        self.assertIn("report.html", ready_files)
+        self.assertIn("0_1_iv.png", ready_files)
+        self.assertNotIn("0_2_iv.png", ready_files)
+        self.assertNotIn("report_full.html", ready_files)
+        self.assertIn("0_2_iv.png", os.listdir(os.path.join(dir_names[0], "static", "img")))
+        self.assertIn("report_full.html", os.listdir(dir_names[0]))
+
+    def test_time_limit(self) -> None:
+        board = create_board_with_faulty_pin()
+        report_generator = ReportGenerator()
+        dir_names = []
+        report_generator.generation_finished.connect(dir_names.append)
+        config = {ConfigAttributes.BOARD: board,
+                  ConfigAttributes.DIRECTORY: self._dir_for_report,
+                  ConfigAttributes.OBJECTS: {ObjectsForReport.BOARD: True},
+                  ConfigAttributes.TIME_LIMIT: 0,
+                  ConfigAttributes.TOLERANCE: 0.2}
+        report_generator.run(config)
+
+        # The faulty pin is drawn regardless of the time limit, the empty and passing pins are omitted
+        images = os.listdir(os.path.join(dir_names[0], "static", "img"))
+        self.assertIn("0_1_iv.png", images)
+        self.assertNotIn("0_2_iv.png", images)
+        soup = BeautifulSoup(read_file(os.path.join(dir_names[0], "report_full.html")), "html.parser")
+        self.assertEqual(len(soup.find_all("img", {"alt": "Сигнатуры в точке тестирования"})), 1)
+        self.assertIn("Количество точек без сигнатур из-за ограничения времени: 2", soup.text)
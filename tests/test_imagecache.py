@@ -0,0 +1,39 @@
+import os
+import tempfile
+import time
+import unittest
+from report_generator.imagecache import get_image_key, ImageCache
+
+
+class TestImageCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self._cache_dir_name = os.path.join(self._dir.name, "cache")
+        self._file_name = os.path.join(self._dir.name, "image.png")
+        with open(self._file_name, "wb") as file:
+            file.write(b"\x00" * 1000)
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def test_get_and_put(self) -> None:
+        cache = ImageCache(self._cache_dir_name, 10000)
+        key = get_image_key("style", 1.0, 2.0, "ref", "test")
+        required_file_name = os.path.join(self._dir.name, "required.png")
+        self.assertFalse(cache.get(key, required_file_name))
+        cache.put(key, self._file_name)
+        self.assertTrue(cache.get(key, required_file_name))
+        self.assertEqual(os.path.getsize(required_file_name), 1000)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.get_hit_rate(), 0.5)
+
+    def test_eviction(self) -> None:
+        cache = ImageCache(self._cache_dir_name, 2500)
+        keys = [get_image_key(index) for index in range(3)]
+        for key in keys:
+            cache.put(key, self._file_name)
+            time.sleep(0.01)
+        required_file_name = os.path.join(self._dir.name, "required.png")
+        self.assertFalse(cache.get(keys[0], required_file_name))
+        self.assertTrue(cache.get(keys[2], required_file_name))
@@ -0,0 +1,73 @@
+import logging
+import os
+import sys
+import tempfile
+import unittest
+from report_generator import logger as logger_module
+from report_generator.logger import flush_logs, get_pin_logging_level, save_logs_to_file, set_pin_logging_level
+from report_generator.utils import write_time
+
+
+logger = logging.getLogger("report_generator")
+
+
+class TestLogger(unittest.TestCase):
+
+    def test_queue_logging(self) -> None:
+        log_file = os.path.join(tempfile.mkdtemp(), "report_generator.log")
+        save_logs_to_file(log_file)
+
+        @write_time("PIN PROCESS", per_pin=True)
+        def process_pin() -> int:
+            return 1
+
+        level = logger.level
+        pin_logging_level = get_pin_logging_level()
+        try:
+            logger.setLevel(logging.INFO)
+            self.assertEqual(process_pin(), 1)
+            set_pin_logging_level(logging.INFO)
+            self.assertEqual(process_pin(), 1)
+            logger.info("Message for the file")
+        finally:
+            logger.setLevel(level)
+            set_pin_logging_level(pin_logging_level)
+
+        flush_logs()
+        with open(log_file, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("'PIN PROCESS'", lines[0])
+        self.assertIn("Message for the file", lines[1])
+
+    def test_prepare(self) -> None:
+        handler = logger_module._QueueHandler(None)
+        try:
+            raise ValueError("Error for the log")
+        except ValueError:
+            record = logger.makeRecord(logger.name, logging.ERROR, __file__, 0, "Value %d", (10,), sys.exc_info())
+
+        prepared_record = handler.prepare(record)
+        self.assertEqual((prepared_record.msg, prepared_record.args, prepared_record.exc_info),
+                         ("Value 10", None, None))
+        self.assertIn("Error for the log", prepared_record.exc_text)
+        self.assertIsNotNone(record.exc_info)
+
+    def test_flush_logs(self) -> None:
+        log_file = os.path.join(tempfile.mkdtemp(), "report_generator.log")
+        save_logs_to_file(log_file)
+        listener = logger_module._listener
+        thread = listener._thread
+        try:
+            raise ValueError("Error for the file")
+        except ValueError:
+            logger.error("Message with error %d", 1, exc_info=True)
+
+        # The writer thread is not restarted
+        flush_logs()
+        self.assertIs(logger_module._listener, listener)
+        self.assertIs(listener._thread, thread)
+        with open(log_file, "r", encoding="utf-8") as file:
+            text = file.read()
+        self.assertIn("Message with error 1", text)
+        self.assertIn("ValueError: Error for the file", text)
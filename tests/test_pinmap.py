@@ -0,0 +1,28 @@
+import unittest
+from report_generator.definitions import PinInfo
+from report_generator.pinmap import create_pin_map
+
+
+class TestPinMap(unittest.TestCase):
+
+    def test_create_pin_map(self) -> None:
+        pins = [PinInfo("name_1", 0, 0, 10, 10, [], None, None, 0, None, None),
+                PinInfo("name_1", 0, 1, 500, 20, [], None, None, 1, None, None),
+                PinInfo("name_2", 1, 0, 30, 400, [None], None, None, 2, None, None)]
+        pin_map = create_pin_map(pins, 6)
+        self.assertEqual(pin_map["coords"], [10, 10, 500, 20, 30, 400])
+        self.assertEqual(pin_map["total_pin_indices"], [0, 1, 2])
+        self.assertEqual(pin_map["with_ivc"], [0, 0, 1])
+        self.assertEqual(len(pin_map["cell_starts"]), pin_map["columns"] * pin_map["rows"] + 1)
+        self.assertEqual(sorted(pin_map["cell_pins"]), [0, 1, 2])
+        for position, pin in enumerate(pins):
+            column = int(pin.x // pin_map["cell_size"])
+            row = int(pin.y // pin_map["cell_size"])
+            cell = row * pin_map["columns"] + column
+            cell_pins = pin_map["cell_pins"][pin_map["cell_starts"][cell]:pin_map["cell_starts"][cell + 1]]
+            self.assertIn(position, cell_pins)
+
+    def test_create_empty_pin_map(self) -> None:
+        pin_map = create_pin_map([], 6)
+        self.assertEqual(pin_map["coords"], [])
+        self.assertEqual(pin_map["cell_starts"], [0, 0])
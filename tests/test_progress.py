@@ -0,0 +1,49 @@
+import unittest
+from report_generator.progress import ProgressInfo, ProgressReporter
+
+
+class _Clock:
+
+    def __init__(self) -> None:
+        self.time: float = 0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+class TestProgress(unittest.TestCase):
+
+    def test_rate_limit(self) -> None:
+        clock = _Clock()
+        reports = []
+        reporter = ProgressReporter(reports.append, 0.05, clock)
+        reporter.set_total(1001)
+        reporter.start_stage("Pins", 1000)
+        reports.clear()
+        for _ in range(1000):
+            clock.time += 0.001
+            reporter.advance()
+        # 1 second of work is reported 20 times and once more at the end of the stage
+        self.assertLessEqual(len(reports), 21)
+        self.assertEqual(reports[-1].done, 1000)
+        self.assertEqual(reports[-1].stage_done, 1000)
+        self.assertAlmostEqual(reports[-1].throughput, 1000)
+
+    def test_eta(self) -> None:
+        clock = _Clock()
+        reports = []
+        reporter = ProgressReporter(reports.append, 0, clock)
+        reporter.set_total(12)
+        self.assertIsNone(reports[-1].eta)
+
+        reporter.start_stage("Directories")
+        clock.time += 1
+        reporter.advance()
+        self.assertEqual(reports[-1].eta, 11)
+
+        reporter.start_stage("Pins", 10)
+        self.assertIsNone(reports[-1].eta)
+        clock.time += 2
+        reporter.advance(5)
+        # 5 pins are left at 0.4 seconds per pin and 1 step at 1 second per step
+        self.assertEqual(reports[-1], ProgressInfo(6, 12, "Pins", 5, 10, 2.5, 3.0))
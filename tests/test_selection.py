@@ -0,0 +1,51 @@
+import unittest
+from epcore.elements import Board, Element, IVCurve, Measurement, MeasurementSettings, Pin
+from report_generator.boardindex import BoardIndex
+from report_generator.definitions import PinInfo, PinTypes
+from report_generator.selection import PinQuery, select_pins
+
+
+def create_board() -> Board:
+    """
+    :return: board with three elements.
+    """
+
+    settings = MeasurementSettings(sampling_rate=1, internal_resistance=1000.0, max_voltage=20.0,
+                                   probe_signal_frequency=100)
+    measurement = Measurement(settings=settings, ivc=IVCurve())
+    board = Board()
+    board.elements = [Element(name="R1", pins=[Pin(x=0, y=0), Pin(x=10, y=10, measurements=[measurement])]),
+                      Element(name="C1", pins=[Pin(x=20, y=20, measurements=[measurement])]),
+                      Element(name="R2", pins=[Pin(x=30, y=30), Pin(x=40, y=40)])]
+    return board
+
+
+class TestPinQuery(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.index: BoardIndex = BoardIndex(create_board())
+
+    def test_element_name(self) -> None:
+        self.assertEqual(PinQuery(element_name="R*").get_mask(self.index).tolist(),
+                         [True, True, False, True, True])
+
+    def test_rectangle(self) -> None:
+        self.assertEqual(PinQuery(rectangle=(5, 5, 30, 30)).get_mask(self.index).tolist(),
+                         [False, True, True, True, False])
+
+    def test_settings(self) -> None:
+        self.assertEqual(PinQuery(settings={"probe_signal_frequency": 100}).get_mask(self.index).tolist(),
+                         [False, True, True, False, False])
+        query = PinQuery(element_name="R*", settings={"max_voltage": lambda value: value > 10})
+        self.assertEqual(query.get_mask(self.index).tolist(), [False, True, False, False, False])
+
+    def test_match_result(self) -> None:
+        pin = PinInfo("R1", 0, 0, 0, 0, [], 30.0, PinTypes.TEST_HIGH_SCORE, 0, None, None)
+        self.assertTrue(PinQuery(score_range=(0.2, None)).match_result(pin))
+        self.assertFalse(PinQuery(score_range=(0.2, 0.25)).match_result(pin))
+        self.assertTrue(PinQuery(pin_types=[PinTypes.TEST_HIGH_SCORE]).match_result(pin))
+        self.assertFalse(PinQuery(pin_types=[PinTypes.TEST_LOW_SCORE]).match_result(pin))
+
+    def test_select_pins(self) -> None:
+        queries = [PinQuery(element_name="C*"), PinQuery(rectangle=(35, 35, 50, 50))]
+        self.assertEqual(select_pins(create_board(), queries), [2, 4])
@@ -0,0 +1,100 @@
+import logging
+import os
+import tempfile
+import unittest
+from bs4 import BeautifulSoup
+from PIL import Image
+from epcore.elements import IVCurve, Measurement, Pin
+from report_generator import ConfigAttributes, ImageFormats, ReportSession
+from tests.utils import create_simple_board, read_file
+
+
+logger = logging.getLogger("report_generator")
+logger.setLevel(logging.ERROR)
+
+
+def add_reference(pin: Pin, factor: float) -> None:
+    """
+    :param pin: pin with a test measurement;
+    :param factor: factor by which the currents of the reference IV-curve differ from the test IV-curve.
+    """
+
+    measurement = pin.measurements[0]
+    ivc = IVCurve(currents=[factor * current for current in measurement.ivc.currents],
+                  voltages=list(measurement.ivc.voltages))
+    pin.measurements.append(Measurement(settings=measurement.settings, ivc=ivc, is_reference=True))
+
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._dir: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.board = create_simple_board()
+        self.board.image = Image.new("RGB", (400, 300), (200, 200, 200))
+        for index, pin in enumerate(self.board.elements[0].pins):
+            pin.x, pin.y = 50 + 100 * index, 150
+        add_reference(self.board.elements[0].pins[1], 1)
+        add_reference(self.board.elements[0].pins[2], 1)
+        self.config = {ConfigAttributes.BOARD: self.board,
+                       ConfigAttributes.DIRECTORY: self._dir.name,
+                       ConfigAttributes.IS_REPORT_FOR_TEST_BOARD: True,
+                       ConfigAttributes.IV_IMAGE_FORMAT: ImageFormats.INLINE_SVG,
+                       ConfigAttributes.TOLERANCE: 0.2}
+
+    def tearDown(self) -> None:
+        self._dir.cleanup()
+
+    def _read_report(self, dir_name: str, file_name: str) -> BeautifulSoup:
+        return BeautifulSoup(read_file(os.path.join(dir_name, file_name)), "html.parser")
+
+    def test_update(self) -> None:
+        session = ReportSession(refresh_interval=3)
+        dir_names = []
+        session.generation_finished.connect(dir_names.append)
+        session.report_updated.connect(dir_names.append)
+        self.assertTrue(session.open(self.config))
+        self.assertTrue(session.is_open)
+        soup = self._read_report(dir_names[0], "report.html")
+        self.assertEqual(soup.find("meta", {"http-equiv": "refresh"})["content"], "3")
+        self.assertEqual(len(soup.find_all("svg", {"role": "img"})), 0)
+        board_image = Image.open(os.path.join(dir_names[0], "static", "img", "board_with_bad_pins.jpeg")).convert("RGB")
+        self.assertEqual(board_image.getpixel((150, 150)), board_image.getpixel((10, 10)))
+
+        # The second pin becomes faulty
+        pin = self.board.elements[0].pins[1]
+        pin.measurements = pin.measurements[:1]
+        add_reference(pin, 2)
+        self.assertTrue(session.update([(0, 1)]))
+        self.assertEqual(dir_names[1], dir_names[0])
+        soup = self._read_report(dir_names[0], "report.html")
+        self.assertEqual(len(soup.find_all("svg", {"role": "img"})), 1)
+        board_image = Image.open(os.path.join(dir_names[0], "static", "img", "board_with_bad_pins.jpeg")).convert("RGB")
+        red, green, blue = board_image.getpixel((150, 150))
+        self.assertTrue(red > 200 and green < 100 and blue < 100)
+
+        # A new pin is added to the board
+        new_pin = Pin(x=350, y=150, measurements=[self.board.elements[0].pins[2].measurements[0]])
+        self.board.elements[0].pins.append(new_pin)
+        add_reference(new_pin, 3)
+        self.assertTrue(session.update([(0, 3)]))
+        soup = self._read_report(dir_names[0], "report_full.html")
+        self.assertIn("Количество точек тестирования: 4", soup.text)
+        self.assertEqual(len(soup.find_all("svg", {"role": "img"})), 3)
+        self.assertTrue(os.path.isfile(os.path.join(dir_names[0], "static", "img", "0_3_iv.svg")))
+
+        session.close()
+        self.assertFalse(session.is_open)
+        self.assertEqual(len(dir_names), 4)
+        soup = self._read_report(dir_names[0], "report.html")
+        self.assertIsNone(soup.find("meta", {"http-equiv": "refresh"}))
+        self.assertIn("Количество неисправных точек тестирования/количество точек тестирования: 2/4", soup.text)
+        self.assertFalse(session.update([(0, 1)]))
+
+    def test_update_unknown_pin(self) -> None:
+        session = ReportSession()
+        errors = []
+        session.exception_raised.connect(errors.append)
+        self.assertTrue(session.open(self.config))
+        self.assertFalse(session.update([(0, 5)]))
+        self.assertEqual(len(errors), 1)
+        self.assertFalse(session.is_open)
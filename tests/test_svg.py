@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from xml.etree import ElementTree
+from report_generator.definitions import ImageFormats, PinInfo, PinTypes, ScalingTypes
+from report_generator.svg import draw_ivc_svg_for_pins, SvgRenderer
+from tests.utils import create_simple_board
+
+
+class _Signal:
+
+    def __init__(self) -> None:
+        self.emitted: int = 0
+
+    def emit(self) -> None:
+        self.emitted += 1
+
+
+def _get_pins_info():
+    pins_info = []
+    for pin_index, pin in enumerate(create_simple_board().elements[0].pins):
+        pins_info.append(PinInfo("Element_name_0", 0, pin_index, pin.x, pin.y, pin.measurements, None,
+                                 PinTypes.TEST_EMPTY, pin_index, None, None))
+    return pins_info
+
+
+class TestSvg(unittest.TestCase):
+
+    def test_create_image(self) -> None:
+        pin_info = _get_pins_info()[1]
+        renderer = SvgRenderer(inline=True, inline_height=100)
+        document, element = renderer.create_image(pin_info, 1, ScalingTypes.AUTO, None)
+        namespace = "{http://www.w3.org/2000/svg}"
+        root = ElementTree.fromstring(document)
+        self.assertEqual(root.tag, f"{namespace}svg")
+        polygons = root.findall(f".//{namespace}polygon")
+        self.assertEqual(len(polygons), 1)
+        self.assertEqual(polygons[0].get("stroke"), "#f00")
+        self.assertIn("Тест", document)
+        self.assertNotIn("Эталон", document)
+
+        root = ElementTree.fromstring(element)
+        self.assertEqual(root.get("height"), "100")
+        self.assertEqual(root.find("use").get("href"), "#iv_axes_0")
+        self.assertEqual(len(root.findall(".//polygon")), 1)
+
+    def test_draw_ivc_svg_for_pins(self) -> None:
+        pins_info = _get_pins_info()
+        signal = _Signal()
+        with tempfile.TemporaryDirectory() as dir_name:
+            result = draw_ivc_svg_for_pins(pins_info, dir_name, signal, image_format=ImageFormats.INLINE_SVG,
+                                           inline_height=100)
+            self.assertEqual(sorted(os.listdir(dir_name)), ["0_1_iv.svg", "0_2_iv.svg"])
+            self.assertIsNone(draw_ivc_svg_for_pins(pins_info, dir_name, signal))
+
+        self.assertEqual(signal.emitted, 2 * len(pins_info))
+        self.assertEqual(sorted(result["images"]), [1, 2])
+        # Pins with the same scales share the axes
+        definitions = ElementTree.fromstring(result["definitions"])
+        self.assertEqual(len(definitions.findall("./defs/g")), 1)
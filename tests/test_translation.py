@@ -0,0 +1,24 @@
+import builtins
+import tempfile
+import unittest
+from epcore.elements import Board
+from report_generator import ConfigAttributes, ReportGenerator
+from report_generator.translation import get_translation
+
+
+class TestTranslation(unittest.TestCase):
+
+    def test_get_translation(self) -> None:
+        english = get_translation(True)
+        russian = get_translation(False)
+        self.assertEqual(english("Допуск"), "Tolerance")
+        self.assertEqual(russian("Допуск"), "Допуск")
+        self.assertIs(get_translation(True).__self__, english.__self__)
+
+    def test_install_translation(self) -> None:
+        with tempfile.TemporaryDirectory() as dir_name:
+            for english, text in ((True, "Tolerance"), (False, "Допуск")):
+                ReportGenerator().run({ConfigAttributes.BOARD: Board(),
+                                       ConfigAttributes.DIRECTORY: dir_name,
+                                       ConfigAttributes.ENGLISH: english})
+                self.assertEqual(builtins._("Допуск"), text)
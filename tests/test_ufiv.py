@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from PIL import Image
+from report_generator.ufiv import load_board_from_ufiv
+from tests.utils import create_board_with_faulty_pin
+
+
+class TestUfiv(unittest.TestCase):
+
+    def test_load_board_from_ufiv(self) -> None:
+        board = create_board_with_faulty_pin()
+        currents = list(board.elements[0].pins[1].measurements[0].ivc.currents)
+        with tempfile.TemporaryDirectory() as dir_name:
+            file_name = os.path.join(dir_name, "elements.json")
+            Image.new("RGB", (40, 30)).save(os.path.join(dir_name, "image.png"))
+            with mock.patch("report_generator.ufiv.load_board", return_value=board) as load_board:
+                loaded_board = load_board_from_ufiv(file_name)
+            load_board.assert_called_once_with(file_name)
+
+            ivc = loaded_board.elements[0].pins[1].measurements[0].ivc
+            self.assertIsInstance(ivc.currents, np.ndarray)
+            self.assertIsInstance(ivc.voltages, np.ndarray)
+            self.assertEqual(ivc.currents.tolist(), currents)
+            self.assertEqual(loaded_board.image.size, (40, 30))
+            loaded_board.image.close()
+
+    def test_stop(self) -> None:
+        def check_stop() -> None:
+            raise RuntimeError("Stopped")
+
+        with mock.patch("report_generator.ufiv.load_board", return_value=create_board_with_faulty_pin()):
+            with self.assertRaises(RuntimeError):
+                load_board_from_ufiv("elements.json", check_stop)
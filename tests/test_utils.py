@@ -2,6 +2,7 @@ import os
 import unittest
 from datetime import timedelta
 from collections import namedtuple
+from unittest import mock
 from epcore.elements import IVCurve, Measurement, MeasurementSettings, Pin
 from report_generator import utils as ut
 
@@ -45,6 +46,50 @@ class TestUtilsFunctions(unittest.TestCase):
         image = Image(76)
         self.assertEqual(ut.get_pin_diameter(image), 2)
 
+    def test_get_pin_scores(self) -> None:
+        settings = [MeasurementSettings(sampling_rate=1, internal_resistance=1000.0, max_voltage=5.0,
+                                        probe_signal_frequency=frequency) for frequency in (10, 100)]
+        ivc = IVCurve(voltages=[-5.0, 0.0, 5.0, 0.0], currents=[-0.005, 0.0, 0.005, 0.0])
+        other_ivc = IVCurve(voltages=[-5.0, 0.0, 5.0, 0.0], currents=[0.0, 0.0, 0.0, 0.0])
+        pins = [Pin(x=0, y=0, measurements=[Measurement(settings=settings[0], ivc=ivc, is_reference=True),
+                                            Measurement(settings=settings[0], ivc=ivc)]),
+                Pin(x=0, y=0, measurements=[Measurement(settings=settings[0], ivc=ivc, is_reference=True),
+                                            Measurement(settings=settings[1], ivc=ivc, is_reference=True),
+                                            Measurement(settings=settings[1], ivc=other_ivc),
+                                            Measurement(settings=settings[0], ivc=ivc)]),
+                Pin(x=0, y=0, measurements=[Measurement(settings=settings[0], ivc=ivc)])]
+        scores = ut.get_pin_scores(pins)
+        self.assertEqual(scores[0], (0.0, None))
+        score, pair_scores = scores[1]
+        self.assertEqual(len(pair_scores), 2)
+        self.assertEqual(pair_scores[1], 0.0)
+        self.assertGreater(pair_scores[0], 0)
+        self.assertEqual(score, pair_scores[0])
+        self.assertEqual(scores[2], (None, None))
+
+    def test_get_pin_scores_with_prefilter(self) -> None:
+        settings = MeasurementSettings(sampling_rate=1, internal_resistance=1000.0, max_voltage=5.0,
+                                       probe_signal_frequency=10)
+        ivc = IVCurve(voltages=[-5.0, 0.0, 5.0, 0.0], currents=[-0.005, 0.0, 0.005, 0.0])
+        noisy_ivc = IVCurve(voltages=[-5.0, 0.0, 5.0, 0.0001], currents=[-0.005, 0.0, 0.005, 0.0])
+        self.assertTrue(ut._is_near_identical(ivc, noisy_ivc, (0.25, 0.25)))
+        self.assertFalse(ut._is_near_identical(ivc, noisy_ivc, (0.25, 0.25), 0))
+        self.assertFalse(ut._is_near_identical(ivc, IVCurve(voltages=[0.0], currents=[0.0]), (0.25, 0.25)))
+
+        pins = [Pin(x=0, y=0, measurements=[Measurement(settings=settings, ivc=ivc, is_reference=True),
+                                            Measurement(settings=settings, ivc=noisy_ivc)])]
+        self.assertEqual(ut.get_pin_scores(pins), [(0.0, None)])
+        with self.assertLogs("report_generator", "INFO") as logs:
+            scores = ut.get_pin_scores(pins, validate_prefilter=True)
+        self.assertEqual(scores, ut.get_pin_scores(pins, prefilter=False))
+        self.assertIn("1 comparisons", logs.output[-1])
+
+        # Mismatches are reported with element and pin indices of the pin
+        with mock.patch.object(ut.IVCComparator, "compare_ivc", return_value=0.5), \
+                self.assertLogs("report_generator", "WARNING") as logs:
+            ut.get_pin_scores(pins, validate_prefilter=True, pin_indices=[(3, 1)])
+        self.assertIn("the pin '3_1' (x=0, y=0)", logs.output[0])
+
     def test_get_pin_type(self) -> None:
         pin = Pin(x=0, y=0)
         self.assertEqual(ut.get_pin_type(pin, None, None, False), ut.PinTypes.REFERENCE_EMPTY)
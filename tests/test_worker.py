@@ -0,0 +1,47 @@
+import logging
+import os
+import tempfile
+import unittest
+from report_generator.worker import RenderTasks, RenderWorker
+
+
+logger = logging.getLogger("report_generator")
+
+
+class TestWorker(unittest.TestCase):
+
+    def test_run_task_and_recycle(self) -> None:
+        worker = RenderWorker(max_reports=1)
+        try:
+            with tempfile.TemporaryDirectory() as dir_name:
+                file_name = os.path.join(dir_name, "fault_histogram.jpeg")
+                worker.run_task(RenderTasks.DRAW_FAULT_HISTOGRAM, ([10, 20, 70], 50, file_name), False, lambda: None)
+                self.assertTrue(os.path.isfile(file_name))
+                self.assertIsNotNone(worker._process)
+
+            worker.finish_report()
+            self.assertIsNone(worker._process)
+        finally:
+            worker.close()
+
+    def test_error(self) -> None:
+        worker = RenderWorker()
+        try:
+            with self.assertRaises(RuntimeError) as context:
+                worker.run_task(RenderTasks.DRAW_FAULT_HISTOGRAM, ([10], 50, os.path.join("no_dir", "h.jpeg")), False,
+                                lambda: None)
+            # The traceback of the worker process is kept as the cause of the error
+            self.assertIn("Traceback", str(context.exception.__cause__))
+        finally:
+            worker.close()
+
+    def test_logs(self) -> None:
+        worker = RenderWorker()
+        try:
+            with tempfile.TemporaryDirectory() as dir_name, self.assertLogs(logger, logging.INFO) as logs:
+                worker.run_task(RenderTasks.DRAW_FAULT_HISTOGRAM,
+                                ([10, 20, 70], 50, os.path.join(dir_name, "fault_histogram.jpeg")), False, lambda: None)
+            # Records of the worker process are written by the handlers of the main process
+            self.assertTrue(any("DRAW FAULT HISTOGRAM" in message for message in logs.output))
+        finally:
+            worker.close()
@@ -2,6 +2,20 @@ import numpy as np
 from epcore.elements import Board, Element, IVCurve, Measurement, MeasurementSettings, Pin
 
 
+def create_board_with_faulty_pin() -> Board:
+    """
+    :return: simple board with an empty pin, a faulty pin and a passing pin.
+    """
+
+    board = create_simple_board()
+    for pin, factor in zip(board.elements[0].pins[1:], (2, 1)):
+        measurement = pin.measurements[0]
+        ivc = IVCurve(currents=[factor * current for current in measurement.ivc.currents],
+                      voltages=list(measurement.ivc.voltages))
+        pin.measurements.append(Measurement(settings=measurement.settings, ivc=ivc, is_reference=True))
+    return board
+
+
 def create_simple_board() -> Board:
     """
     Function creates simple board.
@@ -33,6 +47,16 @@ def create_simple_board() -> Board:
     return board
 
 
+def read_binary_file(file_name: str) -> bytes:
+    """
+    :param file_name: name of the file to read.
+    :return: content.
+    """
+
+    with open(file_name, "rb") as file:
+        return file.read()
+
+
 def read_file(file_name: str) -> str:
     """
     :param file_name: name of the file to read.